@@ -0,0 +1,230 @@
+"""
+Ocena cięć wielu rozwiązań naraz w układzie bit-sliced.
+
+Rozwiązania są "pasami" (lanes): słowo wierzchołka v ma na bicie j stronę v w rozwiązaniu j. Dla krawędzi (u, v)
+jeden XOR słów u i v daje wskaźnik przecięcia tej krawędzi we wszystkich rozwiązaniach naraz. Wagi sumujemy
+osobno w każdym pasie:
+- krawędzie dzielimy na klasy o tej samej wadze (graf jednostkowy - jedna klasa, wagi +/-1 - dwie, inne wagi
+  całkowite - klasy według bitów |w| i znaku), a w klasie liczymy przecięte krawędzie w każdym pasie
+  bitowym sumatorem (dodawanie z przeniesieniem na słowach, jak pionowy popcount), na końcu mnożąc przez wagę klasy,
+- przy wielu różnych wagach rzeczywistych rozpakowujemy bity przecięć i sumujemy wagi w pasach.
+Z numpy słowa to macierz uint64 (n x bloki po 64 pasy), bez numpy - liczby całkowite Pythona o dowolnej szerokości.
+"""
+from graph_utils import as_graph, solutions_to_matrix, unpack_solution, np
+
+LANES = 64
+
+# Ile różnych wag traktujemy jako osobne klasy - przy większej liczbie wagi całkowite dzielimy według bitów
+MAX_WEIGHT_CLASSES = 8
+
+
+def _weight_classes(weights, integer):
+    """
+    :return: lista (waga klasy, lista indeksów krawędzi) albo None, gdy wagi sumujemy w pasach
+    """
+    values = sorted(set(weights))
+    if len(values) <= MAX_WEIGHT_CLASSES:
+        return [(w, [i for i, x in enumerate(weights) if x == w]) for w in values if w != 0]
+    if not integer:
+        return None
+    classes = []
+    for sign in (1, -1):
+        for b in range(max(abs(w) for w in weights).bit_length()):
+            members = [i for i, w in enumerate(weights) if w * sign > 0 and (abs(w) >> b) & 1]
+            if members:
+                classes.append((sign << b, members))
+    return classes
+
+
+def _numpy_lane_counts(crossed):
+    """
+    Pionowy popcount: liczba ustawionych bitów na każdej pozycji (w każdym pasie) w kolumnach macierzy słów.
+    Słowa sumujemy parami drzewem bitowych sumatorów - liczniki są płaszczyznami bitów (planes[b] to bit b
+    licznika we wszystkich pasach), więc jedna operacja na uint64 dodaje 64 pasy naraz.
+    :param crossed: macierz k x B uint64
+    :return: wektor B * 64 liczników
+    """
+    planes = [crossed]
+    while len(planes[0]) > 1:
+        if len(planes[0]) % 2:
+            planes = [np.concatenate([p, np.zeros((1, p.shape[1]), dtype=np.uint64)]) for p in planes]
+        summed, carry = [], None
+        for p in planes:
+            a, b = p[0::2], p[1::2]
+            a_xor_b = a ^ b
+            if carry is None:
+                summed.append(a_xor_b)
+                carry = a & b
+            else:
+                summed.append(a_xor_b ^ carry)
+                carry = (a & b) | (carry & a_xor_b)
+        summed.append(carry)
+        planes = summed
+    if not len(planes[0]):
+        return np.zeros(crossed.shape[1] * LANES, dtype=np.int64)
+    bits = _unpack_lanes(np.stack([p[0] for p in planes]))
+    return (np.int64(1) << np.arange(len(planes), dtype=np.int64)) @ bits
+
+
+def _unpack_lanes(words):
+    """
+    :param words: macierz k x B uint64
+    :return: macierz k x (B * 64) bitów (pas j bloku i w kolumnie i * 64 + j)
+    """
+    return np.unpackbits(np.ascontiguousarray(words, dtype="<u8").view(np.uint8), axis=1, bitorder="little")
+
+
+def _python_lane_counts(crossed, lanes):
+    """
+    Pionowy popcount na liczbach Pythona - każde słowo dodajemy do płaszczyzn licznika z przeniesieniem
+    :param crossed: słowa (liczby całkowite, bit j - pas j)
+    :param lanes: liczba pasów
+    :return: lista liczników pasów
+    """
+    planes = []
+    for carry in crossed:
+        b = 0
+        while carry:
+            if b == len(planes):
+                planes.append(carry)
+                break
+            plane = planes[b]
+            planes[b] = plane ^ carry
+            carry &= plane
+            b += 1
+    counts = [0] * lanes
+    for b, plane in enumerate(planes):
+        weight = 1 << b
+        digits = format(plane, f"0{lanes}b")[::-1]
+        counts = [count + weight if digit == "1" else count for count, digit in zip(counts, digits)]
+    return counts
+
+
+class BitSlicedEvaluator:
+    """
+    Ocena cięć rozwiązań zapisanych jako pasy słów (pack albo enumeration_words) - jedna operacja na słowie
+    obsługuje 64 rozwiązania (z numpy) albo wszystkie naraz (liczby Pythona).
+    """
+
+    def __init__(self, graph):
+        """
+        :param graph: Graph
+        """
+        self.num_vertices = graph.num_vertices
+        self.integer = memoryview(graph.weights).format == "q"
+        src, dst, weights = list(graph.src), list(graph.dst), list(graph.weights)
+        classes = _weight_classes(weights, self.integer)
+        if np is not None:
+            src, dst = np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64)
+            weights = np.array(weights, dtype=np.int64 if self.integer else np.float64)
+            if classes is not None:
+                classes = [(w, np.array(members, dtype=np.int64)) for w, members in classes]
+        self.src, self.dst, self.weights, self.classes = src, dst, weights, classes
+
+    def pack(self, solutions):
+        """
+        :param solutions: lista rozwiązań (listy 0/1 albo bitsety z pack_solution) albo macierz P x n
+        :return: słowa wierzchołków (macierz n x B uint64 albo lista liczb) i liczba pasów P
+        """
+        if np is not None:
+            matrix = solutions if isinstance(solutions, np.ndarray) else solutions_to_matrix(solutions, self.num_vertices)
+            lanes = len(matrix)
+            blocks = -(-lanes // LANES)
+            padded = np.zeros((blocks * LANES, self.num_vertices), dtype=np.uint8)
+            padded[:lanes] = matrix
+            packed = np.packbits(padded.reshape(blocks, LANES, self.num_vertices).transpose(2, 0, 1), axis=2,
+                                 bitorder="little")
+            return np.ascontiguousarray(packed).view("<u8").reshape(self.num_vertices, blocks), lanes
+        solutions = [unpack_solution(x, self.num_vertices) if isinstance(x, int) else x for x in solutions]
+        words = [
+            int("".join("1" if solution[v] else "0" for solution in reversed(solutions)) or "0", 2)
+            for v in range(self.num_vertices)
+        ]
+        return words, len(solutions)
+
+    def enumeration_words(self, first, count):
+        """
+        Słowa dla kolejnych podziałów first, ..., first + count - 1, gdzie bit k numeru podziału to strona wierzchołka
+        k + 1, a wierzchołek 0 jest w zbiorze 0 (jak w przeglądzie kodem Graya)
+        :param first: numer pierwszego podziału (wielokrotność count)
+        :param count: liczba podziałów (potęga dwójki)
+        :return: słowa wierzchołków
+        """
+        if np is not None:
+            blocks = -(-count // LANES)
+            words = np.zeros((self.num_vertices, blocks), dtype=np.uint64)
+            block_index = np.arange(first // LANES, first // LANES + blocks, dtype=np.uint64)
+            for k in range(self.num_vertices - 1):
+                if k < 6:
+                    # Bity pasów: pas j ma wierzchołek k + 1 w zbiorze 1, gdy bit k liczby j jest ustawiony
+                    words[k + 1] = sum(1 << j for j in range(LANES) if (j >> k) & 1)
+                else:
+                    words[k + 1] = np.where((block_index >> np.uint64(k - 6)) & np.uint64(1), ~np.uint64(0), 0)
+            return words
+        full = (1 << count) - 1
+        words = [0] * self.num_vertices
+        for k in range(self.num_vertices - 1):
+            if (1 << k) < count:
+                run = 1 << k
+                words[k + 1] = (((1 << run) - 1) << run) * (full // ((1 << (2 * run)) - 1))
+            elif (first >> k) & 1:
+                words[k + 1] = full
+        return words
+
+    def evaluate_words(self, words, lanes):
+        """
+        :param words: słowa wierzchołków z pack albo enumeration_words
+        :param lanes: liczba pasów
+        :return: cięcia kolejnych pasów (wektor numpy albo lista)
+        """
+        if np is not None:
+            return self._evaluate_numpy(words)[:lanes]
+        src, dst, weights = self.src, self.dst, self.weights
+        if self.classes is not None:
+            cuts = [0] * lanes
+            for weight, members in self.classes:
+                counts = _python_lane_counts((words[src[i]] ^ words[dst[i]] for i in members), lanes)
+                cuts = [cut + weight * count for cut, count in zip(cuts, counts)]
+            return cuts
+        cuts = [0.0] * lanes
+        for u, v, w in zip(src, dst, weights):
+            crossed = words[u] ^ words[v]
+            while crossed:
+                low = crossed & -crossed
+                cuts[low.bit_length() - 1] += w
+                crossed ^= low
+        return cuts
+
+    def _evaluate_numpy(self, words):
+        blocks = words.shape[1]
+        if self.classes is not None:
+            cuts = np.zeros(blocks * LANES, dtype=self.weights.dtype)
+            for weight, members in self.classes:
+                cuts += weight * _numpy_lane_counts(words[self.src[members]] ^ words[self.dst[members]])
+            return cuts
+        cuts = np.zeros(blocks * LANES, dtype=np.float64)
+        step = max(1, (1 << 22) // (blocks * LANES))
+        for start in range(0, len(self.weights), step):
+            end = start + step
+            crossed = words[self.src[start:end]] ^ words[self.dst[start:end]]
+            cuts += self.weights[start:end] @ _unpack_lanes(crossed)
+        return cuts
+
+    def evaluate(self, solutions):
+        """
+        :param solutions: lista rozwiązań albo macierz P x n
+        :return: lista cięć rozwiązań
+        """
+        words, lanes = self.pack(solutions)
+        cuts = self.evaluate_words(words, lanes)
+        return cuts.tolist() if np is not None else cuts
+
+
+def evaluate_bitsliced(num_vertices, edges, solutions):
+    """
+    :param num_vertices: liczba wierzchołków
+    :param edges: lista krawędzi albo Graph
+    :param solutions: lista rozwiązań albo macierz P x n
+    :return: lista cięć rozwiązań
+    """
+    return BitSlicedEvaluator(as_graph(num_vertices, edges)).evaluate(solutions)
@@ -0,0 +1,161 @@
+import sys
+import time
+from graph_utils import as_graph, goal_function, load_graph_from_file
+from instrumentation import deadline_after
+
+
+def branch_and_bound(num_vertices, edges, initial_solution=None, stats=None, time_limit=None):
+    """
+    Dokładny algorytm podziału i ograniczeń.
+    Wierzchołki przydzielamy po kolei (malejąco według ważonego stopnia), a gałąź odcinamy, gdy górne
+    ograniczenie nie przekracza najlepszego znanego cięcia. Ograniczenie = cięcie między przydzielonymi
+    wierzchołkami + dla każdego nieprzydzielonego wierzchołka lepsza z dwóch stron względem przydzielonych
+    sąsiadów + dodatnie wagi krawędzi między nieprzydzielonymi wierzchołkami.
+    Wierzchołek o największym stopniu jest ustalony w zbiorze 0 (cięcie i jego dopełnienie są równe).
+    :param num_vertices: liczba wierzchołków
+    :param edges: lista krawędzi albo Graph
+    :param initial_solution: rozwiązanie startowe (np. z metaheurystyki) jako pierwsze najlepsze cięcie
+    :param stats: opcjonalny słownik, do którego zapisujemy liczbę odwiedzonych ("nodes") i odciętych ("pruned") węzłów
+        oraz czy przerwano przeszukiwanie po przekroczeniu limitu czasu ("timed_out")
+    :param time_limit: limit czasu w sekundach (sprawdzany co 4096 węzłów) - po jego przekroczeniu zwracamy
+        najlepsze dotąd rozwiązanie, bez gwarancji optymalności
+    :return: maksymalne cięcie
+    """
+    graph = as_graph(num_vertices, edges)
+    deadline = deadline_after(time_limit)
+
+    order = sorted(
+        range(num_vertices),
+        key=lambda v: (-sum(abs(w) for _, w in graph.neighbours(v)), v),
+    )
+    position = [0] * num_vertices
+    for i, v in enumerate(order):
+        position[v] = i
+
+    # Sąsiedzi przydzielani później - tylko ich dotyczy przydział wierzchołka
+    later_neighbours = [
+        tuple((u, w) for u, w in graph.neighbours(v) if position[u] > position[v])
+        for v in range(num_vertices)
+    ]
+
+    if initial_solution is not None:
+        best_solution = list(initial_solution)
+        best_cut = goal_function(graph, best_solution)
+    else:
+        best_solution = [0] * num_vertices
+        best_cut = 0
+
+    side = [0] * num_vertices
+    # if_zero[v] / if_one[v] - wkład krawędzi do przydzielonych sąsiadów, gdy v trafi do zbioru 0 / 1
+    if_zero = [0] * num_vertices
+    if_one = [0] * num_vertices
+    cut = 0
+    free_bound = sum(w for _, _, w in graph if w > 0)
+    nodes = 0
+    pruned = 0
+    timed_out = False
+
+    def assign(v, s):
+        nonlocal cut, free_bound
+        side[v] = s
+        cut += if_one[v] if s else if_zero[v]
+        free_bound -= max(if_zero[v], if_one[v])
+        for u, w in later_neighbours[v]:
+            before = max(if_zero[u], if_one[u])
+            if s:
+                if_zero[u] += w
+            else:
+                if_one[u] += w
+            free_bound += max(if_zero[u], if_one[u]) - before
+            if w > 0:
+                free_bound -= w
+
+    def unassign(v, s):
+        nonlocal cut, free_bound
+        for u, w in later_neighbours[v]:
+            if w > 0:
+                free_bound += w
+            before = max(if_zero[u], if_one[u])
+            if s:
+                if_zero[u] -= w
+            else:
+                if_one[u] -= w
+            free_bound += max(if_zero[u], if_one[u]) - before
+        free_bound += max(if_zero[v], if_one[v])
+        cut -= if_one[v] if s else if_zero[v]
+
+    def search(depth):
+        nonlocal best_cut, best_solution, nodes, pruned, timed_out
+        if timed_out:
+            return
+        nodes += 1
+        if nodes % 4096 == 0 and time.perf_counter() >= deadline:
+            timed_out = True
+            return
+        if cut + free_bound <= best_cut:
+            pruned += 1
+            return
+        if depth == num_vertices:
+            best_cut = cut
+            best_solution = side[:]
+            return
+
+        v = order[depth]
+        if depth == 0:
+            sides = (0,)
+        elif if_one[v] > if_zero[v]:
+            sides = (1, 0)
+        else:
+            sides = (0, 1)
+        for s in sides:
+            assign(v, s)
+            search(depth + 1)
+            unassign(v, s)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), num_vertices + 100))
+    search(0)
+
+    if stats is not None:
+        stats["nodes"] = nodes
+        stats["pruned"] = pruned
+        stats["timed_out"] = timed_out
+    return best_solution, best_cut
+
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Branch and bound algorithm")
+    parser.add_argument(
+        "--input", type=str, required=True, help="Ścieżka do pliku z grafem"
+    )
+    parser.add_argument(
+        "--warm_start",
+        type=str,
+        choices=["none", "hill_climbing", "tabu_search"],
+        default="none",
+        help="Metaheurystyka dostarczająca rozwiązanie startowe",
+    )
+
+    args = parser.parse_args()
+
+    num_vertices, edges = load_graph_from_file(args.input)
+
+    initial_solution = None
+    if args.warm_start == "hill_climbing":
+        from hill_climbing_deterministic import hill_climbing_deterministic
+
+        initial_solution, _, _ = hill_climbing_deterministic(num_vertices, edges)
+    elif args.warm_start == "tabu_search":
+        from tabu_search import tabu_search
+
+        _, initial_solution = tabu_search(num_vertices, edges)
+
+    print(
+        "------------------------ALGORYTM PODZIAŁU I OGRANICZEŃ------------------------------------"
+    )
+    stats = {}
+    best_solution, best_cut = branch_and_bound(num_vertices, edges, initial_solution, stats)
+    print(f"Najlepsze rozwiązanie: {best_solution}, wartość cięcia: {best_cut}")
+    print(f"Odwiedzone węzły: {stats['nodes']}, odcięte węzły: {stats['pruned']}")
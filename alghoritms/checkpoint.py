@@ -0,0 +1,139 @@
+import os
+import pickle
+import random
+import threading
+import zlib
+
+# Wersja formatu pliku - zmieniamy, gdy zmienia się zawartość stanu któregoś algorytmu
+CHECKPOINT_VERSION = 2
+
+
+def write_checkpoint(path, data):
+    """
+    Atomowy zapis punktu kontrolnego: zapis do pliku tymczasowego, fsync i podmiana nazwy -
+    przerwanie procesu w trakcie zapisu zostawia poprzedni, kompletny plik
+    :param path: ścieżka pliku
+    :param data: zserializowany (pickle) stan
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(zlib.compress(data, 1))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path, solver=None):
+    """
+    :param path: ścieżka pliku zapisanego przez Checkpointer
+    :param solver: nazwa algorytmu, dla którego wznawiamy obliczenia (sprawdzana z zapisaną)
+    :return: słownik ze stanem algorytmu ("solver", "iteration", "random" i pola właściwe dla algorytmu)
+    """
+    with open(path, "rb") as f:
+        state = pickle.loads(zlib.decompress(f.read()))
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Nieobsługiwana wersja punktu kontrolnego: {state.get('version')}")
+    if solver is not None and state["solver"] != solver:
+        raise ValueError(f"Punkt kontrolny algorytmu {state['solver']} nie pasuje do algorytmu {solver}")
+    return state
+
+
+class Checkpointer:
+    """
+    Okresowy zapis stanu algorytmu do pliku, z którego można wznowić obliczenia (load_checkpoint i parametr resume).
+    Algorytm wywołuje save co interval iteracji (generacji). Stan jest serializowany od razu - algorytm może dalej
+    zmieniać swoje listy - a kompresja i zapis na dysk odbywają się w osobnym wątku. Gdy poprzedni zapis jeszcze
+    trwa, czekający stan zastępujemy nowszym, więc pętla algorytmu nigdy nie czeka na dysk.
+    Każdy stan zawiera stan generatora liczb losowych (random), więc wznowienie daje ten sam przebieg.
+    """
+
+    def __init__(self, path, interval=1000, background=True):
+        """
+        :param path: ścieżka pliku punktu kontrolnego
+        :param interval: co ile iteracji (generacji) zapisujemy stan
+        :param background: zapis w osobnym wątku; False - zapis od razu, w wywołaniu save
+        """
+        self.path = path
+        self.interval = max(1, interval)
+        self.background = background
+        self.saved = 0
+        self._pending = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def save(self, solver, iteration, **state):
+        """
+        :param solver: nazwa algorytmu
+        :param iteration: iteracja (generacja), od której algorytm kontynuuje po wznowieniu
+        :param state: stan właściwy dla algorytmu
+        """
+        data = pickle.dumps(
+            {"version": CHECKPOINT_VERSION, "solver": solver, "iteration": iteration, "random": random.getstate(),
+             **state},
+            pickle.HIGHEST_PROTOCOL,
+        )
+        self.saved += 1
+        if not self.background:
+            write_checkpoint(self.path, data)
+            return
+        with self._condition:
+            self._pending = data
+            self._condition.notify()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                data, self._pending = self._pending, None
+            write_checkpoint(self.path, data)
+
+    def close(self):
+        """
+        Dokończenie oczekującego zapisu - po powrocie plik zawiera ostatni zapisany stan
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def add_checkpoint_arguments(parser):
+    """
+    Dodanie do argparse opcji punktów kontrolnych
+    """
+    parser.add_argument("--checkpoint", type=str, default=None, help="Plik, do którego okresowo zapisujemy stan")
+    parser.add_argument(
+        "--checkpoint_interval", type=int, default=1000, help="Co ile iteracji (generacji) zapisujemy stan"
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="Wznów obliczenia z pliku --checkpoint, jeśli istnieje"
+    )
+
+
+def checkpoint_from_args(args, solver):
+    """
+    :return: Checkpointer (albo None bez --checkpoint) i stan do wznowienia (albo None)
+    """
+    if args.checkpoint is None:
+        return None, None
+    resume = None
+    if args.resume and os.path.exists(args.checkpoint):
+        resume = load_checkpoint(args.checkpoint, solver)
+        print(f"Wznawiamy z punktu kontrolnego {args.checkpoint}, iteracja {resume['iteration']}")
+    return Checkpointer(args.checkpoint, args.checkpoint_interval), resume
@@ -1,24 +1,205 @@
-from graph_utils import generate_all_solutions, goal_function, load_graph_from_file
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from graph_utils import as_graph, CutState, generate_all_solutions, goal_function, load_graph_from_file, np
+from bitslice import BitSlicedEvaluator
+from tracing import ITERATION, as_tracer, add_trace_arguments, tracer_from_args
+from instrumentation import as_stats, deadline_after, add_instrumentation_arguments, stats_from_args, print_stats
 
+# Graf procesu roboczego - przekazywany raz, w inicjalizatorze puli, a nie przy każdym zadaniu
+_worker_graph = None
 
-def full_search(num_vertices, edges):
+
+def gray_code_search(state, free_vertices, deadline=math.inf, stats=None):
+    """
+    Strumieniowy przegląd wszystkich podziałów wierzchołków free_vertices w kolejności kodu Graya.
+    Każdy krok odwraca dokładnie jeden wierzchołek (O(deg) w CutState), pamięć jest stała.
+    Pozostałe wierzchołki zostają tak, jak są ustawione w state.
+    :param state: CutState z punktem startowym przeglądu
+    :param free_vertices: lista wierzchołków, których podziały przeglądamy
+    :param deadline: chwila (time.perf_counter), po której przerywamy przegląd (sprawdzana co 65536 kroków)
+    :param stats: SolverStats - każdy krok to jedna ewaluacja przyrostowa
+    :return: najlepsze rozwiązanie, maksymalne cięcie
+    """
+    solution, gains, cut = state.solution, state.gains, state.cut
+    best_cut = cut
+    best_solution = solution[:]
+
+    # To samo co CutState.flip, ale rozwinięte w pętli - to najgorętsze miejsce przeglądu
+    neighbours = [tuple(state.graph.neighbours(v)) for v in free_vertices]
+    step = 0
+    for step in range(1, 1 << len(free_vertices)):
+        # W kroku step odwracamy bit o indeksie równym liczbie zer na końcu step
+        i = (step & -step).bit_length() - 1
+        v = free_vertices[i]
+        gain = gains[v]
+        cut += gain
+        gains[v] = -gain
+        side = 1 - solution[v]
+        solution[v] = side
+        for u, w in neighbours[i]:
+            if solution[u] == side:
+                gains[u] += 2 * w
+            else:
+                gains[u] -= 2 * w
+
+        if cut > best_cut:
+            best_cut = cut
+            best_solution = solution[:]
+
+        if step & 0xFFFF == 0 and time.perf_counter() >= deadline:
+            break
+
+    state.cut = cut
+    if stats is not None:
+        stats.delta_evaluations += step
+    return best_solution, best_cut
+
+
+def bitsliced_search(graph, deadline=math.inf, stats=None, chunk_bits=18):
+    """
+    Przegląd wszystkich podziałów z wierzchołkiem 0 w zbiorze 0 oceniany w układzie bit-sliced (BitSlicedEvaluator):
+    podziały numerujemy od 0 (bit k numeru to strona wierzchołka k + 1) i oceniamy porcjami po 2^chunk_bits -
+    jeden XOR słów na krawędź liczy jej przecięcie w 64 podziałach naraz (bez numpy - w całej porcji naraz).
+    :param graph: Graph
+    :param deadline: chwila (time.perf_counter), po której przerywamy przegląd (sprawdzana co porcję)
+    :param stats: SolverStats - każdy podział to jedna ewaluacja
+    :param chunk_bits: log2 liczby podziałów w porcji
+    :return: najlepsze rozwiązanie, maksymalne cięcie
+    """
+    evaluator = BitSlicedEvaluator(graph)
+    total = 1 << max(0, graph.num_vertices - 1)
+    count = min(total, 1 << chunk_bits)
+    best_partition, best_cut = 0, None
+    searched = 0
+    for first in range(0, total, count):
+        cuts = evaluator.evaluate_words(evaluator.enumeration_words(first, count), count)
+        index = int(np.argmax(cuts)) if np is not None else max(range(count), key=cuts.__getitem__)
+        if best_cut is None or cuts[index] > best_cut:
+            best_partition, best_cut = first + index, cuts[index].item() if np is not None else cuts[index]
+        searched += count
+        if time.perf_counter() >= deadline:
+            break
+
+    if stats is not None:
+        stats.evaluations += searched
+    free_sides = [(best_partition >> k) & 1 for k in range(graph.num_vertices - 1)]
+    return [0] * min(1, graph.num_vertices) + free_sides, best_cut
+
+
+def _init_worker(graph):
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _search_prefix(prefix, prefix_vertices, end_time=math.inf):
+    """
+    Podproblem przeglądu równoległego - wierzchołki prefix_vertices mają ustalony podział (bity prefix),
+    wierzchołek 0 jest w zbiorze 0, a pozostałe przeglądamy kodem Graya
+    :param prefix: bity podziału wierzchołków prefix_vertices
+    :param prefix_vertices: wierzchołki ustalone w tym podproblemie
+    :param end_time: czas ścienny (time.time), po którym przerywamy przegląd - wspólny dla procesów
+    :return: najlepsze rozwiązanie, maksymalne cięcie
+    """
+    graph = _worker_graph
+    solution = [0] * graph.num_vertices
+    for i, v in enumerate(prefix_vertices):
+        solution[v] = (prefix >> i) & 1
+    free_vertices = list(range(1 + len(prefix_vertices), graph.num_vertices))
+    deadline = time.perf_counter() + (end_time - time.time())
+    return gray_code_search(CutState(graph, solution), free_vertices, deadline)
+
+
+def full_search_parallel(num_vertices, edges, workers=None, prefix_bits=None, time_limit=None):
+    """
+    Równoległy pełny przegląd - ustalamy podział pierwszych k wierzchołków (po wierzchołku 0), co daje 2^k
+    niezależnych podproblemów przeglądanych kodem Graya w puli procesów. Na końcu wybieramy najlepszy wynik.
+    :param num_vertices: liczba wierzchołków
+    :param edges: lista krawędzi albo Graph
+    :param workers: liczba procesów (domyślnie liczba rdzeni)
+    :param prefix_bits: k - liczba ustalanych wierzchołków (domyślnie ok. 4 podproblemy na proces)
+    :param time_limit: limit czasu w sekundach - podproblemy przerywają przegląd i zwracają najlepszy dotąd wynik
+    :return: maksymalne cięcie
+    """
+    graph = as_graph(num_vertices, edges)
+    workers = workers or os.cpu_count() or 1
+    if prefix_bits is None:
+        prefix_bits = (4 * workers - 1).bit_length()
+    prefix_bits = max(0, min(prefix_bits, num_vertices - 1))
+    prefix_vertices = list(range(1, 1 + prefix_bits))
+    end_time = time.time() + time_limit if time_limit is not None else math.inf
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(graph,)) as pool:
+        results = pool.map(
+            _search_prefix, range(1 << prefix_bits), itertools.repeat(prefix_vertices), itertools.repeat(end_time)
+        )
+        best_solution, best_cut = None, None
+        for solution, cut in results:
+            if best_cut is None or cut > best_cut:
+                best_solution, best_cut = solution, cut
+    return best_solution, best_cut
+
+
+def full_search(num_vertices, edges, mode="gray", workers=1, tracer=None, stats=None, time_limit=None):
     """
     Algorytm pełnego przeglądu - generacja wszystkich rozwiązań, obliczenie kosztu, wybranie najlepszej opcji
+    Tryby:
+    - gray: strumieniowo, w kolejności kodu Graya, z wierzchołkiem 0 ustalonym w zbiorze 0
+      (cięcie i jego dopełnienie mają tę samą wartość, więc przeglądamy połowę przestrzeni),
+    - bitslice: te same podziały co gray, oceniane porcjami po 64 naraz (bitsliced_search),
+    - brute: wszystkie 2^n rozwiązań w pamięci, każde liczone od zera i wypisywane.
     :param num_vertices: : liczba wierzchołków
-    :param edges: lista krawędzi
+    :param edges: lista krawędzi albo Graph
+    :param mode: tryb przeglądu - "gray", "bitslice" albo "brute"
+    :param workers: liczba procesów dla trybu gray (więcej niż 1 - full_search_parallel)
+    :param tracer: Tracer - w trybie brute wiersz co `every` rozwiązań (domyślnie poziom summary na konsolę)
+    :param stats: SolverStats - w trybie gray każdy krok to jedna ewaluacja przyrostowa, w trybach bitslice i brute
+        pełna
+    :param time_limit: limit czasu w sekundach - po jego przekroczeniu zwracamy najlepszy dotąd wynik
+        (już nie gwarantowane optimum)
     :return: maksymalne cięcie
     """
+    edges = as_graph(num_vertices, edges)
+    stats = as_stats(stats)
+    stats.start()
+    deadline = deadline_after(time_limit)
+
+    if mode == "gray":
+        if workers > 1:
+            result = full_search_parallel(num_vertices, edges, workers, time_limit=time_limit)
+            stats.delta_evaluations += (1 << max(0, num_vertices - 1)) - 1
+        else:
+            state = CutState(edges, [0] * num_vertices)
+            result = gray_code_search(state, list(range(1, num_vertices)), deadline, stats)
+        stats.stop()
+        return result
+
+    if mode == "bitslice":
+        result = bitsliced_search(edges, deadline, stats)
+        stats.stop()
+        return result
+
+    tracer = as_tracer(tracer)
+    tracer.table("iteration", [("Rozwiązanie", "solution", 30), ("Cięcie", "cut", 10)])
+    rows = tracer.rows
 
     best_cut = 0
     best_solution = 0
 
     all_solutions = generate_all_solutions(num_vertices)
-    for solution in all_solutions:
+    for i, solution in enumerate(all_solutions):
         current_cut = goal_function(edges, solution)
-        print(f"Rozwiązanie: {solution}, max cięce: {current_cut}")
+        if rows and i % rows == 0:
+            tracer.emit(ITERATION, "iteration", solution=solution, cut=current_cut)
         if current_cut > best_cut:
             best_cut = current_cut
             best_solution = solution
+        if time.perf_counter() >= deadline:
+            break
+    stats.evaluations += i + 1
+    stats.stop()
     return best_solution, best_cut
 
 
@@ -30,6 +211,20 @@ if __name__ == "__main__":
     parser.add_argument(
         "--input", type=str, required=True, help="Ścieżka do pliku z grafem"
     )
+    parser.add_argument(
+        "--mode",
+        type=str,
+        choices=["gray", "bitslice", "brute"],
+        default="gray",
+        help="Tryb przeglądu: gray - strumieniowo kodem Graya, bitslice - po 64 podziały naraz, "
+        "brute - wszystkie rozwiązania w pamięci",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Liczba procesów przeglądu równoległego (tryb gray)"
+    )
+
+    add_trace_arguments(parser)
+    add_instrumentation_arguments(parser)
 
     args = parser.parse_args()
 
@@ -38,5 +233,9 @@ if __name__ == "__main__":
     print(
         "------------------------ALGORYTM PEŁNEGO PRZEGLĄDU------------------------------------"
     )
-    best_solution, best_cut = full_search(num_vertices, edges)
+    tracer = tracer_from_args(args)
+    stats = stats_from_args(args)
+    best_solution, best_cut = full_search(num_vertices, edges, args.mode, args.workers, tracer, stats)
+    tracer.close()
     print(f"Najlepsze rozwiązanie: {best_solution}, wartość cięcia: {best_cut}")
+    print_stats(stats, args)
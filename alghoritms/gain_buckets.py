@@ -0,0 +1,200 @@
+import heapq
+from graph_utils import CutState
+
+# Największy zakres zysków (w jedną stronę), dla którego budujemy tablicę kubełków - przy większych wagach
+# całkowitych tablica byłaby głównie pusta, więc używamy kopca
+MAX_BUCKET_GAIN = 1 << 20
+
+
+class GainBuckets:
+    """
+    Kubełki zysków w stylu Fiducci-Mattheysesa dla wag całkowitych.
+    Kubełek gain + offset to dwukierunkowa lista wierzchołków o tym zysku (tablice next/prev zamiast obiektów),
+    a top wskazuje najwyższy kubełek, który może być niepusty. Zmiana zysku wierzchołka to przepięcie go
+    między listami w O(1); wybór najlepszego ruchu przesuwa top w dół tylko po pustych kubełkach, a top rośnie
+    najwyżej o tyle, o ile wzrosły zyski, więc koszt jest zamortyzowany O(1).
+    Przy remisie wybieramy wierzchołek dodany do kubełka jako ostatni.
+    """
+
+    def __init__(self, gains, max_gain):
+        """
+        :param gains: zyski wszystkich wierzchołków (wszystkie trafiają do kubełków)
+        :param max_gain: ograniczenie |zysku| każdego wierzchołka (suma |wag| jego krawędzi)
+        """
+        num_vertices = len(gains)
+        self.offset = max_gain
+        self.heads = [-1] * (2 * max_gain + 1)
+        self.next = [-1] * num_vertices
+        self.prev = [-1] * num_vertices
+        self.bucket = [-1] * num_vertices
+        self.top = -1
+        for v, gain in enumerate(gains):
+            self.insert(v, gain)
+
+    def reset(self, gains):
+        """
+        Nowe zyski wszystkich wierzchołków (wszystkie wracają do kubełków) - bez ponownego przydziału tablic
+        """
+        heads = self.heads
+        for b in self.bucket:
+            if b >= 0:
+                heads[b] = -1
+        self.top = -1
+        for v, gain in enumerate(gains):
+            self.insert(v, gain)
+
+    def insert(self, v, gain):
+        b = gain + self.offset
+        head = self.heads[b]
+        self.next[v] = head
+        self.prev[v] = -1
+        if head != -1:
+            self.prev[head] = v
+        self.heads[b] = v
+        self.bucket[v] = b
+        if b > self.top:
+            self.top = b
+
+    def remove(self, v):
+        """
+        Usunięcie wierzchołka (np. zakazanego ruchu tabu) - do czasu insert nie jest wybierany
+        """
+        b = self.bucket[v]
+        if b < 0:
+            return
+        nxt, prv = self.next[v], self.prev[v]
+        if prv != -1:
+            self.next[prv] = nxt
+        else:
+            self.heads[b] = nxt
+        if nxt != -1:
+            self.prev[nxt] = prv
+        self.bucket[v] = -1
+
+    def update(self, v, gain):
+        """
+        Nowy zysk wierzchołka - wierzchołki usunięte pozostają poza kubełkami
+        """
+        if self.bucket[v] >= 0 and self.bucket[v] != gain + self.offset:
+            self.remove(v)
+            self.insert(v, gain)
+
+    def best(self):
+        """
+        :return: wierzchołek o największym zysku albo None, gdy wszystkie są usunięte
+        """
+        heads, top = self.heads, self.top
+        while top >= 0 and heads[top] == -1:
+            top -= 1
+        self.top = top
+        return heads[top] if top >= 0 else None
+
+
+class GainHeap:
+    """
+    Kopiec zysków dla wag rzeczywistych (i bardzo dużych całkowitych) - ten sam interfejs co GainBuckets.
+    Zmiana zysku dokłada nowy wpis, a nieaktualne wpisy (inny zysk albo usunięty wierzchołek) są pomijane
+    przy wyborze najlepszego ruchu; kopiec przebudowujemy, gdy nieaktualnych wpisów jest za dużo.
+    Koszt zmiany zysku i wyboru ruchu to zamortyzowane O(log n).
+    """
+
+    def __init__(self, gains):
+        self.reset(gains)
+
+    def reset(self, gains):
+        self.current = list(gains)
+        self.heap = [(-gain, v) for v, gain in enumerate(gains)]
+        heapq.heapify(self.heap)
+
+    def insert(self, v, gain):
+        self.current[v] = gain
+        heapq.heappush(self.heap, (-gain, v))
+
+    def remove(self, v):
+        self.current[v] = None
+
+    def update(self, v, gain):
+        if self.current[v] is not None and self.current[v] != gain:
+            self.insert(v, gain)
+            if len(self.heap) > 4 * len(self.current) + 64:
+                self.heap = [(-g, u) for u, g in enumerate(self.current) if g is not None]
+                heapq.heapify(self.heap)
+
+    def best(self):
+        heap, current = self.heap, self.current
+        while heap and current[heap[0][1]] != -heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][1] if heap else None
+
+
+def gain_queue(graph, gains, kind="auto"):
+    """
+    :param graph: Graph
+    :param gains: zyski wierzchołków
+    :param kind: "buckets", "heap" albo "auto" - kubełki dla wag całkowitych o niewielkim zakresie, w przeciwnym
+        razie kopiec
+    :return: GainBuckets albo GainHeap
+    """
+    if kind not in ("auto", "buckets", "heap"):
+        raise ValueError(f"Nieznana kolejka zysków: {kind}")
+    if kind != "heap" and memoryview(graph.weights).format == "q":
+        adjacency_weights, offsets = graph.adjacency_weights, graph.offsets
+        max_gain = max(
+            (sum(abs(adjacency_weights[i]) for i in range(offsets[v], offsets[v + 1]))
+             for v in range(graph.num_vertices)),
+            default=0,
+        )
+        if kind == "buckets" or max_gain <= MAX_BUCKET_GAIN:
+            return GainBuckets(gains, max_gain)
+    elif kind == "buckets":
+        raise ValueError("Kubełki zysków wymagają wag całkowitych")
+    return GainHeap(gains)
+
+
+class QueueCutState(CutState):
+    """
+    CutState z kolejką zysków (GainBuckets albo GainHeap) - best_move nie przegląda wszystkich wierzchołków,
+    a flip poza zyskami sąsiadów aktualizuje tylko ich pozycje w kolejce (O(deg(v)) operacji O(1) albo O(log n)).
+    """
+
+    def __init__(self, graph, solution, kind="auto", cut=None, gains=None):
+        """
+        :param graph: Graph
+        :param solution: lista 0/1 dla każdego wierzchołka (kopiowana)
+        :param kind: rodzaj kolejki, jak w gain_queue
+        :param cut: znane cięcie rozwiązania, jak w CutState
+        :param gains: znany wektor zysków, jak w CutState
+        """
+        super().__init__(graph, solution, cut, gains)
+        self.moves = gain_queue(graph, self.gains, kind)
+
+    def best_move(self):
+        """
+        :return: wierzchołek o największym zysku spośród nieusuniętych z kolejki (albo None)
+        """
+        return self.moves.best()
+
+    def restore(self, solution, cut, gains):
+        """
+        Powrót do zapamiętanego punktu z odbudową istniejącej kolejki - bez ponownego wyznaczania zakresu zysków
+        i przydziału tablicy kubełków, jak przy tworzeniu nowego stanu. Wszystkie wierzchołki wracają do kolejki.
+        """
+        super().restore(solution, cut, gains)
+        self.moves.reset(self.gains)
+
+    def flip(self, v):
+        solution, gains, graph, update = self.solution, self.gains, self.graph, self.moves.update
+        self.cut += gains[v]
+        gains[v] = -gains[v]
+        update(v, gains[v])
+        side = 1 - solution[v]
+        solution[v] = side
+
+        adjacency, adjacency_weights = graph.adjacency, graph.adjacency_weights
+        for i in range(graph.offsets[v], graph.offsets[v + 1]):
+            u = adjacency[i]
+            if solution[u] == side:
+                gains[u] += 2 * adjacency_weights[i]
+            else:
+                gains[u] -= 2 * adjacency_weights[i]
+            update(u, gains[u])
@@ -1,6 +1,108 @@
 import random
 import argparse
-from graph_utils import load_graph_from_file, random_probe, goal_function
+import time
+from collections import OrderedDict
+from graph_utils import (
+    as_graph,
+    load_graph_from_file,
+    random_probe,
+    goal_function,
+    pack_solution,
+    unpack_solution,
+    random_mask,
+    solutions_to_matrix,
+    evaluate_population,
+    np,
+)
+from tracing import SUMMARY, ITERATION, DEBUG, as_tracer, add_trace_arguments, tracer_from_args
+from instrumentation import (
+    TIME_LIMIT_REASON,
+    as_stats,
+    deadline_after,
+    add_instrumentation_arguments,
+    stats_from_args,
+    print_stats,
+)
+from checkpoint import add_checkpoint_arguments, checkpoint_from_args
+from bitslice import BitSlicedEvaluator
+
+
+class FitnessCache:
+    """
+    Ograniczony cache LRU wartości funkcji celu, kluczowany spakowanym genotypem (pack_solution).
+    Ten sam osobnik (elita, kopie rodziców, powtórzone dzieci) jest oceniany tylko raz, dopóki nie wypadnie z cache.
+    """
+
+    def __init__(self, maxsize=4096):
+        """
+        :param maxsize: Maksymalna liczba pamietanych genotypow
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.evaluations = 0
+        self._entries = OrderedDict()
+
+    def lookup(self, key, individual, evaluate):
+        """
+        :param key: Spakowany genotyp osobnika
+        :param individual: Osobnik przekazywany do evaluate przy braku w cache
+        :param evaluate: Funkcja celu dla osobnika
+        :return: Wartosc funkcji celu
+        """
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entries[key]
+
+        value = evaluate(individual)
+        self.evaluations += 1
+        entries[key] = value
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+        return value
+
+    def lookup_batch(self, keys, individuals, evaluate_batch):
+        """
+        Ocena wielu osobnikow naraz - brakujace w cache genotypy (kazdy tylko raz, nawet jesli powtarza sie
+        w partii) oceniamy jednym wywolaniem evaluate_batch
+        :param keys: Spakowane genotypy osobnikow
+        :param individuals: Osobnicy
+        :param evaluate_batch: Funkcja celu dla listy osobnikow, zwracajaca liste wartosci
+        :return: Lista wartosci funkcji celu
+        """
+        entries = self._entries
+        values = [None] * len(keys)
+        missing = {}
+        for i, key in enumerate(keys):
+            if key in entries:
+                entries.move_to_end(key)
+                self.hits += 1
+                values[i] = entries[key]
+            elif key in missing:
+                self.hits += 1
+                missing[key].append(i)
+            else:
+                missing[key] = [i]
+
+        if missing:
+            evaluated = evaluate_batch([individuals[positions[0]] for positions in missing.values()])
+            self.evaluations += len(missing)
+            for (key, positions), value in zip(missing.items(), evaluated):
+                entries[key] = value
+                for i in positions:
+                    values[i] = value
+            while len(entries) > self.maxsize:
+                entries.popitem(last=False)
+        return values
+
+    @property
+    def hit_rate(self):
+        """
+        :return: Udzial trafien w cache wsrod wszystkich zapytan
+        """
+        total = self.hits + self.evaluations
+        return self.hits / total if total else 0.0
 
 
 def crossover_onepoint_random(parent1, parent2):
@@ -15,6 +117,22 @@ def crossover_onepoint_random(parent1, parent2):
     return child1, child2
 
 
+def crossover_onepoint_bits(parent1, parent2, num_vertices):
+    """
+    Krzyżowanie jednopunktowe na bitsetach (pack_solution) - maska i suma bitowa zamiast kopiowania list
+    :param parent1: Pierwszy rodzic (bitset)
+    :param parent2: Drugi rodzic (bitset)
+    :param num_vertices: Liczba wierzcholkow
+    :return: Zwraca jedno i drugie dziecko, powstale w wyniku zamiany wzgledem ustalonego punktu
+    """
+    cross_point = random.randint(1, num_vertices - 1)
+    low = (1 << cross_point) - 1
+    high = ((1 << num_vertices) - 1) ^ low
+    child1 = (parent1 & low) | (parent2 & high)
+    child2 = (parent2 & low) | (parent1 & high)
+    return child1, child2
+
+
 # Krzyzowanie uniform -> kazdy gen jest losowo wybierany sposrod rodzicow z okreslonym prawdopodobienstwem
 
 
@@ -36,6 +154,19 @@ def crossover_uniform(parent1, parent2, crossover_rate=0.5):
     return child1, child2
 
 
+def crossover_uniform_bits(parent1, parent2, num_vertices, crossover_rate=0.5):
+    """
+    Krzyżowanie uniform na bitsetach - geny, na których rodzice się różnią, zamieniamy XOR-em z losową maską
+    :param parent1: Pierwszy rodzic (bitset)
+    :param parent2: Drugi rodzic (bitset)
+    :param num_vertices: Liczba wierzcholkow
+    :param crossover_rate: Prawdopodobienstwo, ze dziecko 1 dostaje gen od rodzica 1
+    :return: Zwraca jedno i drugie dziecko, powstale w wyniku wymieszania genow miedzy rodzicami
+    """
+    swap = (parent1 ^ parent2) & random_mask(num_vertices, 1 - crossover_rate)
+    return parent1 ^ swap, parent2 ^ swap
+
+
 # Mutacja flip -> odwracamy jeden wierzcholek
 def mutate_onepoint(solution):
     """
@@ -48,6 +179,15 @@ def mutate_onepoint(solution):
     return mutated
 
 
+def mutate_onepoint_bits(solution, num_vertices):
+    """
+    :param solution: Rozwiazanie jako bitset
+    :param num_vertices: Liczba wierzcholkow
+    :return: Bitset z odwroconym jednym, losowym bitem
+    """
+    return solution ^ (1 << random.randrange(num_vertices))
+
+
 # Mutacja multiple flip -> odwracanie wielu bitow, z prawodopodobienstwem, ze to sie wykona
 
 
@@ -64,115 +204,561 @@ def mutate_multiplepoint(solution, mutation_rate=0.2):
     return mutated
 
 
+def mutate_multiplepoint_bits(solution, num_vertices, mutation_rate=0.2):
+    """
+    :param solution: Rozwiazanie jako bitset
+    :param num_vertices: Liczba wierzcholkow
+    :param mutation_rate: Prawdopodobienstwo zamiany
+    :return: Bitset z odwroconymi bitami z losowej maski
+    """
+    return solution ^ random_mask(num_vertices, mutation_rate)
+
+
 # Tournament selection -> chyba najlepszy wybor, duza rodnorodnosc, bo u nas grupy wierzcholkow maja wyrazne roznice w funkcji celu, oraz dobre wyniki dla duzych problemow
 
 
-def selection_tournament(population, edges, k=3):
+def selection_tournament(population, edges, k=3, fitness=None):
     """
     :param population: Lista zawieracja rozwiazanie powstale w aktualnej generacji algorytmu
-    :param edges: lista krawędzi
+    :param edges: lista krawędzi albo Graph
     :param k: Ile rozwiazan zostanie wybranych do turnieju
+    :param fitness: Funkcja oceny osobnika (domyslnie goal_function na liscie krawedzi)
     :return: Rozwiazanie z najlepsza funkcja celu
     """
+    if fitness is None:
+        fitness = lambda x: goal_function(edges, x)
     selected = random.sample(population, k)
-    selected.sort(key=lambda x: goal_function(edges, x), reverse=True)
+    selected.sort(key=fitness, reverse=True)
     return selected[0]
 
 
-def genetic_algorithm(
-    num_vertices,
-    edges,
-    crossover_type,
-    mutation_type,
-    stop_condition,
-    max_generations=100,
-    population_size=50,
-    mutation_rate=0.2,
-    mutation_multiple_rate=0.2,
-    crossover_rate=0.5,
-    max_no_improvement=20,
-    elite_size=3
-):
-    population = [random_probe(num_vertices) for _ in range(population_size)]
+# Wersje wsadowe operatorow - dzialaja na calej macierzy populacji P x n (uint8) naraz
+
+
+def selection_tournament_batch(fitness, count, rng, k=3):
+    """
+    Wszystkie turnieje generacji naraz - jedno losowanie macierzy indeksow count x k i argmax po wierszach.
+    W odroznieniu od selection_tournament uczestnicy sa losowani ze zwracaniem.
+    :param fitness: Wektor wartosci funkcji celu populacji
+    :param count: Liczba turniejow
+    :param rng: np.random.Generator
+    :param k: Ile rozwiazan bierze udzial w turnieju
+    :return: Indeksy zwyciezcow
+    """
+    contestants = rng.integers(0, len(fitness), size=(count, k))
+    winners = np.argmax(fitness[contestants], axis=1)
+    return contestants[np.arange(count), winners]
+
 
-    # Punkt startowy
-    start_point = population[0]
-    start_cut = goal_function(edges,start_point)
+def crossover_onepoint_batch(parents1, parents2, rng):
+    """
+    :param parents1: Macierz pierwszych rodzicow
+    :param parents2: Macierz drugich rodzicow
+    :param rng: np.random.Generator
+    :return: Macierze dzieci - dla kazdej pary geny przed wylosowanym punktem od jednego rodzica, reszta od drugiego
+    """
+    pairs, num_vertices = parents1.shape
+    cross_points = rng.integers(1, num_vertices, size=(pairs, 1))
+    mask = np.arange(num_vertices) < cross_points
+    return np.where(mask, parents1, parents2), np.where(mask, parents2, parents1)
 
-    best_solution = max(population, key=lambda x: goal_function(edges, x))
-    best_value = goal_function(edges, best_solution)
-    no_improvement = 0
 
-    print(f"{'Generacja':<10} {'Najlepsze cięcie':<20} {'Najlepsze rozwiązanie':<40}")
-    print("-" * 110)
+def crossover_uniform_batch(parents1, parents2, rng, crossover_rate=0.5):
+    """
+    :param parents1: Macierz pierwszych rodzicow
+    :param parents2: Macierz drugich rodzicow
+    :param rng: np.random.Generator
+    :param crossover_rate: Prawdopodobienstwo, ze dziecko 1 dostaje gen od rodzica 1
+    :return: Macierze dzieci powstale przez wymieszanie genow wedlug losowej maski
+    """
+    swap = (rng.random(parents1.shape) >= crossover_rate) & (parents1 != parents2)
+    return parents1 ^ swap, parents2 ^ swap
 
-    for generation in range(max_generations):
 
-        new_population = []
+def mutate_onepoint_batch(children, rng, mutation_rate=0.2):
+    """
+    :param children: Macierz dzieci (modyfikowana w miejscu)
+    :param rng: np.random.Generator
+    :param mutation_rate: Prawdopodobienstwo mutacji dziecka
+    :return: Macierz dzieci, w ktorej wylosowane wiersze maja odwrocony jeden losowy gen
+    """
+    rows = np.flatnonzero(rng.random(len(children)) < mutation_rate)
+    columns = rng.integers(0, children.shape[1], size=len(rows))
+    children[rows, columns] ^= 1
+    return children
 
-        while len(new_population) < population_size:
-            while True:
-                parent1 = selection_tournament(population, edges)
-                parent2 = selection_tournament(population, edges)
-                if parent1 != parent2:
+
+def mutate_multiplepoint_batch(children, rng, mutation_rate=0.2, mutation_multiple_rate=0.2):
+    """
+    :param children: Macierz dzieci (modyfikowana w miejscu)
+    :param rng: np.random.Generator
+    :param mutation_rate: Prawdopodobienstwo mutacji dziecka
+    :param mutation_multiple_rate: Prawdopodobienstwo odwrocenia genu w mutowanym dziecku
+    :return: Macierz dzieci z odwroconymi genami wedlug losowej maski
+    """
+    rows = rng.random((len(children), 1)) < mutation_rate
+    children ^= rows & (rng.random(children.shape) < mutation_multiple_rate)
+    return children
+
+
+class GeneticEngine:
+    """
+    Jeden krok (generacja) algorytmu genetycznego na osobnikach jako listach 0/1 albo bitsetach.
+    Osobnik w populacji to para (genotyp, wartosc funkcji celu) - ocena jest liczona raz, przez FitnessCache,
+    a turnieje, elitaryzm i wybor najlepszego korzystaja z zapamietanej wartosci.
+    """
+
+    def __init__(
+        self,
+        num_vertices,
+        edges,
+        crossover_type,
+        mutation_type,
+        population_size=50,
+        mutation_rate=0.2,
+        mutation_multiple_rate=0.2,
+        crossover_rate=0.5,
+        elite_size=3,
+        representation="list",
+        cache=None,
+        vectorized=None,
+        stats=None
+    ):
+        self.num_vertices = num_vertices
+        self.edges = edges
+        self.crossover_type = crossover_type
+        self.mutation_type = mutation_type
+        self.population_size = population_size
+        self.mutation_rate = mutation_rate
+        self.elite_size = elite_size
+        self.cache = cache if cache is not None else FitnessCache()
+        self.stats = as_stats(stats)
+
+        if representation == "bits":
+            self.new_individual = lambda: random.getrandbits(num_vertices)
+            self.to_list = lambda x: unpack_solution(x, num_vertices)
+            self.from_list = pack_solution
+            self.key = lambda x: x
+            evaluate = lambda x: goal_function(edges, unpack_solution(x, num_vertices))
+            self.crossover_onepoint = lambda p1, p2: crossover_onepoint_bits(p1, p2, num_vertices)
+            self.crossover_mix = lambda p1, p2: crossover_uniform_bits(p1, p2, num_vertices, crossover_rate)
+            self.mutate_one = lambda x: mutate_onepoint_bits(x, num_vertices)
+            self.mutate_multiple = lambda x: mutate_multiplepoint_bits(x, num_vertices, mutation_multiple_rate)
+        else:
+            self.new_individual = lambda: random_probe(num_vertices)
+            self.to_list = lambda x: x
+            self.from_list = list
+            self.key = pack_solution
+            evaluate = lambda x: goal_function(edges, x)
+            self.crossover_onepoint = crossover_onepoint_random
+            self.crossover_mix = lambda p1, p2: crossover_uniform(p1, p2, crossover_rate)
+            self.mutate_one = mutate_onepoint
+            self.mutate_multiple = lambda x: mutate_multiplepoint(x, mutation_multiple_rate)
+
+        if vectorized is None:
+            vectorized = np is not None
+        if vectorized == "bitslice":
+            self.evaluate_batch = BitSlicedEvaluator(edges).evaluate
+        elif vectorized:
+            self.evaluate_batch = lambda xs: evaluate_population(edges, solutions_to_matrix(xs, num_vertices)).tolist()
+        else:
+            self.evaluate_batch = lambda xs: [evaluate(x) for x in xs]
+
+    def scored(self, individuals):
+        """
+        :param individuals: Lista genotypow
+        :return: Lista par (genotyp, wartosc funkcji celu)
+        """
+        values = self.cache.lookup_batch([self.key(x) for x in individuals], individuals, self.evaluate_batch)
+        return list(zip(individuals, values))
+
+    def initial_population(self):
+        return self.scored([self.new_individual() for _ in range(self.population_size)])
+
+    def individual(self, population, index):
+        """
+        :return: Osobnik populacji jako lista 0/1 oraz jego wartosc funkcji celu
+        """
+        genotype, value = population[index]
+        return self.to_list(genotype), value
+
+    def best(self, population):
+        genotype, value = max(population, key=self.fitness)
+        return self.to_list(genotype), value
+
+    def solutions(self, population):
+        return [self.to_list(x) for x, _ in population]
+
+    @staticmethod
+    def fitness(scored_individual):
+        return scored_individual[1]
+
+    def emigrants(self, population, count):
+        """
+        :return: Lista par (rozwiazanie jako lista 0/1, wartosc funkcji celu) - count najlepszych osobnikow
+        """
+        best = sorted(population, key=self.fitness, reverse=True)[:count]
+        return [(self.to_list(x), value) for x, value in best]
+
+    def immigrate(self, population, migrants):
+        """
+        Zastapienie najslabszych osobnikow przybyszami z innej wyspy (ich ocena jest juz znana)
+        :param migrants: Lista par (rozwiazanie jako lista 0/1, wartosc funkcji celu)
+        :return: Nowa populacja
+        """
+        survivors = sorted(population, key=self.fitness, reverse=True)[:max(0, len(population) - len(migrants))]
+        return survivors + [(self.from_list(x), value) for x, value in migrants]
+
+    def next_generation(self, population):
+        """
+        :param population: Populacja biezacej generacji
+        :return: Populacja nastepnej generacji oraz przeniesiona elita (jako listy 0/1)
+        """
+        children = []
+        stats = self.stats
+
+        while len(children) < self.population_size:
+            with stats.phase("selection"):
+                while True:
+                    parent1 = selection_tournament(population, self.edges, fitness=self.fitness)
+                    parent2 = selection_tournament(population, self.edges, fitness=self.fitness)
+                    if parent1[0] != parent2[0]:
+                        break
+
+            with stats.phase("crossover"):
+                if self.crossover_type == "onepoint":
+                    child1, child2 = self.crossover_onepoint(parent1[0], parent2[0])
+                else:
+                    child1, child2 = self.crossover_mix(parent1[0], parent2[0])
+
+            with stats.phase("mutation"):
+                if random.random() < self.mutation_rate:
+                    child1 = (
+                        self.mutate_one(child1)
+                        if self.mutation_type == "onepoint"
+                        else self.mutate_multiple(child1)
+                    )
+                if random.random() < self.mutation_rate:
+                    child2 = (
+                        self.mutate_one(child2)
+                        if self.mutation_type == "onepoint"
+                        else self.mutate_multiple(child2)
+                    )
+
+            children.extend([child1, child2])
+
+        # Wszystkie dzieci generacji oceniamy jedna partia
+        with stats.phase("evaluation"):
+            new_population = self.scored(children)
+
+        elite = []
+        if self.elite_size > 0:
+            elite = sorted(population, key=self.fitness, reverse=True)[:self.elite_size]
+            new_population = sorted(new_population, key=self.fitness, reverse=True)[
+                             :self.population_size - self.elite_size]
+            new_population.extend(elite)
+
+        # Dzieci, które weszły do następnej generacji, są przyjęte, pozostałe odrzucone
+        accepted = min(len(children), self.population_size - len(elite))
+        stats.accepted += accepted
+        stats.rejected += len(children) - accepted
+        return new_population[:self.population_size], [self.to_list(x) for x, _ in elite]
+
+
+class NumpyGeneticEngine:
+    """
+    Krok generacji algorytmu genetycznego na macierzy populacji P x n (uint8) i wektorze wartosci funkcji celu.
+    Turnieje, krzyzowanie i mutacja to operacje na calej macierzy dzieci (funkcje *_batch), bez petli po osobnikach.
+    Generator losowy jest inicjowany z modulu random, wiec random.seed() daje powtarzalne wyniki.
+    """
+
+    # Ile razy losujemy ponownie pary z identycznymi rodzicami (np. gdy populacja jest juz jednorodna)
+    parent_retries = 10
+
+    def __init__(
+        self,
+        num_vertices,
+        edges,
+        crossover_type,
+        mutation_type,
+        population_size=50,
+        mutation_rate=0.2,
+        mutation_multiple_rate=0.2,
+        crossover_rate=0.5,
+        elite_size=3,
+        cache=None,
+        seed=None,
+        stats=None,
+        vectorized=None
+    ):
+        if np is None:
+            raise ImportError("Silnik numpy algorytmu genetycznego wymaga pakietu numpy")
+        self.num_vertices = num_vertices
+        self.edges = edges
+        self.crossover_type = crossover_type
+        self.mutation_type = mutation_type
+        self.population_size = population_size
+        self.mutation_rate = mutation_rate
+        self.mutation_multiple_rate = mutation_multiple_rate
+        self.crossover_rate = crossover_rate
+        self.elite_size = elite_size
+        self.cache = cache if cache is not None else FitnessCache()
+        self.stats = as_stats(stats)
+        self.rng = np.random.default_rng(seed if seed is not None else random.getrandbits(64))
+        if vectorized == "bitslice":
+            self.evaluate_matrix = BitSlicedEvaluator(edges).evaluate
+        else:
+            self.evaluate_matrix = lambda matrix: evaluate_population(edges, matrix).tolist()
+
+    def scored(self, matrix):
+        """
+        :param matrix: Macierz osobnikow
+        :return: Macierz osobnikow oraz wektor ich wartosci funkcji celu
+        """
+        keys = [row.tobytes() for row in np.packbits(matrix, axis=1)]
+        evaluate_batch = lambda rows: self.evaluate_matrix(matrix[rows])
+        values = self.cache.lookup_batch(keys, range(len(matrix)), evaluate_batch)
+        return matrix, np.array(values)
+
+    def initial_population(self):
+        return self.scored(self.rng.integers(0, 2, size=(self.population_size, self.num_vertices), dtype=np.uint8))
+
+    def individual(self, population, index):
+        matrix, fitness = population
+        return matrix[index].tolist(), fitness[index].item()
+
+    def best(self, population):
+        return self.individual(population, int(np.argmax(population[1])))
+
+    def solutions(self, population):
+        return population[0].tolist()
+
+    def emigrants(self, population, count):
+        matrix, fitness = population
+        rows = np.argsort(-fitness, kind="stable")[:count]
+        return [(matrix[row].tolist(), fitness[row].item()) for row in rows]
+
+    def immigrate(self, population, migrants):
+        matrix, fitness = population
+        matrix, fitness = matrix.copy(), fitness.copy()
+        worst = np.argsort(fitness, kind="stable")[:len(migrants)]
+        for row, (solution, value) in zip(worst, migrants):
+            matrix[row] = solution
+            fitness[row] = value
+        return matrix, fitness
+
+    def next_generation(self, population):
+        """
+        :param population: Macierz populacji i wektor wartosci funkcji celu biezacej generacji
+        :return: Populacja nastepnej generacji oraz przeniesiona elita (jako listy 0/1)
+        """
+        matrix, fitness = population
+        rng = self.rng
+        stats = self.stats
+        pairs = (self.population_size + 1) // 2
+
+        with stats.phase("selection"):
+            winners = selection_tournament_batch(fitness, 2 * pairs, rng)
+            first, second = winners[:pairs], winners[pairs:]
+            for _ in range(self.parent_retries):
+                same = np.flatnonzero(np.all(matrix[first] == matrix[second], axis=1))
+                if len(same) == 0:
                     break
+                second[same] = selection_tournament_batch(fitness, len(same), rng)
 
-            if crossover_type == "onepoint":
-                child1, child2 = crossover_onepoint_random(parent1, parent2)
+        with stats.phase("crossover"):
+            if self.crossover_type == "onepoint":
+                children1, children2 = crossover_onepoint_batch(matrix[first], matrix[second], rng)
             else:
-                child1, child2 = crossover_uniform(parent1, parent2, crossover_rate)
-
-            if random.random() < mutation_rate:
-                child1 = (
-                    mutate_onepoint(child1)
-                    if mutation_type == "onepoint"
-                    else mutate_multiplepoint(child1, mutation_multiple_rate)
-                )
-            if random.random() < mutation_rate:
-                child2 = (
-                    mutate_onepoint(child2)
-                    if mutation_type == "onepoint"
-                    else mutate_multiplepoint(child2, mutation_multiple_rate)
-                )
-
-            new_population.extend([child1, child2])
-
-        if elite_size > 0:
-            elite = sorted(population, key=lambda x: goal_function(edges, x), reverse=True)[:elite_size]
-            new_population = sorted(new_population, key=lambda x: goal_function(edges, x), reverse=True)[
-                             :population_size - elite_size]
-            print(f"Elita generacji {generation}: przenosimy {elite_size} osobników do nowej populacji {elite} ")
-            new_population.extend(elite)
+                children1, children2 = crossover_uniform_batch(matrix[first], matrix[second], rng, self.crossover_rate)
+            children = np.concatenate([children1, children2])
 
-        population = new_population[:population_size]
+        with stats.phase("mutation"):
+            if self.mutation_type == "onepoint":
+                mutate_onepoint_batch(children, rng, self.mutation_rate)
+            else:
+                mutate_multiplepoint_batch(children, rng, self.mutation_rate, self.mutation_multiple_rate)
 
-        current_best_solution = max(population, key=lambda x: goal_function(edges, x))
-        current_best_value = goal_function(edges, current_best_solution)
+        with stats.phase("evaluation"):
+            children, children_fitness = self.scored(children)
+        born = len(children)
 
-        print(f"{generation:<10} {current_best_value:<20} {str(current_best_solution):<40}")
+        elite = []
+        if self.elite_size > 0:
+            elite_rows = np.argsort(-fitness, kind="stable")[:self.elite_size]
+            kept_rows = np.argsort(-children_fitness, kind="stable")[:self.population_size - self.elite_size]
+            elite = matrix[elite_rows].tolist()
+            children = np.concatenate([children[kept_rows], matrix[elite_rows]])
+            children_fitness = np.concatenate([children_fitness[kept_rows], fitness[elite_rows]])
 
+        accepted = min(born, self.population_size - len(elite))
+        stats.accepted += accepted
+        stats.rejected += born - accepted
+        return (children[:self.population_size], children_fitness[:self.population_size]), elite
+
+
+def genetic_algorithm(
+    num_vertices,
+    edges,
+    crossover_type,
+    mutation_type,
+    stop_condition,
+    max_generations=100,
+    population_size=50,
+    mutation_rate=0.2,
+    mutation_multiple_rate=0.2,
+    crossover_rate=0.5,
+    max_no_improvement=20,
+    elite_size=3,
+    representation="list",
+    cache_size=4096,
+    fitness_cache=None,
+    vectorized=None,
+    engine="python",
+    tracer=None,
+    stats=None,
+    time_limit=None,
+    checkpoint=None,
+    resume=None,
+):
+    """
+    Algorytm genetyczny z selekcja turniejowa i elitaryzmem.
+    Reprezentacja "bits" trzyma osobniki jako bitsety (pack_solution) - operatory to operacje bitowe,
+    a osobniki sa hashowalne. Na zewnatrz zawsze zwracamy listy 0/1.
+    Silnik "numpy" wykonuje cala generacje na macierzy populacji (NumpyGeneticEngine).
+    :param num_vertices: liczba wierzchołków
+    :param edges: lista krawędzi albo Graph
+    :param representation: "list" albo "bits" (silnik "python")
+    :param cache_size: rozmiar cache LRU funkcji celu
+    :param fitness_cache: wlasny FitnessCache (np. by po zakonczeniu odczytac statystyki trafien)
+    :param vectorized: ocena calej partii osobnikow jednym przejsciem numpy (evaluate_population);
+        domyslnie wlaczona, gdy numpy jest dostepny (silnik "python"). "bitslice" - ocena partii po 64 osobniki
+        naraz w ukladzie bit-sliced (BitSlicedEvaluator, rowniez bez numpy i w silniku "numpy")
+    :param engine: "python" albo "numpy"
+    :param tracer: Tracer (domyślnie poziom summary na konsolę)
+    :param stats: SolverStats - ewaluacje i trafienia w cache, przyjęci i odrzuceni potomkowie, czasy faz
+        (selection, crossover, mutation, evaluation)
+    :param time_limit: limit czasu w sekundach (sprawdzany po każdej generacji) - po jego przekroczeniu
+        zwracamy najlepsze dotąd rozwiązanie
+    :param checkpoint: Checkpointer - co checkpoint.interval generacji i na końcu zapisujemy populację z wartościami
+        funkcji celu, najlepsze rozwiązanie i licznik generacji bez poprawy
+    :param resume: stan z load_checkpoint - kontynuujemy od zapisanej generacji (z tymi samymi parametrami)
+    :return: najlepsze cięcie, najlepsze rozwiązanie, ostatnia generacja, populacja, punkt startowy, jego cięcie
+    """
+    edges = as_graph(num_vertices, edges)
+    tracer = as_tracer(tracer)
+    stats = as_stats(stats)
+    stats.start()
+    deadline = deadline_after(time_limit)
+    cache = fitness_cache if fitness_cache is not None else FitnessCache(cache_size)
+    evaluations, hits = cache.evaluations, cache.hits
+
+    if engine == "numpy":
+        ga = NumpyGeneticEngine(
+            num_vertices, edges, crossover_type, mutation_type, population_size, mutation_rate,
+            mutation_multiple_rate, crossover_rate, elite_size, cache, stats=stats, vectorized=vectorized,
+        )
+    else:
+        ga = GeneticEngine(
+            num_vertices, edges, crossover_type, mutation_type, population_size, mutation_rate,
+            mutation_multiple_rate, crossover_rate, elite_size, representation, cache, vectorized, stats,
+        )
+
+    if resume is not None:
+        random.setstate(resume["random"])
+        if engine == "numpy":
+            ga.rng.bit_generator.state = resume["numpy_random"]
+        first = resume["iteration"]
+        population = resume["population"]
+        start_point, start_cut = resume["start_point"], resume["start_cut"]
+        best_solution, best_value = resume["best_solution"], resume["best_cut"]
+        no_improvement = resume["no_improvement"]
+    else:
+        first = 0
+        with stats.phase("evaluation"):
+            population = ga.initial_population()
+
+        # Punkt startowy
+        start_point, start_cut = ga.individual(population, 0)
+
+        best_solution, best_value = ga.best(population)
+        no_improvement = 0
+
+    tracer.emit(SUMMARY, "start", cut=start_cut, solution=start_point if tracer.debug else None)
+
+    columns = [("Generacja", "iteration", 10), ("Najlepsze cięcie", "cut", 20)]
+    if tracer.debug:
+        columns.append(("Najlepsze rozwiązanie", "solution", 40))
+    tracer.table("iteration", columns)
+    events, rows, debug = tracer.events, tracer.rows, tracer.debug
+    checkpoint_every = checkpoint.interval if checkpoint is not None else 0
+
+    def save(generation):
+        checkpoint.save(
+            "genetic", generation, population=population, start_point=start_point, start_cut=start_cut,
+            best_solution=best_solution, best_cut=best_value, no_improvement=no_improvement,
+            numpy_random=ga.rng.bit_generator.state if engine == "numpy" else None,
+        )
+
+    generation = first - 1
+    for generation in range(first, max_generations):
+
+        population, elite = ga.next_generation(population)
+
+        if debug and elite_size > 0:
+            tracer.emit(DEBUG, "elite", iteration=generation, size=elite_size, elite=elite)
+
+        current_best_solution, current_best_value = ga.best(population)
+
+        if rows and generation % rows == 0:
+            tracer.emit(
+                ITERATION, "iteration", iteration=generation, cut=current_best_value,
+                solution=current_best_solution if debug else None,
+            )
 
         if current_best_value > best_value:
             best_value = current_best_value
             best_solution = current_best_solution
             no_improvement = 0
+            if events:
+                tracer.emit(ITERATION, "improvement", iteration=generation, cut=best_value)
         else:
             no_improvement += 1
 
         # Warunek zakończenia
-        if stop_condition == "max_generations":
-            if generation + 1 >= max_generations:
-                print(f"Osiągnieto maksymalna ilość generacji, algorytm kończy działanie: {max_generations}")
-                break
-        elif stop_condition == "max_no_improvement":
-            if no_improvement >= max_no_improvement:
-                print(f"Osiągnieto maksymalną ilość generacji {no_improvement} bez poprawy, algorytm kończy działanie")
-                break
-        else:
-            if generation + 1 >= max_generations:
-                break
-
-    return best_value, best_solution, generation, population, start_point, start_cut
+        if stop_condition == "max_no_improvement" and no_improvement >= max_no_improvement:
+            tracer.emit(
+                SUMMARY, "stop", iteration=generation, cut=best_value,
+                reason=f"Osiągnieto maksymalną ilość generacji {no_improvement} bez poprawy, algorytm kończy działanie",
+            )
+            break
+        if generation + 1 >= max_generations:
+            tracer.emit(
+                SUMMARY, "stop", iteration=generation, cut=best_value,
+                reason=f"Osiągnieto maksymalna ilość generacji, algorytm kończy działanie: {max_generations}",
+            )
+            break
+        if time.perf_counter() >= deadline:
+            tracer.emit(SUMMARY, "stop", iteration=generation, cut=best_value, reason=TIME_LIMIT_REASON)
+            break
+        if checkpoint_every and (generation + 1) % checkpoint_every == 0:
+            save(generation + 1)
+
+    if checkpoint is not None:
+        save(generation + 1)
+        checkpoint.close()
+
+    stats.evaluations += cache.evaluations - evaluations
+    stats.cache_hits += cache.hits - hits
+    stats.stop()
+    return (
+        best_value,
+        best_solution,
+        generation,
+        ga.solutions(population),
+        start_point,
+        start_cut,
+    )
 
 
 if __name__ == "__main__":
@@ -217,6 +803,45 @@ if __name__ == "__main__":
         default=50,
         help="Rozmiar populacji"
     )
+    parser.add_argument(
+        "--representation",
+        type=str,
+        choices=["list", "bits"],
+        default="list",
+        help="Reprezentacja osobnika: lista 0/1 albo spakowany bitset",
+    )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        choices=["python", "numpy"],
+        default="python",
+        help="Silnik generacji: python (osobnik po osobniku) albo numpy (cala populacja jako macierz)",
+    )
+    parser.add_argument(
+        "--bitslice", action="store_true", help="Ocena osobnikow po 64 naraz w ukladzie bit-sliced"
+    )
+
+    parser.add_argument(
+        "--islands",
+        type=int,
+        default=1,
+        help="Liczba wysp (procesów) - więcej niż 1 uruchamia wyspowy algorytm genetyczny",
+    )
+    parser.add_argument(
+        "--migration_interval", type=int, default=10, help="Co ile generacji migrują osobniki między wyspami"
+    )
+    parser.add_argument("--migration_size", type=int, default=2, help="Liczba migrujących osobników")
+    parser.add_argument(
+        "--topology",
+        type=str,
+        choices=["ring", "random"],
+        default="ring",
+        help="Topologia migracji między wyspami",
+    )
+
+    add_trace_arguments(parser)
+    add_instrumentation_arguments(parser)
+    add_checkpoint_arguments(parser)
 
     args = parser.parse_args()
 
@@ -235,24 +860,74 @@ if __name__ == "__main__":
         f"Max no improvement generations: 20\n"
     )
 
-    best_value, best_solution, generation, population, start_point, start_cut = genetic_algorithm(
-        num_vertices,
-        edges,
-        crossover_type=args.crossover_type,
-        mutation_type=args.mutation_type,
-        stop_condition=args.stop_condition,
-        max_generations=args.max_generations,
-        population_size=args.population_size,
-        mutation_rate=0.2,
-        mutation_multiple_rate=0.2,
-        crossover_rate=0.5,
-        max_no_improvement=args.max_generations_no_improvement,
-    )
-
-
-    print("\nPodsumowanie:")
-    print(f"Punkt startowy: {start_point}, cięcie: {start_cut}")
-    print(f"Najlepsze rozwiązanie: {best_solution}, cięcie: {best_value}")
-    print(f"Weryfikacja: {goal_function(edges, best_solution)}")
-    print(f"Ilość generacji: {generation + 1}")
-    print(f"Odwiedzono rozwiązań: {(generation + 1) * 50}")
\ No newline at end of file
+    if args.islands > 1:
+        from island_genetic import island_genetic_algorithm
+
+        # Pierwsza wyspa używa operatorów z linii poleceń, pozostałe - domyślnego zestawu z island_settings
+        island_params = [
+            {"crossover_type": args.crossover_type, "mutation_type": args.mutation_type,
+             "population_size": args.population_size}
+        ] + [{"population_size": args.population_size}] * (args.islands - 1)
+        best_value, best_solution, islands = island_genetic_algorithm(
+            num_vertices,
+            edges,
+            islands=args.islands,
+            island_params=island_params,
+            max_generations=args.max_generations,
+            stop_condition=args.stop_condition,
+            max_no_improvement=args.max_generations_no_improvement,
+            migration_interval=args.migration_interval,
+            migration_size=args.migration_size,
+            topology=args.topology,
+            engine=args.engine,
+        )
+
+        print(f"\n{'Wyspa':<8} {'Krzyżowanie':<12} {'Mutacja':<15} {'Generacje':<10} {'Najlepsze cięcie':<15}")
+        print("-" * 65)
+        for island in islands:
+            print(
+                f"{island['island']:<8} {island['crossover_type']:<12} {island['mutation_type']:<15} "
+                f"{island['generations']:<10} {island['best_cut']:<15}"
+            )
+        print("\nPodsumowanie:")
+        print(f"Najlepsze rozwiązanie: {best_solution}, cięcie: {best_value}")
+        print(f"Weryfikacja: {goal_function(edges, best_solution)}")
+    else:
+        tracer = tracer_from_args(args)
+        stats = stats_from_args(args)
+        checkpoint, resume = checkpoint_from_args(args, "genetic")
+        best_value, best_solution, generation, population, start_point, start_cut = genetic_algorithm(
+            num_vertices,
+            edges,
+            crossover_type=args.crossover_type,
+            mutation_type=args.mutation_type,
+            stop_condition=args.stop_condition,
+            max_generations=args.max_generations,
+            population_size=args.population_size,
+            mutation_rate=0.2,
+            mutation_multiple_rate=0.2,
+            crossover_rate=0.5,
+            max_no_improvement=args.max_generations_no_improvement,
+            representation=args.representation,
+            engine=args.engine,
+            vectorized="bitslice" if args.bitslice else None,
+            tracer=tracer,
+            stats=stats,
+            checkpoint=checkpoint,
+            resume=resume,
+        )
+        tracer.close()
+
+
+        print("\nPodsumowanie:")
+        print(f"Punkt startowy: {start_point}, cięcie: {start_cut}")
+        print(f"Najlepsze rozwiązanie: {best_solution}, cięcie: {best_value}")
+        print(f"Weryfikacja: {goal_function(edges, best_solution)}")
+        print(f"Ilość generacji: {generation + 1}")
+        scored = stats.evaluations + stats.cache_hits
+        print(f"Odwiedzono rozwiązań: {scored}")
+        print(
+            f"Ewaluacje funkcji celu: {stats.evaluations}, "
+            f"trafienia w cache: {stats.cache_hits / scored if scored else 0.0:.1%}"
+        )
+        print_stats(stats, args)
\ No newline at end of file
@@ -0,0 +1,244 @@
+import math
+import random
+from graph_utils import Graph, save_graph_binary
+
+# Wagi krawędzi: "unit" - 1, "pm1" - losowo +1 / -1 (jak w G-set), "uniform" - losowa liczba całkowita 1..max_weight
+WEIGHTS = ("unit", "pm1", "uniform")
+
+# Ile linii składamy w jeden zapis do pliku
+_WRITE_CHUNK = 1 << 14
+
+
+def _weight_function(weights, rng, max_weight):
+    if weights == "unit":
+        return lambda: 1
+    if weights == "pm1":
+        return lambda: 1 if rng.random() < 0.5 else -1
+    if weights == "uniform":
+        return lambda: rng.randint(1, max_weight)
+    raise ValueError(f"Nieznany rodzaj wag: {weights}")
+
+
+def erdos_renyi(num_vertices, probability, seed=0, weights="uniform", max_weight=10):
+    """
+    Graf losowy G(n, p) - każda para wierzchołków jest krawędzią z prawdopodobieństwem p.
+    Zamiast losować każdą z n(n-1)/2 par, losujemy długość przeskoku do następnej krawędzi z rozkładu
+    geometrycznego (Batagelj, Brandes), więc czas jest proporcjonalny do liczby krawędzi.
+    :param num_vertices: liczba wierzchołków
+    :param probability: prawdopodobieństwo krawędzi
+    :param seed: ziarno generatora
+    :param weights: rodzaj wag (WEIGHTS)
+    :param max_weight: największa waga dla wag "uniform"
+    :return: generator krawędzi (u, v, waga)
+    """
+    rng = random.Random(seed)
+    weight = _weight_function(weights, rng, max_weight)
+    if probability <= 0:
+        return
+    if probability >= 1:
+        for u in range(num_vertices):
+            for v in range(u + 1, num_vertices):
+                yield u, v, weight()
+        return
+
+    log_q = math.log(1.0 - probability)
+    # Pary (v, u) z u < v przeglądamy wierszami; w to pozycja w wierszu v
+    v, w = 1, -1
+    while v < num_vertices:
+        w += 1 + int(math.log(1.0 - rng.random()) / log_q)
+        while w >= v and v < num_vertices:
+            w -= v
+            v += 1
+        if v < num_vertices:
+            yield w, v, weight()
+
+
+def torus_grid(rows, columns, seed=0, weights="pm1", max_weight=10):
+    """
+    Dwuwymiarowa siatka toroidalna rows x columns - każdy wierzchołek ma sąsiada po prawej i poniżej
+    (z zawinięciem), domyślnie z wagami +1 / -1 jak toroidalne instancje G-set.
+    Wierzchołek (r, c) ma numer r * columns + c.
+    :return: generator krawędzi (u, v, waga)
+    """
+    rng = random.Random(seed)
+    weight = _weight_function(weights, rng, max_weight)
+    for r in range(rows):
+        for c in range(columns):
+            u = r * columns + c
+            if columns > 2 or (columns == 2 and c == 0):
+                yield u, r * columns + (c + 1) % columns, weight()
+            if rows > 2 or (rows == 2 and r == 0):
+                yield u, ((r + 1) % rows) * columns + c, weight()
+
+
+def geometric(num_vertices, radius, seed=0, weights="uniform", max_weight=10):
+    """
+    Losowy graf geometryczny: punkty w kwadracie jednostkowym, krawędź między punktami odległymi
+    o mniej niż radius. Sąsiadów szukamy w siatce komórek o boku radius, więc czas to O(n + m).
+    Dla małego promienia graf jest prawie planarny.
+    :return: generator krawędzi (u, v, waga)
+    """
+    rng = random.Random(seed)
+    xs = [rng.random() for _ in range(num_vertices)]
+    ys = [rng.random() for _ in range(num_vertices)]
+    weight = _weight_function(weights, rng, max_weight)
+
+    cells_per_side = max(1, int(1 / radius))
+    cells = {}
+    for v in range(num_vertices):
+        key = (min(int(xs[v] * cells_per_side), cells_per_side - 1), min(int(ys[v] * cells_per_side), cells_per_side - 1))
+        cells.setdefault(key, []).append(v)
+
+    radius_squared = radius * radius
+    # Sąsiednie komórki "w przód" - każdą parę komórek sprawdzamy tylko raz
+    forward = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+    for (cx, cy), members in sorted(cells.items()):
+        for dx, dy in forward:
+            others = cells.get((cx + dx, cy + dy))
+            if others is None:
+                continue
+            for i, u in enumerate(members):
+                candidates = members[i + 1:] if (dx, dy) == (0, 0) else others
+                for v in candidates:
+                    if (xs[u] - xs[v]) ** 2 + (ys[u] - ys[v]) ** 2 < radius_squared:
+                        yield u, v, weight()
+
+
+def power_law(num_vertices, average_degree, exponent=2.5, seed=0, weights="uniform", max_weight=10):
+    """
+    Graf o potęgowym rozkładzie stopni (model Chunga-Lu): wierzchołek i ma oczekiwany stopień
+    proporcjonalny do (i + 1)^(-1 / (exponent - 1)), a krawędź (u, v) istnieje z prawdopodobieństwem
+    min(1, w_u * w_v / suma wag). Pary losujemy przeskokami geometrycznymi (Miller, Hagberg),
+    więc czas jest proporcjonalny do n + m.
+    :param average_degree: oczekiwany średni stopień
+    :param exponent: wykładnik rozkładu stopni (> 2)
+    :return: generator krawędzi (u, v, waga)
+    """
+    rng = random.Random(seed)
+    weight = _weight_function(weights, rng, max_weight)
+    if num_vertices < 2:
+        return
+
+    shape = [(i + 1) ** (-1.0 / (exponent - 1)) for i in range(num_vertices)]
+    scale = average_degree * num_vertices / sum(shape)
+    expected = [scale * x for x in shape]
+    total = sum(expected)
+
+    for u in range(num_vertices - 1):
+        v = u + 1
+        p = min(expected[u] * expected[v] / total, 1.0)
+        while v < num_vertices and p > 0:
+            if p < 1:
+                v += int(math.log(1.0 - rng.random()) / math.log(1.0 - p))
+            if v < num_vertices:
+                q = min(expected[u] * expected[v] / total, 1.0)
+                if rng.random() < q / p:
+                    yield u, v, weight()
+                p = q
+                v += 1
+
+
+def write_graph(path, num_vertices, edges, fmt="edgelist"):
+    """
+    Strumieniowy zapis krawędzi do pliku tekstowego - krawędzie nie są trzymane w pamięci.
+    :param path: plik wynikowy
+    :param num_vertices: liczba wierzchołków
+    :param edges: iterowalne krawędzie (u, v, waga)
+    :param fmt: "edgelist" (format z graphs/: liczba wierzchołków, potem "u v waga" od 0)
+        albo "rudy" (G-set: "n m", potem "u v waga" od 1)
+    :return: liczba zapisanych krawędzi
+    """
+    if fmt not in ("edgelist", "rudy"):
+        raise ValueError(f"Nieznany format grafu: {fmt}")
+    base = 1 if fmt == "rudy" else 0
+    # Liczba krawędzi w nagłówku rudy jest znana dopiero na końcu - rezerwujemy miejsce i nadpisujemy je
+    header_width = 40
+
+    num_edges = 0
+    with open(path, "w") as f:
+        if fmt == "rudy":
+            f.write(" " * header_width + "\n")
+        else:
+            f.write(f"{num_vertices}\n")
+        lines = []
+        for u, v, w in edges:
+            lines.append(f"{u + base} {v + base} {w}\n")
+            if len(lines) >= _WRITE_CHUNK:
+                f.write("".join(lines))
+                num_edges += len(lines)
+                lines = []
+        f.write("".join(lines))
+        num_edges += len(lines)
+        if fmt == "rudy":
+            f.seek(0)
+            f.write(f"{num_vertices} {num_edges}".ljust(header_width))
+    return num_edges
+
+
+def generate(family, num_vertices, seed=0, weights=None, **params):
+    """
+    :param family: "erdos_renyi", "torus", "geometric" albo "power_law"
+    :param num_vertices: liczba wierzchołków (dla torusa zaokrąglana w dół do kwadratu)
+    :param params: parametry rodziny - probability, radius, average_degree, exponent, max_weight
+    :return: liczba wierzchołków, generator krawędzi
+    """
+    options = {"seed": seed, "max_weight": params.get("max_weight", 10)}
+    if weights is not None:
+        options["weights"] = weights
+    if family == "erdos_renyi":
+        probability = params.get("probability") or min(1.0, params.get("average_degree", 10) / max(1, num_vertices - 1))
+        return num_vertices, erdos_renyi(num_vertices, probability, **options)
+    if family == "torus":
+        side = math.isqrt(num_vertices)
+        return side * side, torus_grid(side, side, **options)
+    if family == "geometric":
+        radius = params.get("radius") or math.sqrt(params.get("average_degree", 10) / (math.pi * num_vertices))
+        return num_vertices, geometric(num_vertices, radius, **options)
+    if family == "power_law":
+        return num_vertices, power_law(
+            num_vertices, params.get("average_degree", 10), params.get("exponent", 2.5), **options
+        )
+    raise ValueError(f"Nieznana rodzina grafów: {family}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generator grafów testowych dla problemu Maximum Cut")
+    parser.add_argument(
+        "--family",
+        type=str,
+        choices=["erdos_renyi", "torus", "geometric", "power_law"],
+        required=True,
+        help="Rodzina grafów",
+    )
+    parser.add_argument("--num_vertices", type=int, required=True, help="Liczba wierzchołków")
+    parser.add_argument("--output", type=str, required=True, help="Plik wynikowy")
+    parser.add_argument("--seed", type=int, default=0, help="Ziarno generatora")
+    parser.add_argument("--weights", type=str, choices=WEIGHTS, default=None, help="Rodzaj wag krawędzi")
+    parser.add_argument("--max_weight", type=int, default=10, help="Największa waga dla wag uniform")
+    parser.add_argument("--probability", type=float, default=None, help="Prawdopodobieństwo krawędzi (erdos_renyi)")
+    parser.add_argument("--radius", type=float, default=None, help="Promień sąsiedztwa (geometric)")
+    parser.add_argument("--average_degree", type=float, default=10, help="Oczekiwany średni stopień")
+    parser.add_argument("--exponent", type=float, default=2.5, help="Wykładnik rozkładu stopni (power_law)")
+    parser.add_argument(
+        "--format",
+        type=str,
+        choices=["edgelist", "rudy", "binary"],
+        default="edgelist",
+        help="Format pliku: tekstowy jak graphs/, G-set albo binarny CSR (load_graph_binary)",
+    )
+
+    args = parser.parse_args()
+
+    num_vertices, edges = generate(
+        args.family, args.num_vertices, args.seed, args.weights, probability=args.probability, radius=args.radius,
+        average_degree=args.average_degree, exponent=args.exponent, max_weight=args.max_weight,
+    )
+    if args.format == "binary":
+        graph = Graph.from_edges(num_vertices, edges)
+        save_graph_binary(graph, args.output)
+        num_edges = len(graph)
+    else:
+        num_edges = write_graph(args.output, num_vertices, edges, args.format)
+    print(f"Zapisano graf {args.family}: {num_vertices} wierzchołków, {num_edges} krawędzi -> {args.output}")
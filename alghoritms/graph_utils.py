@@ -1,24 +1,792 @@
 import itertools
+import json
+import math
+import mmap
+import os
 import random
+import warnings
+from array import array
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # numpy jest opcjonalny - bez niego działają tylko ścieżki w czystym Pythonie
+    np = None
+
+def _append_weight(weights, weight):
+    """
+    Dopisanie wagi do tablicy wag - przy pierwszej wadze niecałkowitej tablica "q" zamieniana jest na "d"
+    :param weights: array("q") albo array("d")
+    :param weight: waga krawędzi
+    :return: tablica wag (ta sama albo nowa)
+    """
+    try:
+        weights.append(weight)
+    except TypeError:
+        weights = array("d", weights)
+        weights.append(weight)
+    return weights
+
+
+def _raise_out_of_range(u, v, num_vertices):
+    raise ValueError(f"Krawędź ({u}, {v}) wychodzi poza zakres wierzchołków 0..{num_vertices - 1}")
+
+
+# Tablice translacji bajtów między genami 0/1 a znakami "0"/"1" - pakowanie bitów bez pętli w Pythonie
+_GENES_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_DIGITS_TO_GENES = bytes.maketrans(b"01", b"\x00\x01")
+
+
+class Graph:
+    """
+    Zwarta reprezentacja grafu nieskierowanego.
+    Krawędzie równoległe i odwrócone są scalane raz, przy budowie grafu - zostaje pierwsze wystąpienie pary
+    wierzchołków (tak samo jak robiła to goal_function ze zbiorem `seen`), pętle własne są pomijane, bo nigdy nie są cięte.
+    Przechowujemy:
+    - listę unikalnych krawędzi jako trzy tablice: src, dst, weights,
+    - sąsiedztwo w formacie CSR: offsets, adjacency, adjacency_weights, degrees
+      (sąsiedzi wierzchołka v to adjacency[offsets[v]:offsets[v + 1]]).
+    Tablice to array.array albo memoryview (np. na zmapowany plik z load_graph_binary()) o elementach 8-bajtowych.
+    """
+
+    def __init__(self, num_vertices, src, dst, weights, csr=None):
+        """
+        :param num_vertices: liczba wierzchołków
+        :param src: tablica początków unikalnych krawędzi
+        :param dst: tablica końców unikalnych krawędzi
+        :param weights: tablica wag unikalnych krawędzi
+        :param csr: gotowe tablice (offsets, adjacency, adjacency_weights, degrees); domyślnie budowane z krawędzi
+        """
+        self.num_vertices = num_vertices
+        self.src = src
+        self.dst = dst
+        self.weights = weights
+        self.offsets, self.adjacency, self.adjacency_weights, self.degrees = csr or self._build_csr()
+
+    def _build_csr(self):
+        num_vertices, src, dst, weights = self.num_vertices, self.src, self.dst, self.weights
+        typecode = memoryview(weights).format
+
+        if np is not None:
+            # Kolejność sąsiadów taka sama jak w pętli poniżej: krawędzie po kolei, najpierw koniec src, potem dst
+            src_np, dst_np, weights_np = self.edge_arrays()
+            heads = np.stack([src_np, dst_np], axis=1).ravel()
+            tails = np.stack([dst_np, src_np], axis=1).ravel()
+            order = np.argsort(heads, kind="stable")
+            degrees = np.bincount(heads, minlength=num_vertices).astype(np.int64)
+            offsets = np.concatenate([[0], np.cumsum(degrees)]).astype(np.int64)
+            return (
+                array("q", offsets.tobytes()),
+                array("q", tails[order].tobytes()),
+                array(typecode, np.repeat(weights_np, 2)[order].tobytes()),
+                array("q", degrees.tobytes()),
+            )
+
+        degrees = array("q", bytes(8 * num_vertices))
+        for u, v in zip(src, dst):
+            degrees[u] += 1
+            degrees[v] += 1
+
+        offsets = array("q", bytes(8 * (num_vertices + 1)))
+        for v in range(num_vertices):
+            offsets[v + 1] = offsets[v] + degrees[v]
+
+        position = array("q", offsets[:-1])
+        adjacency = array("q", bytes(8 * offsets[-1]))
+        adjacency_weights = array(typecode, bytes(8 * offsets[-1]))
+        for u, v, w in zip(src, dst, weights):
+            adjacency[position[u]] = v
+            adjacency_weights[position[u]] = w
+            position[u] += 1
+            adjacency[position[v]] = u
+            adjacency_weights[position[v]] = w
+            position[v] += 1
+        return offsets, adjacency, adjacency_weights, degrees
+
+    @classmethod
+    def from_arrays(cls, num_vertices, src, dst, weights):
+        """
+        Budowa grafu z tablic krawędzi (mogą zawierać duplikaty, krawędzie odwrócone i pętle)
+        :param num_vertices: liczba wierzchołków
+        :param src: array("q") początków krawędzi
+        :param dst: array("q") końców krawędzi
+        :param weights: array("q") albo array("d") wag krawędzi
+        :return: obiekt Graph
+        """
+        typecode = weights.typecode
+        if np is not None:
+            src_np = np.frombuffer(src, dtype=np.int64)
+            dst_np = np.frombuffer(dst, dtype=np.int64)
+            weights_np = np.frombuffer(weights, dtype=np.int64 if typecode == "q" else np.float64)
+            outside = np.flatnonzero((np.minimum(src_np, dst_np) < 0) | (np.maximum(src_np, dst_np) >= num_vertices))
+            if len(outside):
+                _raise_out_of_range(src_np[outside[0]], dst_np[outside[0]], num_vertices)
+            keys = np.minimum(src_np, dst_np) * num_vertices + np.maximum(src_np, dst_np)
+            _, first = np.unique(keys, return_index=True)
+            first = np.sort(first)
+            first = first[src_np[first] != dst_np[first]]
+            return cls(
+                num_vertices,
+                array("q", src_np[first].tobytes()),
+                array("q", dst_np[first].tobytes()),
+                array(typecode, weights_np[first].tobytes()),
+            )
+
+        seen = set()
+        unique_src, unique_dst, unique_weights = array("q"), array("q"), array(typecode)
+        for u, v, w in zip(src, dst, weights):
+            if not (0 <= u < num_vertices and 0 <= v < num_vertices):
+                _raise_out_of_range(u, v, num_vertices)
+            if u == v:
+                continue
+            key = u * num_vertices + v if u < v else v * num_vertices + u
+            if key in seen:
+                continue
+            seen.add(key)
+            unique_src.append(u)
+            unique_dst.append(v)
+            unique_weights.append(w)
+        return cls(num_vertices, unique_src, unique_dst, unique_weights)
+
+    @classmethod
+    def from_edges(cls, num_vertices, edges):
+        """
+        Budowa grafu z listy krawędzi (src, dest, weight)
+        :param num_vertices: liczba wierzchołków
+        :param edges: lista krawędzi
+        :return: obiekt Graph
+        """
+        src, dst, weights = array("q"), array("q"), array("q")
+        for u, v, w in edges:
+            src.append(u)
+            dst.append(v)
+            weights = _append_weight(weights, w)
+        return cls.from_arrays(num_vertices, src, dst, weights)
+
+    def __getstate__(self):
+        # memoryview (np. na zmapowany plik) nie da się zapiklować - do innych procesów wysyłamy kopie tablic
+        state = dict(self.__dict__)
+        for name, value in state.items():
+            if isinstance(value, memoryview):
+                state[name] = array(value.format, value.tobytes())
+        return state
+
+    def __len__(self):
+        return len(self.src)
+
+    def __iter__(self):
+        return zip(self.src, self.dst, self.weights)
+
+    def neighbours(self, v):
+        """
+        :param v: wierzchołek
+        :return: pary (sąsiad, waga krawędzi)
+        """
+        start, end = self.offsets[v], self.offsets[v + 1]
+        return zip(self.adjacency[start:end], self.adjacency_weights[start:end])
+
+    def edge_arrays(self):
+        """
+        Tablice numpy unikalnych krawędzi (widoki na te same bufory, bez kopiowania)
+        :return: src, dst, weights jako np.ndarray
+        """
+        if np is None:
+            raise ImportError("Wektorowe liczenie cięcia wymaga pakietu numpy")
+        weight_dtype = np.int64 if memoryview(self.weights).format == "q" else np.float64
+        return (
+            np.frombuffer(self.src, dtype=np.int64),
+            np.frombuffer(self.dst, dtype=np.int64),
+            np.frombuffer(self.weights, dtype=weight_dtype),
+        )
+
+    def csr_arrays(self):
+        """
+        Tablice numpy sąsiedztwa CSR (widoki na te same bufory, bez kopiowania)
+        :return: offsets, adjacency, adjacency_weights jako np.ndarray
+        """
+        if np is None:
+            raise ImportError("Wektorowe liczenie zysków wymaga pakietu numpy")
+        weight_dtype = np.int64 if memoryview(self.weights).format == "q" else np.float64
+        return (
+            np.frombuffer(self.offsets, dtype=np.int64),
+            np.frombuffer(self.adjacency, dtype=np.int64),
+            np.frombuffer(self.adjacency_weights, dtype=weight_dtype),
+        )
+
+    def cut(self, solution):
+        """
+        Wartość cięcia - jedno przejście po unikalnych krawędziach, bez budowania zbioru odwiedzonych
+        :param solution: lista 0/1 dla każdego wierzchołka
+        :return: suma wag przeciętych krawędzi
+        """
+        total = 0
+        for u, v, w in zip(self.src, self.dst, self.weights):
+            if solution[u] != solution[v]:
+                total += w
+        return total
+
+
+class CutState:
+    """
+    Stan cięcia dla algorytmów przeszukiwania lokalnego.
+    Trzymamy bieżące rozwiązanie, wartość cięcia oraz wektor zysków gains, gdzie gains[v] to zmiana cięcia
+    po odwróceniu wierzchołka v. Zysk odczytujemy w O(1), a odwrócenie wierzchołka kosztuje O(deg(v)) -
+    nie trzeba kopiować rozwiązania ani liczyć funkcji celu od zera dla każdego sąsiada.
+    """
+
+    def __init__(self, graph, solution, cut=None, gains=None):
+        """
+        :param graph: Graph
+        :param solution: lista 0/1 dla każdego wierzchołka (kopiowana)
+        :param cut: znane cięcie rozwiązania (np. z punktu roboczego) - razem z gains pomija liczenie od zera
+        :param gains: znany wektor zysków rozwiązania (kopiowany)
+        """
+        self.graph = graph
+        self.solution = list(solution)
+        if cut is not None and gains is not None:
+            self.cut = cut
+            self.gains = list(gains)
+        else:
+            self.cut = graph.cut(self.solution)
+            self.gains = self._compute_gains()
+
+    def _compute_gains(self):
+        solution = self.solution
+        gains = [0] * self.graph.num_vertices
+        for u, v, w in self.graph:
+            if solution[u] == solution[v]:
+                gains[u] += w
+                gains[v] += w
+            else:
+                gains[u] -= w
+                gains[v] -= w
+        return gains
+
+    def gain(self, v):
+        """
+        :param v: wierzchołek
+        :return: zmiana cięcia po odwróceniu wierzchołka v
+        """
+        return self.gains[v]
+
+    def best_move(self):
+        """
+        :return: wierzchołek o największym zysku (przy remisie - o najmniejszym indeksie)
+        """
+        gains = self.gains
+        return max(range(len(gains)), key=gains.__getitem__)
+
+    def neighbour(self, v):
+        """
+        :param v: wierzchołek
+        :return: kopia rozwiązania z odwróconym wierzchołkiem v
+        """
+        neighbour = self.solution[:]
+        neighbour[v] = 1 - neighbour[v]
+        return neighbour
+
+    def restore(self, solution, cut, gains):
+        """
+        Powrót do zapamiętanego punktu (np. punktu roboczego tabu) - kopiujemy rozwiązanie, cięcie i zyski
+        do istniejącego stanu
+        """
+        self.solution[:] = solution
+        self.cut = cut
+        self.gains[:] = gains
+
+    def flip(self, v):
+        """
+        Odwrócenie wierzchołka v i aktualizacja cięcia oraz zysków jego sąsiadów - O(deg(v))
+        :param v: wierzchołek
+        """
+        solution, gains, graph = self.solution, self.gains, self.graph
+        self.cut += gains[v]
+        gains[v] = -gains[v]
+        side = 1 - solution[v]
+        solution[v] = side
+
+        adjacency, adjacency_weights = graph.adjacency, graph.adjacency_weights
+        for i in range(graph.offsets[v], graph.offsets[v + 1]):
+            u = adjacency[i]
+            if solution[u] == side:
+                gains[u] += 2 * adjacency_weights[i]
+            else:
+                gains[u] -= 2 * adjacency_weights[i]
+
+
+class NeighbourhoodEvaluator:
+    """
+    Wektorowa ocena całego sąsiedztwa: zyski wszystkich n odwróceń jednym mnożeniem rzadkiej macierzy sąsiedztwa A
+    (tablice CSR grafu) przez wektor spinów s = 1 - 2x (+1/-1). Zysk odwrócenia v to s_v * (A s)_v, a cięcie
+    to x^T L x / 4 dla spinów, czyli (suma ważonych stopni - s^T A s) / 4.
+    Zamiast n kopii rozwiązania i n wywołań funkcji celu mamy jedno przejście po tablicach. Ocena działa też dla
+    macierzy wielu rozwiązań naraz (np. wszystkich restartów) - wtedy to mnożenie przez macierz spinów.
+    """
+
+    def __init__(self, graph, chunk_elements=1 << 22):
+        """
+        :param graph: Graph
+        :param chunk_elements: limit rozmiaru macierzy pośredniej (rozwiązania x elementy sąsiedztwa)
+        """
+        offsets, self.adjacency, self.weights = graph.csr_arrays()
+        degrees = np.diff(offsets)
+        # Puste wiersze pomijamy, bo np.add.reduceat nie zwraca dla nich zera
+        self.rows = np.flatnonzero(degrees)
+        self.starts = offsets[:-1][self.rows]
+        self.total = self.weights.sum()
+        self.num_vertices = graph.num_vertices
+        self.chunk_elements = chunk_elements
+
+    def evaluate(self, solutions):
+        """
+        :param solutions: rozwiązanie (wektor 0/1) albo macierz P x n (np. z solutions_to_matrix())
+        :return: cięcie (albo wektor P cięć) i zyski odwróceń każdego wierzchołka (wektor n albo macierz P x n)
+        """
+        solutions = np.asarray(solutions)
+        single = solutions.ndim == 1
+        matrix = solutions.reshape(-1, self.num_vertices)
+        spins = 1 - 2 * matrix.astype(self.weights.dtype)
+        gains = np.zeros(spins.shape, dtype=self.weights.dtype)
+        step = max(1, self.chunk_elements // max(len(self.adjacency), 1))
+        for start in range(0, len(spins), step):
+            chunk = spins[start:start + step]
+            if len(self.rows):
+                products = chunk[:, self.adjacency] * self.weights
+                gains[start:start + step, self.rows] = np.add.reduceat(products, self.starts, axis=1)
+            gains[start:start + step] *= chunk
+        quadratic = self.total - gains.sum(axis=1)
+        cuts = quadratic // 4 if self.weights.dtype.kind == "i" else quadratic / 4
+        if single:
+            return cuts[0], gains[0]
+        return cuts, gains
+
+
+class MatVecCutState(CutState):
+    """
+    CutState, w którym zyski po każdym odwróceniu liczymy od nowa jednym mnożeniem macierz-wektor
+    (NeighbourhoodEvaluator) zamiast aktualizacji sąsiadów - ruch kosztuje O(m) operacji wektorowych.
+    Najlepszy ruch to argmax wektora zysków (przy remisie najmniejszy indeks, jak w CutState).
+    """
+
+    def __init__(self, graph, solution, evaluator=None):
+        """
+        :param graph: Graph
+        :param solution: lista 0/1 dla każdego wierzchołka (kopiowana)
+        :param evaluator: NeighbourhoodEvaluator grafu (domyślnie nowy)
+        """
+        self.graph = graph
+        self.solution = list(solution)
+        self.evaluator = evaluator if evaluator is not None else NeighbourhoodEvaluator(graph)
+        self._evaluate()
+
+    def _evaluate(self):
+        cut, gains = self.evaluator.evaluate(np.array(self.solution, dtype=np.uint8))
+        self.cut = cut.item()
+        self.gain_array = gains
+        self.gains = gains.tolist()
+
+    def best_move(self):
+        return int(np.argmax(self.gain_array))
+
+    def restore(self, solution, cut, gains):
+        self.solution[:] = solution
+        self.cut = cut
+        self.gains = list(gains)
+        self.gain_array = np.array(self.gains, dtype=self.evaluator.weights.dtype)
+
+    def flip(self, v):
+        self.solution[v] = 1 - self.solution[v]
+        self._evaluate()
+
+
+def as_graph(num_vertices, edges):
+    """
+    Zamiana listy krawędzi na obiekt Graph (jeśli to już Graph - zwracamy go bez zmian)
+    :param num_vertices: liczba wierzchołków
+    :param edges: lista krawędzi albo Graph
+    :return: obiekt Graph
+    """
+    if isinstance(edges, Graph):
+        return edges
+    return Graph.from_edges(num_vertices, edges)
+
+
+# Formaty plików z grafami rozpoznawane po rozszerzeniu (pozostałe - po nagłówku)
+_FORMAT_EXTENSIONS = {
+    ".rud": "rudy",
+    ".gset": "rudy",
+    ".dimacs": "dimacs",
+    ".col": "dimacs",
+    ".clq": "dimacs",
+    ".graph": "metis",
+    ".metis": "metis",
+}
+
+_BINARY_MAGIC = b"MAXCUT-CSR 1\n"
+_BINARY_SUFFIX = ".csr"
+
+# Od jakiego rozmiaru pliku źródłowego load_graph() domyślnie zapisuje binarny cache obok pliku
+_BINARY_CACHE_MIN_SIZE = 1 << 20
+
+
+def _parse_weight(token):
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+
+def _int_column(tokens, base):
+    """
+    :param tokens: tokeny jednej kolumny pliku
+    :param base: numer pierwszego wierzchołka w pliku (odejmowany od każdego numeru)
+    :return: array("q") numerów wierzchołków od 0
+    """
+    values = map(int, tokens)
+    return array("q", map((-base).__add__, values) if base else values)
+
+
+def _weight_column(tokens):
+    """
+    :param tokens: tokeny kolumny wag
+    :return: array("q") albo array("d"), gdy któraś waga nie jest całkowita
+    """
+    try:
+        return array("q", map(int, tokens))
+    except ValueError:
+        return array("d", map(float, tokens))
+
+
+def _numpy_columns(text, rows):
+    """
+    Cały tekst jako liczby jednym np.fromstring (parsowanie w C) - wagi całkowite, gdy w tekście nie ma
+    znaków liczb rzeczywistych (".", wykładnik, inf, nan)
+    :param rows: liczba niepustych linii tekstu
+    :return: macierz linii x 2 albo linii x 3 albo None, gdy tekst zawiera coś poza liczbami
+    """
+    integer = not any(c in text for c in ".eEnN")
+    with warnings.catch_warnings(record=True) as caught:
+        # Na tokenie, który nie jest liczbą, np.fromstring przerywa z ostrzeżeniem - wtedy czytamy w Pythonie
+        warnings.simplefilter("always", DeprecationWarning)
+        values = np.fromstring(text, dtype=np.int64 if integer else np.float64, sep=" ")
+    if caught or len(values) not in (2 * rows, 3 * rows):
+        return None
+    matrix = values.reshape(rows, -1)
+    if not integer and (matrix[:, :2] != np.floor(matrix[:, :2])).any():
+        return None
+    return matrix
+
+
+def _read_edge_lines(f, base, src, dst, weights, prefix=None):
+    """
+    Czytanie linii "u v [waga]" prosto do tablic (brak wagi = 1).
+    Gdy każda linia ma tyle samo tokenów, budujemy tablice kolumnami - z numpy cały tekst parsuje np.fromstring,
+    bez niego dzielimy go jednym split() i stosujemy map(int) na wycinkach listy tokenów - bez pracy w Pythonie
+    dla każdej linii. Pliki nieregularne (wagi tylko przy części krawędzi, komentarze między krawędziami) czytamy
+    linia po linii.
+    :param f: plik otwarty w trybie tekstowym, za nagłówkiem
+    :param base: numer pierwszego wierzchołka w pliku (0 albo 1)
+    :param prefix: jeśli podany - czytamy tylko linie z tym pierwszym tokenem (np. "e" w DIMACS)
+    :return: tablica wag (może zmienić typ na "d" przy wagach niecałkowitych)
+    """
+    text = f.read()
+    lines = text.splitlines()
+    rows = len(lines) - lines.count("")
+    if not rows:
+        return weights
+
+    matrix = _numpy_columns(text, rows) if np is not None and prefix is None else None
+    if matrix is not None:
+        src.frombytes((matrix[:, 0] - base).astype(np.int64).tobytes())
+        dst.frombytes((matrix[:, 1] - base).astype(np.int64).tobytes())
+        if matrix.shape[1] == 2:
+            weights.extend(itertools.repeat(1, rows))
+        elif matrix.dtype == np.int64 and weights.typecode == "q":
+            weights.frombytes(matrix[:, 2].tobytes())
+        else:
+            weights = array("d", weights)
+            weights.frombytes(matrix[:, 2].astype(np.float64).tobytes())
+        return weights
+
+    tokens = text.split()
+    skip = 0 if prefix is None else 1
+    width = len(tokens) // rows
+    if (
+        width * rows == len(tokens)
+        and width in (2 + skip, 3 + skip)
+        and (prefix is None or tokens[0::width].count(prefix) == rows)
+    ):
+        src.extend(_int_column(tokens[skip::width], base))
+        dst.extend(_int_column(tokens[skip + 1::width], base))
+        if width == 3 + skip:
+            column = _weight_column(tokens[skip + 2::width])
+            if column.typecode != weights.typecode:
+                weights, column = array("d", weights), array("d", column)
+            weights.extend(column)
+        else:
+            weights.extend(itertools.repeat(1, rows))
+        return weights
+
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+        if prefix is not None:
+            if parts[0] != prefix:
+                continue
+            parts = parts[1:]
+        src.append(int(parts[0]) - base)
+        dst.append(int(parts[1]) - base)
+        weights = _append_weight(weights, _parse_weight(parts[2]) if len(parts) > 2 else 1)
+    return weights
+
+
+def _read_metis(lines, header, src, dst, weights):
+    """
+    Format METIS: nagłówek "n m [fmt [ncon]]", potem linia i-ta to sąsiedzi wierzchołka i (numerowani od 1),
+    opcjonalnie poprzedzeni rozmiarem / wagami wierzchołka i przeplatani wagami krawędzi - zależnie od fmt.
+    Linie komentarzy zaczynają się od "%".
+    """
+    fmt = header[2].rjust(3, "0") if len(header) > 2 else "000"
+    ncon = int(header[3]) if len(header) > 3 else 1
+    skip = (1 if fmt[0] == "1" else 0) + (ncon if fmt[1] == "1" else 0)
+    has_edge_weights = fmt[2] == "1"
+    step = 2 if has_edge_weights else 1
+
+    u = 0
+    for line in lines:
+        if line.startswith("%"):
+            continue
+        parts = line.split()[skip:]
+        for i in range(0, len(parts), step):
+            src.append(u)
+            dst.append(int(parts[i]) - 1)
+            weights = _append_weight(weights, _parse_weight(parts[i + 1]) if has_edge_weights else 1)
+        u += 1
+    return weights
+
+
+def _detect_format(path, header):
+    for extension, fmt in _FORMAT_EXTENSIONS.items():
+        if path.endswith(extension):
+            return fmt
+    if header[0] in ("c", "p"):
+        return "dimacs"
+    return "edgelist" if len(header) == 1 else "rudy"
+
+
+def parse_graph_file(path, fmt=None):
+    """
+    Strumieniowe wczytanie grafu z pliku tekstowego prosto do tablic (bez readlines() i list krotek).
+    Obsługiwane formaty:
+    - "edgelist": pierwsza linia to liczba wierzchołków, dalej "u v waga", wierzchołki od 0 (format z graphs/),
+    - "rudy" (G-set): pierwsza linia "n m", dalej "u v waga", wierzchołki od 1,
+    - "dimacs": linie "c ..." (komentarze), "p edge n m", "e u v [waga]", wierzchołki od 1,
+    - "metis": nagłówek "n m [fmt [ncon]]" i listy sąsiedztwa, wierzchołki od 1.
+    Wagi mogą być całkowite albo zmiennoprzecinkowe.
+    :param path: ścieżka do pliku
+    :param fmt: format pliku (domyślnie rozpoznawany po rozszerzeniu i nagłówku)
+    :return: obiekt Graph
+    """
+    src, dst, weights = array("q"), array("q"), array("q")
+    with open(path, "r") as f:
+        header = f.readline().split()
+        while header and header[0] in ("c", "%"):
+            header = f.readline().split()
+        if not header:
+            raise ValueError(f"Pusty plik z grafem: {path}")
+        fmt = fmt or _detect_format(path, header)
+
+        if fmt == "edgelist":
+            num_vertices = int(header[0])
+            weights = _read_edge_lines(f, 0, src, dst, weights)
+        elif fmt in ("rudy", "gset"):
+            num_vertices = int(header[0])
+            weights = _read_edge_lines(f, 1, src, dst, weights)
+        elif fmt == "dimacs":
+            if header[0] == "p":
+                num_vertices = int(header[2])
+                weights = _read_edge_lines(f, 1, src, dst, weights, prefix="e")
+            else:
+                num_vertices = None
+                weights = array("q")
+                for line in f:
+                    parts = line.split()
+                    if parts and parts[0] == "p":
+                        num_vertices = int(parts[2])
+                        weights = _read_edge_lines(f, 1, src, dst, weights, prefix="e")
+                        break
+                if num_vertices is None:
+                    raise ValueError(f"Brak linii 'p' w pliku DIMACS: {path}")
+        elif fmt == "metis":
+            num_vertices = int(header[0])
+            weights = _read_metis(f, header, src, dst, weights)
+        else:
+            raise ValueError(f"Nieznany format grafu: {fmt}")
+
+    return Graph.from_arrays(num_vertices, src, dst, weights)
+
+
+def _graph_layout(num_vertices, num_edges, weights_format):
+    """
+    Układ tablic grafu w buforze binarnym (plik .csr, pamięć współdzielona): lista (typ elementu, długość)
+    dla src, dst, weights, offsets, adjacency, adjacency_weights, degrees - wszystkie elementy mają 8 bajtów
+    """
+    return [
+        ("q", num_edges), ("q", num_edges), (weights_format, num_edges),
+        ("q", num_vertices + 1), ("q", 2 * num_edges), (weights_format, 2 * num_edges), ("q", num_vertices),
+    ]
+
+
+def _graph_buffers(graph):
+    return (graph.src, graph.dst, graph.weights, graph.offsets, graph.adjacency, graph.adjacency_weights,
+            graph.degrees)
+
+
+def graph_from_buffer(buffer, num_vertices, num_edges, weights_format, start=0):
+    """
+    Graf, którego tablice są widokami memoryview na bufor (mmap, pamięć współdzielona) - bez kopiowania
+    :param buffer: obiekt z protokołem bufora, zawierający tablice w układzie _graph_layout od bajtu start
+    :return: obiekt Graph
+    """
+    view = memoryview(buffer)
+    arrays = []
+    position = start
+    for fmt, length in _graph_layout(num_vertices, num_edges, weights_format):
+        arrays.append(view[position:position + 8 * length].cast(fmt))
+        position += 8 * length
+
+    src, dst, weights, offsets, adjacency, adjacency_weights, degrees = arrays
+    return Graph(num_vertices, src, dst, weights, csr=(offsets, adjacency, adjacency_weights, degrees))
+
+
+def save_graph_binary(graph, path, source=None):
+    """
+    Zapis grafu w formacie binarnym: nagłówek + surowe tablice 8-bajtowe (krawędzie i CSR),
+    które load_graph_binary() mapuje do pamięci zamiast parsować tekst.
+    Zapis jest atomowy (plik tymczasowy + rename).
+    :param graph: Graph
+    :param path: ścieżka pliku wynikowego
+    :param source: opcjonalny plik źródłowy - jego rozmiar i czas modyfikacji trafiają do nagłówka
+    """
+    header = {
+        "num_vertices": graph.num_vertices,
+        "num_edges": len(graph),
+        "weights": memoryview(graph.weights).format,
+    }
+    if source is not None:
+        stat = os.stat(source)
+        header["source_size"] = stat.st_size
+        header["source_mtime_ns"] = stat.st_mtime_ns
+
+    header_line = json.dumps(header).encode()
+    # Wyrównanie tablic do 8 bajtów
+    padding = -(len(_BINARY_MAGIC) + len(header_line) + 1) % 8
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_BINARY_MAGIC + header_line + b" " * padding + b"\n")
+        for values in _graph_buffers(graph):
+            f.write(memoryview(values).cast("B"))
+    os.replace(tmp_path, path)
+
+
+def load_graph_binary(path, source=None):
+    """
+    Wczytanie grafu zapisanego przez save_graph_binary() - plik jest mapowany do pamięci (mmap),
+    a tablice grafu to widoki memoryview na zmapowane bajty, bez parsowania i kopiowania.
+    :param path: ścieżka do pliku binarnego
+    :param source: opcjonalny plik źródłowy - jeśli zmienił się od zapisu, zwracamy None
+    :return: obiekt Graph albo None, gdy plik jest nieaktualny
+    """
+    with open(path, "rb") as f:
+        if f.readline() != _BINARY_MAGIC:
+            raise ValueError(f"To nie jest binarny plik grafu: {path}")
+        header = json.loads(f.readline())
+        data_start = f.tell()
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if source is not None:
+        stat = os.stat(source)
+        if (header.get("source_size"), header.get("source_mtime_ns")) != (stat.st_size, stat.st_mtime_ns):
+            return None
+
+    return graph_from_buffer(mapped, header["num_vertices"], header["num_edges"], header["weights"], data_start)
+
+
+def share_graph(graph):
+    """
+    Skopiowanie tablic grafu do jednego bloku pamięci współdzielonej (multiprocessing.shared_memory),
+    żeby procesy robocze mogły korzystać z grafu bez jego kopiowania i ponownego wczytywania.
+    Wywołujący odpowiada za shm.close() i shm.unlink(), gdy procesy robocze skończą pracę.
+    :param graph: Graph
+    :return: blok SharedMemory, opis bloku dla attach_shared_graph (nazwa, liczba wierzchołków, krawędzi, typ wag)
+    """
+    buffers = _graph_buffers(graph)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, sum(8 * len(values) for values in buffers)))
+    position = 0
+    for values in buffers:
+        data = memoryview(values).cast("B")
+        shm.buf[position:position + len(data)] = data
+        position += len(data)
+    descriptor = (shm.name, graph.num_vertices, len(graph), memoryview(graph.weights).format)
+    return shm, descriptor
+
+
+def attach_shared_graph(descriptor):
+    """
+    Graf na bloku pamięci współdzielonej utworzonym przez share_graph (np. w procesie roboczym)
+    :param descriptor: opis bloku z share_graph
+    :return: blok SharedMemory (trzeba go trzymać, póki graf jest używany), Graph
+    """
+    name, num_vertices, num_edges, weights_format = descriptor
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, graph_from_buffer(shm.buf, num_vertices, num_edges, weights_format)
+
+
+def load_graph(path, fmt=None, cache=None):
+    """
+    Szybkie, ciche wczytanie grafu. Jeśli obok pliku jest aktualny cache binarny (<plik>.csr), jest on
+    mapowany do pamięci zamiast parsowania tekstu; w przeciwnym razie plik jest parsowany strumieniowo
+    (parse_graph_file) i - jeśli cache jest włączony - zapisywany jest cache na kolejne uruchomienia.
+    :param path: ścieżka do pliku z grafem (tekstowego albo binarnego .csr)
+    :param fmt: format pliku tekstowego (patrz parse_graph_file)
+    :param cache: True / False - czy używać cache binarnego; domyślnie tylko dla plików od 1 MiB
+    :return: obiekt Graph
+    """
+    if path.endswith(_BINARY_SUFFIX):
+        return load_graph_binary(path)
+
+    if cache is None:
+        cache = os.path.getsize(path) >= _BINARY_CACHE_MIN_SIZE
+    cache_path = path + _BINARY_SUFFIX
+
+    if cache and os.path.exists(cache_path):
+        try:
+            graph = load_graph_binary(cache_path, source=path)
+        except (OSError, ValueError):
+            graph = None
+        if graph is not None:
+            return graph
+
+    graph = parse_graph_file(path, fmt)
+    if cache:
+        try:
+            save_graph_binary(graph, cache_path, source=path)
+        except OSError:
+            # Brak prawa zapisu obok pliku - cache jest tylko optymalizacją
+            pass
+    return graph
 
 
 def load_graph_from_file(file):
     """
-    Wczytywanie grafu z pliku tekstowego
-    :param file: plik tekstowy
-    :return: liczba wierzchołków, lista krawędzi
+    Wczytywanie grafu z pliku (load_graph), bez wypisywania listy krawędzi
+    :param file: plik z grafem
+    :return: liczba wierzchołków, graf (Graph)
     """
-    edges = []
-    with open(file, "r") as f:
-        lines = f.readlines()
-        num_vertices = int(lines[0].strip())
-        for line in lines[1:]:
-            if line.strip():
-                src, dest, weight = map(int, line.strip().split())
-                edges.append((src, dest, weight))
-    print(f"Liczba wierzchołków: {num_vertices}")
-    print(f"Krawędzie: {edges}")
-    return num_vertices, edges
+    graph = load_graph(file)
+    print(f"Liczba wierzchołków: {graph.num_vertices}, liczba krawędzi: {len(graph)}")
+    return graph.num_vertices, graph
 
 
 def random_probe(num_vertices):
@@ -27,20 +795,72 @@ def random_probe(num_vertices):
     :param num_vertices: liczba wierzchołków
     :return: lista zawierająca losowy podział wierzchołków [0 / 1 dla każdego wierzchołka]
     """
-    random_probe_list = []
-    for _ in range(num_vertices):
-        random_probe_list.append(random.randint(0, 1))
-    return random_probe_list
+    return unpack_solution(random.getrandbits(num_vertices), num_vertices)
+
+
+def pack_solution(solution):
+    """
+    Pakowanie rozwiązania do liczby całkowitej - bit i to zbiór wierzchołka i.
+    Taka postać zajmuje ok. n/8 bajtów, jest hashowalna, a porównanie kosztuje O(n/64).
+    :param solution: lista 0/1 dla każdego wierzchołka
+    :return: rozwiązanie jako liczba całkowita (bitset)
+    """
+    if not solution:
+        return 0
+    return int(bytes(solution[::-1]).translate(_GENES_TO_DIGITS), 2)
+
+
+def unpack_solution(bits, num_vertices):
+    """
+    Rozpakowanie bitsetu z pack_solution() do listy 0/1
+    :param bits: rozwiązanie jako liczba całkowita
+    :param num_vertices: liczba wierzchołków
+    :return: lista 0/1 dla każdego wierzchołka
+    """
+    if num_vertices == 0:
+        return []
+    digits = format(bits & ((1 << num_vertices) - 1), f"0{num_vertices}b")
+    return list(digits[::-1].encode().translate(_DIGITS_TO_GENES))
+
+
+def random_mask(num_bits, probability):
+    """
+    Losowa maska bitowa - każdy bit ustawiony niezależnie z podanym prawdopodobieństwem.
+    Dla p = 0.5 to jedno getrandbits, w przeciwnym razie losujemy odstępy między ustawionymi bitami
+    (rozkład geometryczny), więc koszt zależy od liczby ustawionych bitów, a nie od num_bits.
+    :param num_bits: liczba bitów
+    :param probability: prawdopodobieństwo ustawienia bitu
+    :return: maska jako liczba całkowita
+    """
+    if probability <= 0 or num_bits == 0:
+        return 0
+    if probability >= 1:
+        return (1 << num_bits) - 1
+    if probability == 0.5:
+        return random.getrandbits(num_bits)
+
+    positions = []
+    log_q = math.log(1.0 - probability)
+    i = -1
+    while True:
+        i += 1 + int(math.log(1.0 - random.random()) / log_q)
+        if i >= num_bits:
+            break
+        positions.append(i)
+    return sum(1 << i for i in positions)
 
 
 def goal_function(edges, random_probe_list):
     """
     Funkcja celu -> celem jest uzyskanie maksymalnej sumy wag krawędzi przeciętych
     przez podział wierzchołków na dwa zbiory
-    :param edges: lista krawędzi
+    :param edges: lista krawędzi albo Graph
     :param random_probe_list: losowo wygenerowana lista z random_probe()
     :return: suma wag przeciętych krawędzi
     """
+    if isinstance(edges, Graph):
+        return edges.cut(random_probe_list)
+
     cut = 0
     seen = set()
 
@@ -54,6 +874,42 @@ def goal_function(edges, random_probe_list):
     return cut
 
 
+def solutions_to_matrix(solutions, num_vertices):
+    """
+    Zamiana listy rozwiązań (listy 0/1 albo bitsety z pack_solution) na macierz P x n typu uint8
+    :param solutions: lista rozwiązań
+    :param num_vertices: liczba wierzchołków
+    :return: np.ndarray P x n
+    """
+    if solutions and isinstance(solutions[0], int):
+        num_bytes = (num_vertices + 7) // 8
+        packed = np.frombuffer(
+            b"".join(bits.to_bytes(num_bytes, "little") for bits in solutions), dtype=np.uint8
+        ).reshape(len(solutions), num_bytes)
+        return np.unpackbits(packed, axis=1, count=num_vertices, bitorder="little")
+    return np.array(solutions, dtype=np.uint8).reshape(len(solutions), num_vertices)
+
+
+def evaluate_population(graph, population_matrix, chunk_elements=1 << 22):
+    """
+    Wektorowa funkcja celu dla całej populacji naraz: sum(w * (X[:, src] != X[:, dst])) dla każdego wiersza.
+    Krawędzie przetwarzamy porcjami, by macierz pośrednia P x m nie przekraczała chunk_elements elementów.
+    :param graph: Graph
+    :param population_matrix: macierz P x n typu uint8 (np. z solutions_to_matrix())
+    :param chunk_elements: limit rozmiaru macierzy pośredniej
+    :return: np.ndarray długości P z wartościami cięcia
+    """
+    src, dst, weights = graph.edge_arrays()
+    rows = population_matrix.shape[0]
+    cuts = np.zeros(rows, dtype=weights.dtype)
+    step = max(1, chunk_elements // max(rows, 1))
+    for start in range(0, len(weights), step):
+        end = start + step
+        crossed = population_matrix[:, src[start:end]] ^ population_matrix[:, dst[start:end]]
+        cuts += crossed @ weights[start:end]
+    return cuts
+
+
 def generate_neighbours(num_vertices, random_probe_list):
     """
     Tworzymy sasiądów, wszystkie możliwe rozwiązania - rózniącę się od siebie jednym wierzchołkiem
@@ -82,24 +938,34 @@ def generate_all_solutions(num_vertices):
         all_solutions.append(list(solution))
     return all_solutions
 
-def back_to_work_point(working_points, edges, tabu_list):
+def work_point(state):
+    """
+    Punkt roboczy do historii tabu: kopia rozwiązania, cięcie i wektor zysków.
+    Najlepszy ruch z punktu wyznacza dopiero back_to_work_point - tylko dla punktów, do których wracamy.
+    :param state: CutState
+    :return: słownik z kluczami "solution", "cut", "gains"
+    """
+    return {"solution": state.solution[:], "cut": state.cut, "gains": state.gains[:]}
+
+
+def back_to_work_point(working_points, stats=None):
     """
-    Szukamy możliwego powrotu algorytmu do tabu, do porzedniego punktu roboczego.
-    Musimy spełnić kryteria -> punkt nie może już istnieć w liście tabu, a jego funkcja celu
-    powinna osiągnąć lepszy wynik niż obecny punkt.
-    :param working_points: Przechowywane punkty robocze
-    :param edges: lista krawędzi
-    :param tabu_list: lista tabu, z zakazanymi punktami.
-    :return: Punkt roboczy jeśli jest dostępny, w przeciwnym przypadku None
+    Szukamy możliwego powrotu algorytmu tabu do poprzedniego punktu roboczego - takiego, z którego istnieje ruch
+    poprawiający funkcję celu. Przy powrocie pamięć tabu jest czyszczona, więc najlepszy ruch z punktu to ruch
+    o największym zapamiętanym zysku - wyznaczamy go z wektora zysków punktu, bez liczenia funkcji celu.
+    :param working_points: Przechowywane punkty robocze (lista albo deque, zdejmujemy od końca)
+    :param stats: SolverStats - liczymy odczyty zapamiętanych zysków
+    :return: Punkt roboczy z dopisanym najlepszym ruchem ("move") i jego zyskiem ("gain"), a gdy żaden punkt
+        nie ma ruchu poprawiającego - None
     """
     while working_points:
         working_point = working_points.pop()
-        neighbours = generate_neighbours(len(working_point["solution"]), working_point["solution"])
-        for neighbour in neighbours:
-            if neighbour not in tabu_list:
-                neigh_cut = goal_function(edges, neighbour)
-                if neigh_cut > working_point["cut"]:
-                    print(f"Znaleziono punkt roboczy, który nie jest zakazany, a oferuje lepszy wynik: {neigh_cut} > {working_point["cut"]}")
-                    return working_point
-    print(f"Nie ma dostępnych punktów roboczych, które mogłyby poprawić wynik")
-    return None
\ No newline at end of file
+        gains = working_point["gains"]
+        if stats is not None:
+            stats.delta_evaluations += len(gains)
+        gain = max(gains, default=0)
+        if gain > 0:
+            working_point["move"] = gains.index(gain)
+            working_point["gain"] = gain
+            return working_point
+    return None
@@ -1,54 +1,91 @@
 import random
+import time
 from graph_utils import (
+    as_graph,
+    CutState,
     random_probe,
     goal_function,
-    generate_neighbours,
     load_graph_from_file,
 )
+from tracing import SUMMARY, ITERATION, as_tracer, add_trace_arguments, tracer_from_args
+from instrumentation import (
+    TIME_LIMIT_REASON,
+    as_stats,
+    deadline_after,
+    add_instrumentation_arguments,
+    stats_from_args,
+    print_stats,
+)
 
 
-def hill_climbing_random(num_vertices, edges, max_iterations=100):
+def hill_climbing_random(num_vertices, edges, max_iterations=100, tracer=None, stats=None, time_limit=None):
     """
-    Algorytm wspinaczkowy z losowym wyborem sasiąda
+    Algorytm wspinaczkowy z losowym wyborem sasiąda.
+    Losujemy wierzchołek do odwrócenia, a cięcie sąsiada odczytujemy z zysków CutState.
     :param num_vertices: liczba wierzchołków
-    :param edges: lista krawędzi
+    :param edges: lista krawędzi albo Graph
     :param max_iterations: ilość iteracji, by algorytm nie utknął
+    :param tracer: Tracer (domyślnie poziom summary na konsolę)
+    :param stats: SolverStats - liczniki pracy
+    :param time_limit: limit czasu w sekundach (sprawdzany co 1024 iteracje) - po jego przekroczeniu
+        zwracamy bieżące rozwiązanie
     :return: maksymalne cięcie
     """
-    solution = random_probe(num_vertices)
-    cut = goal_function(edges, solution)
-    print(f"Punkt startowy: {solution}, cięcie: {cut}")
-
-    print(
-        f"\n{'Iteracja':<10} {'Bieżące rozwiązanie':<30} {'Cięcie':<10} {'Losowy sąsiad':<30} {'Cięcie sąsiada':<15} {'Akcja':<20}"
-    )
-    print("-" * 110)
+    edges = as_graph(num_vertices, edges)
+    tracer = as_tracer(tracer)
+    stats = as_stats(stats)
+    stats.start()
+    deadline = deadline_after(time_limit)
+    reason = "Osiągnięto maksymalną liczbę iteracji"
+    state = CutState(edges, random_probe(num_vertices))
+
+    tracer.emit(SUMMARY, "start", cut=state.cut, solution=state.solution if tracer.debug else None)
+
+    columns = [("Iteracja", "iteration", 10), ("Cięcie", "cut", 10), ("Losowy ruch", "move", 30),
+               ("Cięcie sąsiada", "neighbour_cut", 15), ("Akcja", "action", 20)]
+    if tracer.debug:
+        columns.insert(1, ("Bieżące rozwiązanie", "solution", 30))
+    tracer.table("iteration", columns)
+    events, rows, debug = tracer.events, tracer.rows, tracer.debug
 
     i = 0
+    accepted = 0
     while i < max_iterations:
-        neighbours = generate_neighbours(num_vertices, solution)
-        neighbour = random.choice(neighbours)
-        neighbour_cut = goal_function(edges, neighbour)
-
-        action = ""
-        if neighbour_cut > cut:
-            solution = neighbour
-            cut = neighbour_cut
-            action = "Przechodzimy do sąsiada"
-        else:
-            action = "Brak lepszego sąsiada"
-
-        print(
-            f"{i + 1:<10} {str(solution):<30} {cut:<10} {str(neighbour):<30} {neighbour_cut:<15} {action:<20}"
-        )
+        move = random.randrange(num_vertices)
+        neighbour_cut = state.cut + state.gains[move]
+
+        improved = neighbour_cut > state.cut
+        if improved:
+            state.flip(move)
+            accepted += 1
+            if events:
+                tracer.emit(ITERATION, "improvement", iteration=i + 1, cut=state.cut)
+
+        if rows and (i + 1) % rows == 0:
+            tracer.emit(
+                ITERATION, "iteration", iteration=i + 1, cut=state.cut, move=move, neighbour_cut=neighbour_cut,
+                action="Przechodzimy do sąsiada" if improved else "Brak lepszego sąsiada",
+                solution=state.solution if debug else None,
+            )
 
         i += 1
+        if i % 1024 == 0 and time.perf_counter() >= deadline:
+            reason = TIME_LIMIT_REASON
+            break
 
-    return solution, cut, i
+    tracer.emit(SUMMARY, "stop", iteration=i, cut=state.cut, reason=reason)
+
+    stats.evaluations += 1
+    stats.delta_evaluations += i
+    stats.accepted += accepted
+    stats.rejected += i - accepted
+    stats.stop()
+    return state.solution, state.cut, i
 
 
 if __name__ == "__main__":
     import argparse
+    from multistart import multi_start, add_multistart_arguments, print_multistart
 
     parser = argparse.ArgumentParser(description="Hill Climbing Losowy")
     parser.add_argument(
@@ -58,6 +95,10 @@ if __name__ == "__main__":
         "--max_iterations", type=int, default=100, help="Maksymalna liczba iteracji"
     )
 
+    add_trace_arguments(parser)
+    add_instrumentation_arguments(parser)
+    add_multistart_arguments(parser)
+
     args = parser.parse_args()
 
     num_vertices, edges = load_graph_from_file(args.input)
@@ -67,10 +108,23 @@ if __name__ == "__main__":
     )
     print(f"Parametry: max_iterations={args.max_iterations}\n")
 
-    solutionR, cutR, iR = hill_climbing_random(num_vertices, edges, args.max_iterations)
-
-    print("\nPodsumowanie:")
-    print(f"Najlepsze rozwiązanie: {solutionR}")
-    print(f"Wartość cięcia: {cutR}")
-    print(f"Weryfikacja: {goal_function(edges, solutionR)}")
-    print(f"Liczba wykonanych iteracji: {iR}")
+    if args.restarts > 1:
+        solution, cut, runs = multi_start(
+            "hill_climbing_random", num_vertices, edges, args.restarts, args.workers, args.seed,
+            max_iterations=args.max_iterations,
+        )
+        print_multistart(solution, cut, runs)
+    else:
+        if args.seed is not None:
+            random.seed(args.seed)
+        tracer = tracer_from_args(args)
+        stats = stats_from_args(args)
+        solutionR, cutR, iR = hill_climbing_random(num_vertices, edges, args.max_iterations, tracer, stats)
+        tracer.close()
+
+        print("\nPodsumowanie:")
+        print(f"Najlepsze rozwiązanie: {solutionR}")
+        print(f"Wartość cięcia: {cutR}")
+        print(f"Weryfikacja: {goal_function(edges, solutionR)}")
+        print(f"Liczba wykonanych iteracji: {iR}")
+        print_stats(stats, args)
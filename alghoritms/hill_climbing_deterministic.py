@@ -1,64 +1,149 @@
+import time
 from graph_utils import (
+    as_graph,
+    CutState,
+    MatVecCutState,
+    NeighbourhoodEvaluator,
     random_probe,
     goal_function,
-    generate_neighbours,
     load_graph_from_file,
+    solutions_to_matrix,
+    np,
+)
+from gain_buckets import QueueCutState
+from tracing import SUMMARY, ITERATION, as_tracer, add_trace_arguments, tracer_from_args
+from instrumentation import (
+    TIME_LIMIT_REASON,
+    as_stats,
+    deadline_after,
+    add_instrumentation_arguments,
+    stats_from_args,
+    print_stats,
 )
 
 
-def hill_climbing_deterministic(num_vertices, edges, max_iterations=100):
+def hill_climbing_deterministic(
+    num_vertices, edges, max_iterations=100, tracer=None, stats=None, time_limit=None, moves="auto"
+):
     """
-    Algorytm wspinaczkowy z deterministycznym wyborem najlepszego sąsiada
+    Algorytm wspinaczkowy z deterministycznym wyborem najlepszego sąsiada.
+    Sąsiadów nie kopiujemy - najlepszy ruch to wierzchołek o największym zysku w CutState. Domyślnie zyski
+    trzymamy w kolejce (QueueCutState), więc wybór ruchu nie przegląda wszystkich wierzchołków, a pełne zejście
+    do optimum lokalnego na grafie rzadkim jest prawie liniowe.
     :param num_vertices: liczba wierzchołków
-    :param edges: lista krawędzi
+    :param edges: lista krawędzi albo Graph
     :param max_iterations: ilość iteracji, by algorytm nie utknął
+    :param tracer: Tracer (domyślnie poziom summary na konsolę)
+    :param stats: SolverStats - liczniki pracy i czas fazy "neighbourhood"
+    :param time_limit: limit czasu w sekundach - po jego przekroczeniu zwracamy bieżące rozwiązanie
+    :param moves: wybór najlepszego ruchu - "scan" (przegląd wszystkich zysków, przy remisie najmniejszy indeks),
+        "buckets" (kubełki zysków, wagi całkowite), "heap" (kopiec), "auto" (kubełki albo kopiec według wag)
+        albo "matvec" (zyski całego sąsiedztwa mnożeniem macierz-wektor w numpy, ruchy jak przy "scan")
     :return: maksymalne cięcie
     """
-    solution = random_probe(num_vertices)
-    cut = goal_function(edges, solution)
-    best_neighbour = solution
-    best_cut = cut
-
-    print(f"Punkt startowy: {solution}, cięcie: {cut}")
-
-    print(
-        f"\n{'Iteracja':<10} {'Bieżące rozwiązanie':<30} {'Cięcie':<10} {'Najlepszy sąsiad':<30} {'Cięcie sąsiada':<15} {'Akcja':<20}"
-    )
-    print("-" * 110)
+    edges = as_graph(num_vertices, edges)
+    tracer = as_tracer(tracer)
+    stats = as_stats(stats)
+    stats.start()
+    deadline = deadline_after(time_limit)
+    if moves == "scan":
+        state = CutState(edges, random_probe(num_vertices))
+    elif moves == "matvec":
+        state = MatVecCutState(edges, random_probe(num_vertices))
+    else:
+        state = QueueCutState(edges, random_probe(num_vertices), moves)
+    # Przegląd sąsiedztwa odczytuje zyski wszystkich wierzchołków, kolejka - tylko zysk wybranego
+    reads = 1 if isinstance(state, QueueCutState) else num_vertices
+
+    tracer.emit(SUMMARY, "start", cut=state.cut, solution=state.solution if tracer.debug else None)
+
+    columns = [("Iteracja", "iteration", 10), ("Cięcie", "cut", 10), ("Ruch", "move", 30),
+               ("Cięcie sąsiada", "neighbour_cut", 15), ("Akcja", "action", 20)]
+    if tracer.debug:
+        columns.insert(1, ("Bieżące rozwiązanie", "solution", 30))
+    tracer.table("iteration", columns)
+    events, rows, debug = tracer.events, tracer.rows, tracer.debug
 
     i = 0
+    scans = 0
     while i < max_iterations:
-        neighbours = generate_neighbours(num_vertices, solution)
-
-        for neighbour in neighbours:
-            neighbour_cut = goal_function(edges, neighbour)
-            if neighbour_cut > best_cut:
-                best_neighbour = neighbour
-                best_cut = neighbour_cut
-
-        action = ""
-        if best_cut <= cut:
-            action = "Optimum lokalne, koniec"
-            print(
-                f"{i + 1:<10} {str(solution):<30} {cut:<10} {'-':<30} {'-':<15} {action:<20}"
-            )
+        with stats.phase("neighbourhood"):
+            move = state.best_move()
+        scans += 1
+
+        if state.gains[move] <= 0:
+            if rows:
+                tracer.emit(
+                    ITERATION, "iteration", iteration=i + 1, cut=state.cut, action="Optimum lokalne, koniec",
+                    solution=state.solution if debug else None,
+                )
+            tracer.emit(SUMMARY, "stop", iteration=i, cut=state.cut, reason="Optimum lokalne")
             break
-        else:
-            action = "Przechodzimy do sąsiada"
-            solution = best_neighbour
-            cut = best_cut
 
-        print(
-            f"{i + 1:<10} {str(solution):<30} {cut:<10} {str(best_neighbour):<30} {best_cut:<15} {action:<20}"
-        )
+        state.flip(move)
+
+        if events:
+            tracer.emit(ITERATION, "improvement", iteration=i + 1, cut=state.cut)
+        if rows and (i + 1) % rows == 0:
+            tracer.emit(
+                ITERATION, "iteration", iteration=i + 1, cut=state.cut, move=move, neighbour_cut=state.cut,
+                action="Przechodzimy do sąsiada", solution=state.solution if debug else None,
+            )
 
         i += 1
+        if time.perf_counter() >= deadline:
+            tracer.emit(SUMMARY, "stop", iteration=i, cut=state.cut, reason=TIME_LIMIT_REASON)
+            break
+    else:
+        tracer.emit(SUMMARY, "stop", iteration=i, cut=state.cut, reason="Osiągnięto maksymalną liczbę iteracji")
 
-    return solution, cut, i
+    stats.evaluations += 1
+    stats.neighbourhoods += scans
+    stats.delta_evaluations += scans * reads
+    stats.accepted += i
+    stats.rejected += scans - i
+    stats.stop()
+    return state.solution, state.cut, i
+
+
+def hill_climbing_batch(num_vertices, edges, starts, max_iterations=100, time_limit=None):
+    """
+    Algorytm wspinaczkowy z wyborem najlepszego sąsiada, wykonywany dla wielu punktów startowych naraz
+    (np. restartów multi_start). Rozwiązania to wiersze macierzy, a w każdej iteracji zyski wszystkich
+    jeszcze aktywnych wierszy liczy jedno mnożenie rzadkiej macierzy sąsiedztwa przez macierz spinów
+    (NeighbourhoodEvaluator). Każdy wiersz przechodzi tę samą drogę, co hill_climbing_deterministic z moves="scan".
+    :param num_vertices: liczba wierzchołków
+    :param edges: lista krawędzi albo Graph
+    :param starts: lista punktów startowych (listy 0/1)
+    :param max_iterations: ilość iteracji każdego punktu
+    :param time_limit: limit czasu w sekundach dla wszystkich punktów (sprawdzany co iterację)
+    :return: lista rozwiązań, lista cięć, lista liczby iteracji, lista liczby przeglądów sąsiedztwa
+    """
+    evaluator = NeighbourhoodEvaluator(as_graph(num_vertices, edges))
+    deadline = deadline_after(time_limit)
+    matrix = solutions_to_matrix(starts, num_vertices)
+    iterations = np.zeros(len(starts), dtype=np.int64)
+    scans = np.zeros(len(starts), dtype=np.int64)
+    active = np.arange(len(starts))
+    while time.perf_counter() < deadline:
+        active = active[iterations[active] < max_iterations]
+        if not active.size:
+            break
+        _, gains = evaluator.evaluate(matrix[active])
+        scans[active] += 1
+        moves = gains.argmax(axis=1)
+        improving = gains[np.arange(active.size), moves] > 0
+        active, moves = active[improving], moves[improving]
+        matrix[active, moves] ^= 1
+        iterations[active] += 1
+    cuts, _ = evaluator.evaluate(matrix)
+    return matrix.tolist(), cuts.tolist(), iterations.tolist(), scans.tolist()
 
 
 if __name__ == "__main__":
     import argparse
+    import random
+    from multistart import multi_start, add_multistart_arguments, print_multistart
 
     parser = argparse.ArgumentParser(description="Hill Climbing Deterministyczny")
     parser.add_argument(
@@ -67,6 +152,17 @@ if __name__ == "__main__":
     parser.add_argument(
         "--max_iterations", type=int, default=100, help="Maksymalna liczba iteracji"
     )
+    parser.add_argument(
+        "--moves",
+        type=str,
+        choices=["auto", "buckets", "heap", "scan", "matvec"],
+        default="auto",
+        help="Wybór najlepszego ruchu: kolejka zysków (kubełki/kopiec) albo przegląd wszystkich wierzchołków",
+    )
+
+    add_trace_arguments(parser)
+    add_instrumentation_arguments(parser)
+    add_multistart_arguments(parser)
 
     args = parser.parse_args()
 
@@ -77,12 +173,25 @@ if __name__ == "__main__":
     )
     print(f"Parametry: max_iterations={args.max_iterations}\n")
 
-    solution, cut, i = hill_climbing_deterministic(
-        num_vertices, edges, args.max_iterations
-    )
-
-    print("\nPodsumowanie:")
-    print(f"Najlepsze rozwiązanie: {solution}")
-    print(f"Wartość cięcia: {cut}")
-    print(f"Weryfikacja: {goal_function(edges, solution)}")
-    print(f"Liczba wykonanych iteracji: {i}")
+    if args.restarts > 1:
+        solution, cut, runs = multi_start(
+            "hill_climbing_deterministic", num_vertices, edges, args.restarts, args.workers, args.seed,
+            max_iterations=args.max_iterations, moves=args.moves,
+        )
+        print_multistart(solution, cut, runs)
+    else:
+        if args.seed is not None:
+            random.seed(args.seed)
+        tracer = tracer_from_args(args)
+        stats = stats_from_args(args)
+        solution, cut, i = hill_climbing_deterministic(
+            num_vertices, edges, args.max_iterations, tracer, stats, moves=args.moves
+        )
+        tracer.close()
+
+        print("\nPodsumowanie:")
+        print(f"Najlepsze rozwiązanie: {solution}")
+        print(f"Wartość cięcia: {cut}")
+        print(f"Weryfikacja: {goal_function(edges, solution)}")
+        print(f"Liczba wykonanych iteracji: {i}")
+        print_stats(stats, args)
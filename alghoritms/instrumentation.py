@@ -0,0 +1,250 @@
+import cProfile
+import io
+import math
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+# Liczniki pracy algorytmu:
+# - evaluations: pełne obliczenia funkcji celu (od zera, po wszystkich krawędziach),
+# - delta_evaluations: odczyty zysku ruchu z CutState (cięcie sąsiada bez liczenia go od zera),
+# - neighbourhoods: przeglądy całego sąsiedztwa (np. wybór najlepszego ruchu),
+# - accepted / rejected: przyjęte i odrzucone ruchy (albo potomkowie),
+# - cache_hits: oceny odczytane z cache zamiast liczenia funkcji celu.
+COUNTERS = ("evaluations", "delta_evaluations", "neighbourhoods", "accepted", "rejected", "cache_hits")
+
+# Powód zakończenia w zdarzeniu "stop", gdy skończył się budżet czasu
+TIME_LIMIT_REASON = "Przekroczono limit czasu"
+
+MESSAGES = {
+    "evaluations": "Pełne ewaluacje funkcji celu",
+    "delta_evaluations": "Ewaluacje przyrostowe (zyski ruchów)",
+    "neighbourhoods": "Przeglądy sąsiedztwa",
+    "accepted": "Zaakceptowane ruchy",
+    "rejected": "Odrzucone ruchy",
+    "cache_hits": "Trafienia w cache",
+}
+
+
+class SolverStats:
+    """
+    Statystyki pracy jednego uruchomienia algorytmu: liczniki z COUNTERS, czasy faz (selection, crossover,
+    mutation, evaluation, neighbourhood, ...) i czas całkowity. Algorytmy zwiększają liczniki bezpośrednio
+    (stats.accepted += 1) albo raz, na końcu, z własnych zmiennych lokalnych - w gorących pętlach nie ma
+    dodatkowych wywołań. Haki (ProfileHook, SamplingHook) są uruchamiane w start() i zatrzymywane w stop().
+    """
+
+    def __init__(self, hooks=()):
+        """
+        :param hooks: obiekty z metodami start(stats) i stop(stats)
+        """
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        self.phases = {}
+        self.wall_time = 0.0
+        self.hooks = list(hooks)
+        self._started = None
+
+    def start(self):
+        self._started = time.perf_counter()
+        for hook in self.hooks:
+            hook.start(self)
+
+    def stop(self):
+        for hook in reversed(self.hooks):
+            hook.stop(self)
+        if self._started is not None:
+            self.wall_time += time.perf_counter() - self._started
+            self._started = None
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Pomiar czasu fazy algorytmu - czasy tej samej fazy się sumują
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def elapsed(self):
+        """
+        :return: czas od start() (w trakcie działania) albo całkowity czas działania
+        """
+        if self._started is None:
+            return self.wall_time
+        return self.wall_time + time.perf_counter() - self._started
+
+    def counters(self):
+        return {name: getattr(self, name) for name in COUNTERS}
+
+    def merge(self, other):
+        """
+        Dodanie statystyk innego uruchomienia (np. restartu albo wyspy)
+        """
+        for name in COUNTERS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for name, seconds in other.phases.items():
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+        self.wall_time += other.wall_time
+        return self
+
+    def as_dict(self):
+        return {**self.counters(), "phases": dict(self.phases), "wall_time": self.wall_time}
+
+    def __getstate__(self):
+        # Haki (profiler, wątek) nie przechodzą między procesami - tylko zebrane liczby
+        state = self.__dict__.copy()
+        state["hooks"] = []
+        return state
+
+
+def deadline_after(time_limit):
+    """
+    :param time_limit: limit czasu w sekundach albo None
+    :return: chwila (według time.perf_counter), po której algorytm kończy działanie; bez limitu - nieskończoność,
+        więc pętle porównują czas bez dodatkowego sprawdzania None
+    """
+    return time.perf_counter() + time_limit if time_limit is not None else math.inf
+
+
+def as_stats(stats):
+    """
+    :param stats: SolverStats albo None
+    :return: podane statystyki albo nowe, których nikt nie odczyta
+    """
+    return stats if stats is not None else SolverStats()
+
+
+class ProfileHook:
+    """
+    cProfile włączony na czas działania algorytmu
+    """
+
+    def __init__(self, path=None):
+        """
+        :param path: plik, do którego zapisujemy profil (pstats) po zatrzymaniu; None - tylko w pamięci
+        """
+        self.path = path
+        self.profile = cProfile.Profile()
+
+    def start(self, stats):
+        self.profile.enable()
+
+    def stop(self, stats):
+        self.profile.disable()
+        if self.path is not None:
+            self.profile.dump_stats(self.path)
+
+    def report(self, sort="cumulative", limit=20):
+        """
+        :return: tekst z limit najdroższych funkcji
+        """
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+
+class SamplingHook:
+    """
+    Próbkowanie liczników w osobnym wątku co interval sekund - algorytm nie wykonuje żadnej dodatkowej pracy.
+    Domyślnie zapamiętujemy (czas, liczniki) w samples; własny callback(stats) może np. wypisywać postęp.
+    """
+
+    def __init__(self, callback=None, interval=1.0):
+        self.callback = callback
+        self.interval = interval
+        self.samples = []
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _sample(self, stats):
+        if self.callback is not None:
+            self.callback(stats)
+        else:
+            self.samples.append((stats.elapsed(), stats.counters()))
+
+    def _run(self, stats):
+        while not self._stopped.wait(self.interval):
+            self._sample(stats)
+
+    def start(self, stats):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, args=(stats,), daemon=True)
+        self._thread.start()
+
+    def stop(self, stats):
+        self._stopped.set()
+        self._thread.join()
+        self._sample(stats)
+
+
+class SolverResult:
+    """
+    Wspólny wynik algorytmu: najlepsze rozwiązanie, jego cięcie, liczba iteracji (generacji), SolverStats
+    i dodatkowe wyniki właściwe dla algorytmu (details, np. statystyki wysp albo drabiny temperatur)
+    """
+
+    def __init__(self, solution, cut, iterations=None, stats=None, details=None):
+        self.solution = solution
+        self.cut = cut
+        self.iterations = iterations
+        self.stats = as_stats(stats)
+        self.details = details if details is not None else {}
+
+    @property
+    def cost(self):
+        """
+        :return: liczba ocenionych rozwiązań (pełnych i przyrostowych) na jednostkę cięcia
+        """
+        work = self.stats.evaluations + self.stats.delta_evaluations
+        return work / self.cut if self.cut else None
+
+    def as_dict(self):
+        return {"cut": self.cut, "iterations": self.iterations, **self.stats.as_dict()}
+
+
+def add_instrumentation_arguments(parser):
+    """
+    Dodanie do argparse opcji statystyk i profilowania
+    """
+    parser.add_argument("--stats", action="store_true", help="Wypisz liczniki pracy i czasy faz algorytmu")
+    parser.add_argument(
+        "--profile",
+        type=str,
+        nargs="?",
+        const="",
+        default=None,
+        help="Profilowanie cProfile - bez wartości wypisuje najdroższe funkcje, z wartością zapisuje profil do pliku",
+    )
+
+
+def stats_from_args(args):
+    """
+    :return: SolverStats z hakiem profilowania zgodnie z opcjami z add_instrumentation_arguments
+    """
+    hooks = []
+    if args.profile is not None:
+        hooks.append(ProfileHook(args.profile or None))
+    return SolverStats(hooks)
+
+
+def print_stats(stats, args=None):
+    """
+    Wypisanie statystyk (przy opcji --stats) i raportu profilera (przy --profile bez pliku)
+    """
+    if args is None or args.stats:
+        print("\nStatystyki:")
+        for name, value in stats.counters().items():
+            print(f"{MESSAGES[name]}: {value}")
+        for name, seconds in stats.phases.items():
+            print(f"Faza {name}: {seconds:.4f} s")
+        print(f"Czas działania: {stats.wall_time:.4f} s")
+    for hook in stats.hooks:
+        if isinstance(hook, ProfileHook):
+            if hook.path is None:
+                print(hook.report())
+            else:
+                print(f"Zapisano profil do {hook.path}")
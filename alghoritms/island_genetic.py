@@ -0,0 +1,287 @@
+import multiprocessing
+import queue
+import random
+import time
+from genetic import GeneticEngine, NumpyGeneticEngine, FitnessCache
+from graph_utils import as_graph, share_graph, attach_shared_graph, pack_solution, unpack_solution
+
+# Domyślne ustawienia wysp - kolejne wyspy dostają różne operatory, co zwiększa różnorodność populacji
+_DEFAULT_OPERATORS = [
+    ("uniform", "multiplepoint"),
+    ("onepoint", "onepoint"),
+    ("uniform", "onepoint"),
+    ("onepoint", "multiplepoint"),
+]
+
+_ISLAND_DEFAULTS = {
+    "population_size": 50,
+    "mutation_rate": 0.2,
+    "mutation_multiple_rate": 0.2,
+    "crossover_rate": 0.5,
+    "elite_size": 3,
+}
+
+
+def island_settings(islands, island_params=None):
+    """
+    :param islands: liczba wysp
+    :param island_params: lista słowników z ustawieniami kolejnych wysp (crossover_type, mutation_type,
+        population_size, mutation_rate, mutation_multiple_rate, crossover_rate, elite_size);
+        brakujące wartości uzupełniamy domyślnymi
+    :return: lista pełnych ustawień wysp
+    """
+    settings = []
+    for i in range(islands):
+        crossover_type, mutation_type = _DEFAULT_OPERATORS[i % len(_DEFAULT_OPERATORS)]
+        island = {"crossover_type": crossover_type, "mutation_type": mutation_type, **_ISLAND_DEFAULTS}
+        if island_params is not None:
+            island.update(island_params[i % len(island_params)])
+        settings.append(island)
+    return settings
+
+
+def migration_targets(islands, epoch, topology, seed):
+    """
+    Do której wyspy trafiają emigranci z każdej wyspy w danej migracji.
+    Każda wyspa wysyła i odbiera dokładnie jedną grupę: "ring" - do następnej wyspy w pierścieniu,
+    "random" - losowa permutacja bez punktów stałych, wyznaczana z ziarna i numeru migracji,
+    więc wszystkie procesy liczą ją tak samo bez komunikacji.
+    :return: lista - targets[i] to wyspa docelowa dla wyspy i
+    """
+    if topology == "ring":
+        return [(i + 1) % islands for i in range(islands)]
+    rng = random.Random(seed * 1000003 + epoch)
+    targets = list(range(islands))
+    while any(target == i for i, target in enumerate(targets)):
+        rng.shuffle(targets)
+    return targets
+
+
+def _engine(graph, settings, engine):
+    island = dict(settings)
+    crossover_type, mutation_type = island.pop("crossover_type"), island.pop("mutation_type")
+    engine_class = NumpyGeneticEngine if engine == "numpy" else GeneticEngine
+    return engine_class(graph.num_vertices, graph, crossover_type, mutation_type, cache=FitnessCache(), **island)
+
+
+def _island_process(index, descriptor, settings, options, inboxes, results, stop, shared_best, shared_last):
+    """
+    Wyspa w osobnym procesie: generacje na własnej populacji, co migration_interval generacji wymiana
+    najlepszych osobników z innymi wyspami przez kolejki. Najlepsze cięcie i generacja ostatniej poprawy
+    są wspólne (multiprocessing.Value), a ustawienie zdarzenia stop kończy wszystkie wyspy.
+    """
+    shm, graph = attach_shared_graph(descriptor)
+    random.seed(options["seed"] + index)
+    ga = _engine(graph, settings, options["engine"])
+    population = ga.initial_population()
+    best_solution, best_value = ga.best(population)
+    islands = len(inboxes)
+    pending = {}
+
+    generations = 0
+    for generation in range(options["max_generations"]):
+        if stop.is_set():
+            break
+        population, _ = ga.next_generation(population)
+        generations += 1
+
+        solution, value = ga.best(population)
+        if value > best_value:
+            best_solution, best_value = solution, value
+        with shared_best.get_lock():
+            if best_value > shared_best.value:
+                shared_best.value = best_value
+                shared_last.value = generation
+            last_improvement = shared_last.value
+            global_best = shared_best.value
+
+        if options["target_cut"] is not None and global_best >= options["target_cut"]:
+            stop.set()
+        if time.time() >= options["end_time"]:
+            stop.set()
+        if (options["stop_condition"] == "max_no_improvement"
+                and generation - last_improvement >= options["max_no_improvement"]):
+            stop.set()
+
+        if islands > 1 and (generation + 1) % options["migration_interval"] == 0 and not stop.is_set():
+            epoch = (generation + 1) // options["migration_interval"]
+            target = migration_targets(islands, epoch, options["topology"], options["seed"])[index]
+            emigrants = [(pack_solution(x), value) for x, value in ga.emigrants(population, options["migration_size"])]
+            inboxes[target].put((epoch, emigrants))
+
+            # Wiadomości mogą przyjść z wyprzedzeniem (od szybszych wysp) - odkładamy je według numeru migracji
+            while epoch not in pending:
+                try:
+                    message_epoch, migrants = inboxes[index].get(timeout=0.05)
+                    pending[message_epoch] = migrants
+                except queue.Empty:
+                    if stop.is_set():
+                        break
+            if epoch not in pending:
+                break
+            migrants = [(unpack_solution(x, graph.num_vertices), value) for x, value in pending.pop(epoch)]
+            population = ga.immigrate(population, migrants)
+
+    results.put((index, best_value, pack_solution(best_solution), generations))
+    del graph, ga, population
+    shm.close()
+
+
+def _run_parallel(graph, settings, options):
+    context = multiprocessing.get_context()
+    islands = len(settings)
+    inboxes = [context.Queue() for _ in range(islands)]
+    results = context.Queue()
+    stop = context.Event()
+    shared_best = context.Value("d", float("-inf"))
+    shared_last = context.Value("q", 0)
+
+    shm, descriptor = share_graph(graph)
+    try:
+        processes = [
+            context.Process(
+                target=_island_process,
+                args=(i, descriptor, settings[i], options, inboxes, results, stop, shared_best, shared_last),
+            )
+            for i in range(islands)
+        ]
+        for process in processes:
+            process.start()
+        collected = []
+        while len(collected) < islands:
+            try:
+                collected.append(results.get(timeout=0.1))
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes) and results.empty():
+                    raise RuntimeError("Proces wyspy zakończył się bez wyniku")
+        # Nieodebrane wiadomości migracyjne (np. po zatrzymaniu) opróżniamy, żeby procesy mogły się zakończyć
+        while any(process.is_alive() for process in processes):
+            for inbox in inboxes:
+                try:
+                    while True:
+                        inbox.get_nowait()
+                except queue.Empty:
+                    pass
+            for process in processes:
+                process.join(timeout=0.05)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    collected.sort()
+    return [(value, unpack_solution(bits, graph.num_vertices), generations) for _, value, bits, generations in collected]
+
+
+def _run_serial(graph, settings, options):
+    """
+    Wszystkie wyspy w jednym procesie, generacja po generacji - ta sama migracja co w trybie równoległym,
+    przydatne do testów i na maszynach z jednym rdzeniem.
+    Każda wyspa ma własny strumień liczb losowych z ziarna seed + i, jak proces wyspy w trybie równoległym -
+    silniki korzystają z modułu random, więc przed krokiem wyspy przywracamy jej stan generatora, a po nim zapisujemy
+    """
+    engines, populations, bests, states = [], [], [], []
+    for i, island in enumerate(settings):
+        random.seed(options["seed"] + i)
+        ga = _engine(graph, island, options["engine"])
+        population = ga.initial_population()
+        engines.append(ga)
+        populations.append(population)
+        bests.append(ga.best(population))
+        states.append(random.getstate())
+    islands = len(engines)
+    global_best = max(value for _, value in bests)
+    last_improvement = 0
+
+    generations = 0
+    for generation in range(options["max_generations"]):
+        generations = generation + 1
+        for i, ga in enumerate(engines):
+            random.setstate(states[i])
+            populations[i], _ = ga.next_generation(populations[i])
+            states[i] = random.getstate()
+            solution, value = ga.best(populations[i])
+            if value > bests[i][1]:
+                bests[i] = (solution, value)
+            if value > global_best:
+                global_best = value
+                last_improvement = generation
+
+        if options["target_cut"] is not None and global_best >= options["target_cut"]:
+            break
+        if time.time() >= options["end_time"]:
+            break
+        if (options["stop_condition"] == "max_no_improvement"
+                and generation - last_improvement >= options["max_no_improvement"]):
+            break
+
+        if islands > 1 and generations % options["migration_interval"] == 0:
+            epoch = generations // options["migration_interval"]
+            targets = migration_targets(islands, epoch, options["topology"], options["seed"])
+            emigrants = [ga.emigrants(population, options["migration_size"])
+                         for ga, population in zip(engines, populations)]
+            for source, target in enumerate(targets):
+                populations[target] = engines[target].immigrate(populations[target], emigrants[source])
+
+    return [(value, solution, generations) for solution, value in bests]
+
+
+def island_genetic_algorithm(
+    num_vertices,
+    edges,
+    islands=4,
+    island_params=None,
+    max_generations=100,
+    stop_condition="max_generations",
+    max_no_improvement=20,
+    migration_interval=10,
+    migration_size=2,
+    topology="ring",
+    target_cut=None,
+    engine="python",
+    parallel=True,
+    seed=None,
+    time_limit=None,
+):
+    """
+    Wyspowy algorytm genetyczny: islands niezależnych populacji, każda z własnymi operatorami i parametrami,
+    rozwijana krokiem GeneticEngine / NumpyGeneticEngine. Co migration_interval generacji migration_size
+    najlepszych osobników każdej wyspy zastępuje najsłabsze osobniki wyspy docelowej (topologia "ring"
+    albo "random"). Warunek zakończenia jest wspólny: max_generations, brak poprawy globalnie najlepszego
+    cięcia przez max_no_improvement generacji, osiągnięcie target_cut na dowolnej wyspie albo upływ time_limit.
+    :param num_vertices: liczba wierzchołków
+    :param edges: lista krawędzi albo Graph
+    :param islands: liczba wysp
+    :param island_params: ustawienia wysp (patrz island_settings)
+    :param topology: "ring" albo "random"
+    :param target_cut: cięcie, po którego osiągnięciu kończymy
+    :param engine: "python" albo "numpy"
+    :param parallel: każda wyspa w osobnym procesie (graf w pamięci współdzielonej); False - wszystkie w bieżącym procesie
+    :param seed: ziarno (wyspa i dostaje seed + i)
+    :param time_limit: limit czasu w sekundach (sprawdzany po każdej generacji; czas ścienny, wspólny dla procesów)
+    :return: najlepsze cięcie, najlepsze rozwiązanie, statystyki wysp (lista słowników)
+    """
+    if topology not in ("ring", "random"):
+        raise ValueError(f"Nieznana topologia migracji: {topology}")
+    graph = as_graph(num_vertices, edges)
+    settings = island_settings(islands, island_params)
+    options = {
+        "max_generations": max_generations,
+        "stop_condition": stop_condition,
+        "max_no_improvement": max_no_improvement,
+        "migration_interval": max(1, migration_interval),
+        "migration_size": migration_size,
+        "topology": topology,
+        "target_cut": target_cut,
+        "end_time": time.time() + time_limit if time_limit is not None else float("inf"),
+        "engine": engine,
+        "seed": seed if seed is not None else random.getrandbits(32),
+    }
+
+    results = _run_parallel(graph, settings, options) if parallel and islands > 1 else _run_serial(graph, settings, options)
+
+    stats = [
+        {"island": i, "best_cut": value, "generations": generations, **settings[i]}
+        for i, (value, _, generations) in enumerate(results)
+    ]
+    best_value, best_solution, _ = max(results, key=lambda result: result[0])
+    return best_value, best_solution, stats
@@ -0,0 +1,168 @@
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from graph_utils import as_graph, share_graph, attach_shared_graph, pack_solution, unpack_solution, random_probe
+from tracing import Tracer, MemorySink, SUMMARY
+from instrumentation import SolverStats, as_stats
+
+SOLVERS = ("hill_climbing_deterministic", "hill_climbing_random", "tabu_search", "sim_annealing")
+
+# Graf procesu roboczego - widok na pamięć współdzieloną, dołączany raz w inicjalizatorze puli
+_worker_shm = None
+_worker_graph = None
+
+
+def _init_worker(descriptor):
+    global _worker_shm, _worker_graph
+    _worker_shm, _worker_graph = attach_shared_graph(descriptor)
+
+
+def run_solver(solver, graph, params, tracer, stats=None):
+    """
+    Jedno uruchomienie algorytmu lokalnego przeszukiwania przez rejestr algorytmów (solvers.SOLVERS)
+    :param solver: nazwa algorytmu z SOLVERS
+    :param graph: Graph
+    :param params: parametry algorytmu (np. max_iterations, tabu_size, T0, alpha, time_limit)
+    :param tracer: Tracer
+    :param stats: SolverStats (domyślnie nowe)
+    :return: SolverResult
+    """
+    from solvers import SOLVERS as REGISTRY
+
+    if solver not in SOLVERS:
+        raise ValueError(f"Nieznany algorytm: {solver}")
+    params = dict(params)
+    time_limit = params.pop("time_limit", None)
+    return REGISTRY[solver].run(graph, tracer, as_stats(stats), time_limit, **params)
+
+
+def _restart(solver, graph, params, seed):
+    """
+    Restart z ustalonym ziarnem. Liczbę iteracji odczytujemy ze zdarzenia "stop" - wspólnego dla algorytmów.
+    :return: słownik ze statystykami uruchomienia, rozwiązanie spakowane do bitsetu (mniej danych między procesami)
+    """
+    random.seed(seed)
+    sink = MemorySink()
+    start = time.perf_counter()
+    result = run_solver(solver, graph, params, Tracer(SUMMARY, sinks=[sink]))
+    wall_time = time.perf_counter() - start
+    iterations = next((fields["iteration"] for name, fields in reversed(sink.events) if name == "stop"), None)
+    run = {
+        "seed": seed, "cut": result.cut, "iterations": iterations, "time": wall_time, "pid": os.getpid(),
+        **result.stats.counters(),
+    }
+    return run, pack_solution(result.solution)
+
+
+def _worker_restart(solver, params, seed):
+    return _restart(solver, _worker_graph, params, seed)
+
+
+def _batch_restarts(graph, seeds, time_limit, max_iterations=100, **params):
+    """
+    Wszystkie restarty algorytmu wspinaczkowego naraz, jako jedna macierz rozwiązań (hill_climbing_batch).
+    Punkty startowe losujemy z tych samych ziaren co w _restart, więc wyniki są takie same jak restartów po kolei.
+    :return: lista par (statystyki uruchomienia, spakowane rozwiązanie) jak z _restart
+    """
+    from hill_climbing_deterministic import hill_climbing_batch
+
+    starts = []
+    for seed in seeds:
+        random.seed(seed)
+        starts.append(random_probe(graph.num_vertices))
+    start = time.perf_counter()
+    solutions, cuts, iterations, scans = hill_climbing_batch(
+        graph.num_vertices, graph, starts, max_iterations, time_limit
+    )
+    wall_time = (time.perf_counter() - start) / len(seeds)
+    results = []
+    for seed, solution, cut, moves, scanned in zip(seeds, solutions, cuts, iterations, scans):
+        stats = SolverStats()
+        stats.evaluations = 1
+        stats.neighbourhoods = scanned
+        stats.delta_evaluations = scanned * graph.num_vertices
+        stats.accepted, stats.rejected = moves, scanned - moves
+        run = {
+            "seed": seed, "cut": cut, "iterations": moves, "time": wall_time, "pid": os.getpid(),
+            **stats.counters(),
+        }
+        results.append((run, pack_solution(solution)))
+    return results
+
+
+def multi_start(solver, num_vertices, edges, restarts=8, workers=1, seed=None, time_limit=None, **params):
+    """
+    Wielokrotny start algorytmu z niezależnymi, ustalonymi ziarnami (seed, seed + 1, ...).
+    Dla workers > 1 restarty wykonuje pula procesów, a tablice grafu są raz kopiowane do pamięci
+    współdzielonej (share_graph) - procesy robocze dołączają do niej w inicjalizatorze, bez kopiowania
+    i ponownego wczytywania grafu.
+    :param solver: nazwa algorytmu z SOLVERS
+    :param num_vertices: liczba wierzchołków
+    :param edges: lista krawędzi albo Graph
+    :param restarts: liczba restartów
+    :param workers: liczba procesów (1 - restarty po kolei w bieżącym procesie, None - liczba rdzeni)
+    :param seed: ziarno pierwszego restartu (domyślnie losowe)
+    :param time_limit: limit czasu w sekundach dla wszystkich restartów - dzielony równo między restarty
+        wykonywane po kolei w jednym procesie
+    :param params: parametry algorytmu; algorytm wspinaczkowy z moves="matvec" wykonuje wszystkie restarty
+        naraz w bieżącym procesie (hill_climbing_batch), niezależnie od workers
+    :return: najlepsze rozwiązanie, najlepsze cięcie, statystyki restartów (lista słowników)
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Nieznany algorytm: {solver}")
+    graph = as_graph(num_vertices, edges)
+    if seed is None:
+        seed = random.getrandbits(32)
+    seeds = [seed + i for i in range(restarts)]
+    workers = workers or os.cpu_count() or 1
+    if solver == "hill_climbing_deterministic" and params.get("moves") == "matvec":
+        results = _batch_restarts(graph, seeds, time_limit, **params)
+    else:
+        if time_limit is not None:
+            rounds = -(-restarts // min(workers, restarts))
+            params = {**params, "time_limit": time_limit / rounds}
+
+        if workers == 1 or restarts == 1:
+            results = [_restart(solver, graph, params, s) for s in seeds]
+        else:
+            shm, descriptor = share_graph(graph)
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=min(workers, restarts), initializer=_init_worker, initargs=(descriptor,)
+                ) as pool:
+                    results = list(pool.map(_worker_restart, [solver] * restarts, [params] * restarts, seeds))
+            finally:
+                shm.close()
+                shm.unlink()
+
+    runs = [run for run, _ in results]
+    best = max(range(restarts), key=lambda i: runs[i]["cut"])
+    return unpack_solution(results[best][1], num_vertices), runs[best]["cut"], runs
+
+
+def add_multistart_arguments(parser):
+    """
+    Dodanie do argparse opcji wielokrotnego startu
+    """
+    parser.add_argument("--restarts", type=int, default=1, help="Liczba niezależnych restartów")
+    parser.add_argument("--workers", type=int, default=1, help="Liczba procesów wykonujących restarty")
+    parser.add_argument("--seed", type=int, default=None, help="Ziarno pierwszego restartu")
+
+
+def print_multistart(solution, cut, runs):
+    """
+    Wypisanie wyniku wielokrotnego startu i statystyk restartów
+    """
+    print(f"\n{'Ziarno':<12} {'Cięcie':<10} {'Iteracje':<10} {'Ewaluacje':<12} {'Czas [s]':<10}")
+    print("-" * 58)
+    for run in runs:
+        evaluations = run["evaluations"] + run["delta_evaluations"]
+        print(f"{run['seed']:<12} {run['cut']:<10} {str(run['iterations']):<10} {evaluations:<12} {run['time']:<10.3f}")
+
+    cuts = [run["cut"] for run in runs]
+    print("\nPodsumowanie restartów:")
+    print(f"Liczba restartów: {len(runs)}")
+    print(f"Cięcie: najlepsze {max(cuts)}, średnie {sum(cuts) / len(cuts):.2f}, najgorsze {min(cuts)}")
+    print(f"Najlepsze rozwiązanie: {solution}")
+    print(f"Wartość cięcia: {cut}")
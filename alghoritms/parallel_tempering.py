@@ -0,0 +1,428 @@
+import math
+import multiprocessing
+import random
+import time
+from graph_utils import (
+    as_graph,
+    CutState,
+    load_graph_from_file,
+    goal_function,
+    share_graph,
+    attach_shared_graph,
+    pack_solution,
+    unpack_solution,
+    np,
+)
+from tracing import SUMMARY, ITERATION, as_tracer, add_trace_arguments, tracer_from_args
+from instrumentation import (
+    TIME_LIMIT_REASON,
+    as_stats,
+    deadline_after,
+    add_instrumentation_arguments,
+    stats_from_args,
+    print_stats,
+)
+
+
+def temperature_ladder(replicas, t_min, t_max):
+    """
+    Geometryczna drabina temperatur od t_min do t_max - stały stosunek sąsiednich temperatur
+    daje zbliżone prawdopodobieństwa zamiany między wszystkimi parami
+    """
+    if replicas == 1:
+        return [t_min]
+    ratio = (t_max / t_min) ** (1 / (replicas - 1))
+    return [t_min * ratio ** k for k in range(replicas)]
+
+
+class _Replica:
+    """
+    Jedna replika: łańcuch Metropolisa na CutState (odwrócenie losowego wierzchołka w O(deg)) z własnym
+    generatorem liczb losowych, więc wynik nie zależy od tego, w którym procesie replika działa.
+    """
+
+    def __init__(self, graph, seed):
+        self.rng = random.Random(seed)
+        self.state = CutState(graph, [self.rng.getrandbits(1) for _ in range(graph.num_vertices)])
+        self.best_cut = self.state.cut
+        self.best_solution = self.state.solution[:]
+
+    def run(self, temperature, steps):
+        """
+        :return: liczba zaakceptowanych ruchów
+        """
+        state, rng = self.state, self.rng
+        gains = state.gains
+        num_vertices = len(gains)
+        accepted = 0
+        for _ in range(steps):
+            move = rng.randrange(num_vertices)
+            gain = gains[move]
+            if gain >= 0 or rng.random() < math.exp(gain / temperature):
+                state.flip(move)
+                accepted += 1
+                if state.cut > self.best_cut:
+                    self.best_cut = state.cut
+                    self.best_solution = state.solution[:]
+        return accepted
+
+
+class _PythonReplicas:
+    """
+    Repliki w bieżącym procesie, po kolei
+    """
+
+    def __init__(self, graph, seeds):
+        self.replicas = [_Replica(graph, seed) for seed in seeds]
+
+    def run(self, temperatures, steps):
+        """
+        :param temperatures: temperatura każdej repliki w tej rundzie
+        :return: lista (bieżące cięcie, najlepsze cięcie, zaakceptowane ruchy) dla każdej repliki
+        """
+        results = []
+        for replica, temperature in zip(self.replicas, temperatures):
+            accepted = replica.run(temperature, steps)
+            results.append((replica.state.cut, replica.best_cut, accepted))
+        return results
+
+    def best(self):
+        replica = max(self.replicas, key=lambda r: r.best_cut)
+        return replica.best_solution, replica.best_cut
+
+    def close(self):
+        pass
+
+
+def _replica_worker(connection, descriptor, seeds):
+    """
+    Proces roboczy trzymający swoje repliki między rundami - przesyłamy tylko temperatury i wyniki rundy
+    """
+    shm, graph = attach_shared_graph(descriptor)
+    replicas = _PythonReplicas(graph, seeds)
+    while True:
+        message = connection.recv()
+        if message[0] == "run":
+            connection.send(replicas.run(message[1], message[2]))
+        elif message[0] == "stop":
+            break
+        else:
+            solution, cut = replicas.best()
+            connection.send((pack_solution(solution), cut))
+            break
+    del graph, replicas
+    shm.close()
+
+
+class _ProcessReplicas:
+    """
+    Repliki rozdzielone na procesy robocze (kolejne bloki replik), graf w pamięci współdzielonej.
+    Ziarna replik są takie same jak w backendzie python, więc oba dają identyczne wyniki.
+    """
+
+    def __init__(self, graph, seeds, workers):
+        self.num_vertices = graph.num_vertices
+        self.shm, descriptor = share_graph(graph)
+        context = multiprocessing.get_context()
+        workers = max(1, min(workers, len(seeds)))
+        bounds = [len(seeds) * i // workers for i in range(workers + 1)]
+        self.blocks = list(zip(bounds, bounds[1:]))
+        self.connections = []
+        self.processes = []
+        for start, end in self.blocks:
+            parent, child = context.Pipe()
+            process = context.Process(target=_replica_worker, args=(child, descriptor, seeds[start:end]))
+            process.start()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def run(self, temperatures, steps):
+        for connection, (start, end) in zip(self.connections, self.blocks):
+            connection.send(("run", temperatures[start:end], steps))
+        results = []
+        for connection in self.connections:
+            results.extend(connection.recv())
+        return results
+
+    def best(self):
+        for connection in self.connections:
+            connection.send(("best",))
+        bests = [connection.recv() for connection in self.connections]
+        bits, cut = max(bests, key=lambda best: best[1])
+        return unpack_solution(bits, self.num_vertices), cut
+
+    def close(self):
+        # Po wyjątku w pętli głównej procesy wciąż czekają na polecenie - bez "stop" join czekałby bez końca
+        for connection in self.connections:
+            try:
+                connection.send(("stop",))
+            except OSError:
+                # Proces już zakończony (po best) - rura jest zamknięta
+                pass
+            connection.close()
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self.shm.close()
+        self.shm.unlink()
+
+
+class _NumpyReplicas:
+    """
+    Wszystkie repliki jako macierz R x n (rozwiązania) i macierz zysków R x n. W każdym kroku wszystkie
+    repliki próbują odwrócić ten sam losowy wierzchołek v (każdy łańcuch z osobna pozostaje poprawnym
+    łańcuchem Metropolisa), więc akceptacja i aktualizacja zysków sąsiadów v to operacje na kolumnach macierzy.
+    """
+
+    def __init__(self, graph, seeds):
+        if np is None:
+            raise ImportError("Backend numpy wymiana replik wymaga pakietu numpy")
+        self.graph = graph
+        self.rng = np.random.default_rng(seeds)
+        num_vertices = graph.num_vertices
+        self.solutions = self.rng.integers(0, 2, size=(len(seeds), num_vertices), dtype=np.int8)
+        states = [CutState(graph, row.tolist()) for row in self.solutions]
+        weight_dtype = np.int64 if memoryview(graph.weights).format == "q" else np.float64
+        self.gains = np.array([state.gains for state in states], dtype=weight_dtype).reshape(len(seeds), num_vertices)
+        self.cuts = np.array([state.cut for state in states], dtype=weight_dtype)
+        self.best_cuts = self.cuts.copy()
+        self.best_solutions = self.solutions.copy()
+        self.offsets = np.frombuffer(graph.offsets, dtype=np.int64)
+        self.adjacency = np.frombuffer(graph.adjacency, dtype=np.int64)
+        self.adjacency_weights = np.frombuffer(graph.adjacency_weights, dtype=weight_dtype)
+
+    def run(self, temperatures, steps):
+        rng, solutions, gains, cuts = self.rng, self.solutions, self.gains, self.cuts
+        temperatures = np.asarray(temperatures, dtype=np.float64)
+        accepted = np.zeros(len(cuts), dtype=np.int64)
+        moves = rng.integers(0, self.graph.num_vertices, size=steps)
+        draws = rng.random((steps, len(cuts)))
+        for move, draw in zip(moves, draws):
+            gain = gains[:, move]
+            rows = np.flatnonzero(draw < np.exp(np.minimum(gain / temperatures, 0.0)))
+            if len(rows) == 0:
+                continue
+            start, end = self.offsets[move], self.offsets[move + 1]
+            neighbours, weights = self.adjacency[start:end], self.adjacency_weights[start:end]
+            block = np.ix_(rows, neighbours)
+            same = solutions[block] == solutions[rows, move][:, None]
+            gains[block] += np.where(same, -2 * weights, 2 * weights)
+            cuts[rows] += gain[rows]
+            gains[rows, move] = -gains[rows, move]
+            solutions[rows, move] ^= 1
+            accepted[rows] += 1
+
+            improved = rows[cuts[rows] > self.best_cuts[rows]]
+            if len(improved):
+                self.best_cuts[improved] = cuts[improved]
+                self.best_solutions[improved] = solutions[improved]
+        return list(zip(cuts.tolist(), self.best_cuts.tolist(), accepted.tolist()))
+
+    def best(self):
+        row = int(np.argmax(self.best_cuts))
+        return self.best_solutions[row].tolist(), self.best_cuts[row].item()
+
+    def close(self):
+        pass
+
+
+def parallel_tempering(
+    num_vertices,
+    edges,
+    replicas=8,
+    t_min=0.5,
+    t_max=50.0,
+    max_iterations=10000,
+    swap_interval=100,
+    temperatures=None,
+    backend="python",
+    workers=None,
+    seed=None,
+    tracer=None,
+    stats=None,
+    time_limit=None,
+):
+    """
+    Wymiana replik (parallel tempering): replicas łańcuchów Metropolisa w stałych temperaturach z drabiny
+    temperature_ladder. Co swap_interval kroków próbujemy zamienić temperatury sąsiednich replik
+    (na przemian pary parzyste i nieparzyste) z prawdopodobieństwem min(1, exp((1/T_i - 1/T_j)(cut_j - cut_i))).
+    Zamieniamy temperatury, a nie rozwiązania, więc repliki nie muszą być przesyłane między procesami.
+    Backendy: "python" - repliki po kolei w bieżącym procesie, "numpy" - wszystkie repliki jako macierz,
+    "process" - repliki rozdzielone na workers procesów z grafem w pamięci współdzielonej.
+    :param num_vertices: liczba wierzchołków
+    :param edges: lista krawędzi albo Graph
+    :param replicas: liczba replik
+    :param t_min: najniższa temperatura drabiny
+    :param t_max: najwyższa temperatura drabiny
+    :param max_iterations: liczba kroków (prób odwrócenia wierzchołka) każdej repliki
+    :param swap_interval: co ile kroków próbujemy zamian temperatur
+    :param temperatures: własna drabina temperatur (zastępuje replicas, t_min, t_max)
+    :param backend: "python", "numpy" albo "process"
+    :param workers: liczba procesów backendu process (domyślnie liczba rdzeni)
+    :param seed: ziarno (replika r ma ziarno seed + r)
+    :param tracer: Tracer (domyślnie poziom summary na konsolę)
+    :param stats: SolverStats - liczniki ruchów wszystkich replik
+    :param time_limit: limit czasu w sekundach (sprawdzany po każdej rundzie) - po jego przekroczeniu
+        zwracamy najlepsze dotąd rozwiązanie
+    :return: najlepsze rozwiązanie, najlepsze cięcie, statystyki: temperatury, odsetek zaakceptowanych ruchów
+        w każdej temperaturze i odsetek udanych zamian między temperaturami k i k + 1
+    """
+    graph = as_graph(num_vertices, edges)
+    tracer = as_tracer(tracer)
+    stats = as_stats(stats)
+    stats.start()
+    deadline = deadline_after(time_limit)
+    reason = "Osiągnięto maksymalną liczbę iteracji"
+    temperatures = list(temperatures) if temperatures is not None else temperature_ladder(replicas, t_min, t_max)
+    replicas = len(temperatures)
+    if seed is None:
+        seed = random.getrandbits(32)
+    seeds = [seed + r for r in range(replicas)]
+    swap_rng = random.Random(seed - 1)
+
+    if backend == "numpy":
+        chains = _NumpyReplicas(graph, seeds)
+    elif backend == "process":
+        chains = _ProcessReplicas(graph, seeds, workers or multiprocessing.cpu_count())
+    elif backend == "python":
+        chains = _PythonReplicas(graph, seeds)
+    else:
+        raise ValueError(f"Nieznany backend: {backend}")
+
+    # replica_at[k] - replika w temperaturze k
+    replica_at = list(range(replicas))
+    accepted = [0] * replicas
+    attempted = [0] * replicas
+    swaps = [0] * max(0, replicas - 1)
+    swap_attempts = [0] * max(0, replicas - 1)
+    best_cut = None
+
+    tracer.table("iteration", [("Runda", "iteration", 10), ("Krok", "step", 10), ("Najlepsze cięcie", "cut", 18),
+                               ("Cięcie w T min", "coldest_cut", 18)])
+    events, rows = tracer.events, tracer.rows
+
+    try:
+        step = 0
+        round_index = 0
+        while step < max_iterations:
+            steps = min(swap_interval, max_iterations - step)
+            temperature_of = [0] * replicas
+            for k, r in enumerate(replica_at):
+                temperature_of[r] = temperatures[k]
+            results = chains.run(temperature_of, steps)
+            step += steps
+            round_index += 1
+
+            cuts = [cut for cut, _, _ in results]
+            for k, r in enumerate(replica_at):
+                accepted[k] += results[r][2]
+                attempted[k] += steps
+
+            round_best = max(best for _, best, _ in results)
+            if best_cut is None:
+                best_cut = round_best
+                tracer.emit(SUMMARY, "start", cut=best_cut)
+            elif round_best > best_cut:
+                best_cut = round_best
+                if events:
+                    tracer.emit(ITERATION, "improvement", iteration=step, cut=best_cut)
+
+            for k in range(round_index % 2, replicas - 1, 2):
+                i, j = replica_at[k], replica_at[k + 1]
+                swap_attempts[k] += 1
+                exponent = (1 / temperatures[k] - 1 / temperatures[k + 1]) * (cuts[j] - cuts[i])
+                if exponent >= 0 or swap_rng.random() < math.exp(exponent):
+                    replica_at[k], replica_at[k + 1] = j, i
+                    swaps[k] += 1
+
+            if rows and round_index % rows == 0:
+                tracer.emit(
+                    ITERATION, "iteration", iteration=round_index, step=step, cut=best_cut,
+                    coldest_cut=cuts[replica_at[0]],
+                )
+
+            if time.perf_counter() >= deadline:
+                reason = TIME_LIMIT_REASON
+                break
+
+        best_solution, best_cut = chains.best()
+    finally:
+        chains.close()
+
+    tracer.emit(SUMMARY, "stop", iteration=step, cut=best_cut, reason=reason)
+
+    stats.evaluations += replicas
+    stats.delta_evaluations += sum(attempted)
+    stats.accepted += sum(accepted)
+    stats.rejected += sum(attempted) - sum(accepted)
+    stats.stop()
+
+    ladder = {
+        "temperatures": temperatures,
+        "acceptance": [a / t if t else 0.0 for a, t in zip(accepted, attempted)],
+        "swap_rate": [s / t if t else 0.0 for s, t in zip(swaps, swap_attempts)],
+    }
+    return best_solution, best_cut, ladder
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Wymiana replik (parallel tempering)")
+    parser.add_argument(
+        "--input", type=str, required=True, help="Ścieżka do pliku z grafem"
+    )
+    parser.add_argument("--replicas", type=int, default=8, help="Liczba replik")
+    parser.add_argument("--t_min", type=float, default=0.5, help="Najniższa temperatura")
+    parser.add_argument("--t_max", type=float, default=50.0, help="Najwyższa temperatura")
+    parser.add_argument(
+        "--max_iterations", type=int, default=10000, help="Liczba kroków każdej repliki"
+    )
+    parser.add_argument(
+        "--swap_interval", type=int, default=100, help="Co ile kroków próbujemy zamian temperatur"
+    )
+    parser.add_argument(
+        "--backend",
+        type=str,
+        choices=["python", "numpy", "process"],
+        default="python",
+        help="Wykonanie replik: po kolei, jako macierz numpy albo w procesach",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Liczba procesów backendu process")
+    parser.add_argument("--seed", type=int, default=None, help="Ziarno")
+
+    add_trace_arguments(parser)
+    add_instrumentation_arguments(parser)
+
+    args = parser.parse_args()
+
+    num_vertices, edges = load_graph_from_file(args.input)
+
+    print(
+        "\n------------------------PARALLEL TEMPERING------------------------------------"
+    )
+    print(
+        f"Parametry: replicas={args.replicas}, t_min={args.t_min}, t_max={args.t_max}, "
+        f"max_iterations={args.max_iterations}, swap_interval={args.swap_interval}, backend={args.backend}\n"
+    )
+
+    tracer = tracer_from_args(args)
+    stats = stats_from_args(args)
+    best_solution, best_cut, ladder = parallel_tempering(
+        num_vertices, edges, args.replicas, args.t_min, args.t_max, args.max_iterations, args.swap_interval,
+        backend=args.backend, workers=args.workers, seed=args.seed, tracer=tracer, stats=stats,
+    )
+    tracer.close()
+
+    print(f"\n{'Temperatura':<15} {'Akceptacja':<15} {'Zamiana z następną':<20}")
+    print("-" * 50)
+    for k, temperature in enumerate(ladder["temperatures"]):
+        swap_rate = f"{ladder['swap_rate'][k]:.1%}" if k < len(ladder["swap_rate"]) else "-"
+        print(f"{temperature:<15.3f} {ladder['acceptance'][k]:<15.1%} {swap_rate:<20}")
+
+    print("\nPodsumowanie:")
+    print(f"Najlepsze rozwiązanie: {best_solution}, cięcie: {best_cut}")
+    print(f"Weryfikacja: {goal_function(edges, best_solution)}")
+    print_stats(stats, args)
@@ -1,11 +1,24 @@
 import random
 import math
+import time
+from collections import deque
 from graph_utils import (
+    as_graph,
+    CutState,
     load_graph_from_file,
     random_probe,
     goal_function,
-    generate_neighbours,
 )
+from tracing import SUMMARY, ITERATION, as_tracer, add_trace_arguments, tracer_from_args
+from instrumentation import (
+    TIME_LIMIT_REASON,
+    as_stats,
+    deadline_after,
+    add_instrumentation_arguments,
+    stats_from_args,
+    print_stats,
+)
+from checkpoint import add_checkpoint_arguments, checkpoint_from_args
 
 
 # Harmonogram chłodzenia (geometryczny)
@@ -13,74 +26,183 @@ def T(k, T0, alpha):
     return T0 * (alpha**k)
 
 
-def sim_annealing(num_vertices, edges, max_iterations, T, T0, alpha):
+class Trajectory:
+    """
+    Przebieg wyżarzania jako krotki (iteracja, cięcie, temperatura, akceptacja) - bez kopii rozwiązań,
+    więc pamięć nie rośnie z liczbą wierzchołków. Zapisujemy co every-tą iterację (oraz ostatnią),
+    a przy podanym capacity trzymamy tylko capacity ostatnich wpisów (bufor cykliczny).
+    """
+
+    def __init__(self, every=1, capacity=None):
+        """
+        :param every: co ile iteracji zapisujemy wpis
+        :param capacity: maksymalna liczba przechowywanych wpisów (None - bez ograniczenia)
+        """
+        self.every = max(1, every)
+        self.records = deque(maxlen=capacity)
+        self.iterations = 0
+
+    def record(self, iteration, cut, temperature, accepted):
+        self.records.append((iteration, cut, temperature, accepted))
+
+    def finish(self, iteration, cut, temperature, accepted):
+        """
+        Zapisanie ostatniej iteracji, jeśli nie trafiła do przebiegu przy próbkowaniu
+        """
+        self.iterations = iteration + 1
+        if not self.records or self.records[-1][0] != iteration:
+            self.record(iteration, cut, temperature, accepted)
+
+    @property
+    def cuts(self):
+        return [cut for _, cut, _, _ in self.records]
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+
+def sim_annealing(
+    num_vertices, edges, max_iterations, T, T0, alpha, tracer=None, trajectory=None, stats=None, time_limit=None,
+    checkpoint=None, resume=None,
+):
     """
        Algorytm symulowanego wyzarzania, z geometrycznym harmnogramem chłodzenia.
+       Sąsiad to odwrócenie losowego wierzchołka - jego cięcie odczytujemy z zysków CutState,
+       a bieżące cięcie przenosimy między iteracjami. Kopię rozwiązania robimy tylko przy nowym najlepszym.
        :param num_vertices: liczba wierzchołków
-       :param edges: lista krawędzi
+       :param edges: lista krawędzi albo Graph
        :param max_iterations: ilość iteracji, by algorytm nie utknął
        :param T: temperatura z harmonogramu chłodzenia
        :param T0: temparatura początkowa
        :param alpha: współczynnik alfa (0 < alpha < 1)
-       :return: maksymalne cięcie
+       :param tracer: Tracer (domyślnie poziom summary na konsolę)
+       :param trajectory: Trajectory, do której zapisujemy przebieg (domyślnie każda iteracja, bez ograniczenia)
+       :param stats: SolverStats - liczniki pracy
+       :param time_limit: limit czasu w sekundach (sprawdzany co 1024 iteracje) - po jego przekroczeniu
+           zwracamy najlepsze dotąd rozwiązanie
+       :param checkpoint: Checkpointer - co checkpoint.interval iteracji i na końcu zapisujemy indeks temperatury
+           (iterację harmonogramu), bieżące i najlepsze rozwiązanie
+       :param resume: stan z load_checkpoint - kontynuujemy od zapisanego indeksu temperatury; przebieg zawiera
+           wtedy tylko iteracje po wznowieniu
+       :return: najlepsze rozwiązanie, maksymalne cięcie, przebieg (Trajectory), punkt startowy
     """
-    s = random_probe(num_vertices)
-    initial_start_point = s[:]
-    V = [s]
-    best_s = s
-    best_value = goal_function(edges, s)
+    edges = as_graph(num_vertices, edges)
+    tracer = as_tracer(tracer)
+    stats = as_stats(stats)
+    stats.start()
+    deadline = deadline_after(time_limit)
+    if trajectory is None:
+        trajectory = Trajectory()
+    if resume is not None:
+        random.setstate(resume["random"])
+        first = resume["iteration"]
+        initial_start_point = resume["start_point"]
+        state = CutState(edges, resume["solution"])
+        best_s, best_value = resume["best_solution"], resume["best_cut"]
+        accepted_moves = resume["accepted_moves"]
+    else:
+        first = 1
+        s = random_probe(num_vertices)
+        initial_start_point = s[:]
+        state = CutState(edges, s)
+        best_s = state.solution[:]
+        best_value = state.cut
+        accepted_moves = 0
+    s = state.solution
+    current_value = state.cut
+    every, record = trajectory.every, trajectory.record
+    record(first - 1, current_value, T(first - 1, T0, alpha), True)
 
-    print(
-        f"{'Iteracja':<10} {'Temperatura':<15} {'Bieżące rozwiązanie':<30} {'Cięcie':<10} {'Sąsiad':<30} {'Cięcie sąsiada':<15} {'Akcja':<20}"
-    )
-    print("-" * 110)
+    tracer.emit(SUMMARY, "start", cut=state.cut, solution=s[:] if tracer.debug else None)
 
-    for k in range(1, max_iterations):
-        temp = T(k, T0, alpha)
+    columns = [("Iteracja", "iteration", 10), ("Temperatura", "temperature", 15, ".2f"), ("Cięcie", "cut", 10),
+               ("Ruch", "move", 30), ("Cięcie sąsiada", "neighbour_cut", 15), ("Akcja", "action", 20)]
+    if tracer.debug:
+        columns.insert(2, ("Bieżące rozwiązanie", "solution", 30))
+    tracer.table("iteration", columns)
+    events, rows, debug = tracer.events, tracer.rows, tracer.debug
+
+    checkpoint_every = checkpoint.interval if checkpoint is not None else 0
 
-        neighbours = generate_neighbours(num_vertices, s)
-        t = random.choice(neighbours)
+    def save(k):
+        checkpoint.save(
+            "sim_annealing", k, solution=s, best_solution=best_s, best_cut=best_value,
+            start_point=initial_start_point, accepted_moves=accepted_moves,
+        )
 
-        current_value = goal_function(edges, s)
-        new_value = goal_function(edges, t)
+    temp, accepted = T(first - 1, T0, alpha), True
+    reason = "Osiągnięto maksymalną liczbę iteracji"
+    last = max(first - 1, max_iterations - 1)
+    for k in range(first, max_iterations):
+        temp = T(k, T0, alpha)
 
-        action = ""
+        move = random.randrange(num_vertices)
 
-        if new_value >= current_value:
-            action = "Przechodzimy (lepszy/równy)"
-            s = t
+        delta = state.gains[move]
+        new_value = current_value + delta
+        if delta >= 0:
+            prob = 1.0
+            accepted = True
+        elif temp <= 0:
+            # Temperatura spadła do zera (niedomiar T0 * alpha^k przy długim przebiegu) - tylko ruchy nie gorsze
+            prob = 0.0
+            accepted = False
         else:
-            delta = new_value - current_value
             prob = math.exp(delta / temp)
-            action = f"Gorszy (delta={delta}, prob={prob:.4f})"
-            if random.random() < prob:
-                action += " -> Akceptujemy"
-                s = t
-            else:
-                action += " -> Odrzucamy"
+            accepted = random.random() < prob
+        if accepted:
+            state.flip(move)
+            current_value = new_value
+            accepted_moves += 1
 
-        current_value = goal_function(edges, s)
         if current_value > best_value:
             best_value = current_value
             best_s = s[:]
+            if events:
+                tracer.emit(ITERATION, "improvement", iteration=k, cut=best_value, temperature=temp)
 
-        print(
-            f"{k:<10} {temp:<15.2f} {str(s):<30} {current_value:<10} {str(t):<30} {new_value:<15} {action:<20}"
-        )
+        if rows and k % rows == 0:
+            if delta >= 0:
+                action = "Przechodzimy (lepszy/równy)"
+            else:
+                action = f"Gorszy (delta={delta}, prob={prob:.4f})"
+                action += " -> Akceptujemy" if accepted else " -> Odrzucamy"
+            tracer.emit(
+                ITERATION, "iteration", iteration=k, temperature=temp, cut=current_value, move=move,
+                neighbour_cut=new_value, action=action, solution=s[:] if debug else None,
+            )
 
-        V.append(s)
+        if k % every == 0:
+            record(k, current_value, temp, accepted)
 
-    return (
-        best_s,
-        best_value,
-        V,
-        [goal_function(edges, e) for e in V],
-        initial_start_point,
-    )
+        if checkpoint_every and k % checkpoint_every == 0:
+            save(k + 1)
+
+        if k % 1024 == 0 and time.perf_counter() >= deadline:
+            reason, last = TIME_LIMIT_REASON, k
+            break
+
+    trajectory.finish(last, current_value, temp, accepted)
+    if checkpoint is not None:
+        save(last + 1)
+        checkpoint.close()
+
+    tracer.emit(SUMMARY, "stop", iteration=last, cut=best_value, reason=reason)
+
+    stats.evaluations += 1
+    stats.delta_evaluations += last
+    stats.accepted += accepted_moves
+    stats.rejected += last - accepted_moves
+    stats.stop()
+    return best_s, best_value, trajectory, initial_start_point
 
 
 if __name__ == "__main__":
     import argparse
+    from multistart import multi_start, add_multistart_arguments, print_multistart
 
     parser = argparse.ArgumentParser(description="Simulated Annealing")
     parser.add_argument(
@@ -97,6 +219,21 @@ if __name__ == "__main__":
         help="Współczynnik chłodzenia (alpha, 0 < alpha < 1)",
     )
 
+    parser.add_argument(
+        "--trajectory_every", type=int, default=1, help="Co ile iteracji zapisujemy przebieg wyżarzania"
+    )
+    parser.add_argument(
+        "--trajectory_capacity",
+        type=int,
+        default=None,
+        help="Maksymalna liczba zapamiętanych wpisów przebiegu (ostatnie wpisy)",
+    )
+
+    add_trace_arguments(parser)
+    add_instrumentation_arguments(parser)
+    add_checkpoint_arguments(parser)
+    add_multistart_arguments(parser)
+
     args = parser.parse_args()
 
     num_vertices, edges = load_graph_from_file(args.input)
@@ -108,14 +245,32 @@ if __name__ == "__main__":
         f"Początkowa temperatura (T0): {args.T0}, współczynnik chłodzenia (alpha): {args.alpha}\n"
     )
 
-    best_solution, best_cut, points, cuts, start_point = sim_annealing(
-        num_vertices, edges, args.max_iterations, T, args.T0, args.alpha
-    )
+    if args.restarts > 1:
+        solution, cut, runs = multi_start(
+            "sim_annealing", num_vertices, edges, args.restarts, args.workers, args.seed,
+            max_iterations=args.max_iterations, T0=args.T0, alpha=args.alpha,
+        )
+        print_multistart(solution, cut, runs)
+    else:
+        if args.seed is not None:
+            random.seed(args.seed)
+        tracer = tracer_from_args(args)
+        stats = stats_from_args(args)
+        trajectory = Trajectory(args.trajectory_every, args.trajectory_capacity)
+        checkpoint, resume = checkpoint_from_args(args, "sim_annealing")
+        best_solution, best_cut, trajectory, start_point = sim_annealing(
+            num_vertices, edges, args.max_iterations, T, args.T0, args.alpha, tracer, trajectory, stats,
+            checkpoint=checkpoint, resume=resume,
+        )
+        tracer.close()
 
-    start_cut = goal_function(edges, start_point)
-    print("\nPodsumowanie:")
-    print(f"Punkt startowy: {start_point}, cięcie: {start_cut}")
-    print(f"Najlepsze rozwiązanie: {best_solution}, cięcie: {best_cut}")
-    print(f"Weryfikacja: {goal_function(edges, best_solution)}")
-    print(f"Ostatnie rozwiązanie: {points[-1]}, cięcie: {cuts[-1]}")
-    print(f"Liczba odwiedzonych rozwiązań: {len(points)}")
+        start_cut = goal_function(edges, start_point)
+        print("\nPodsumowanie:")
+        print(f"Punkt startowy: {start_point}, cięcie: {start_cut}")
+        print(f"Najlepsze rozwiązanie: {best_solution}, cięcie: {best_cut}")
+        print(f"Weryfikacja: {goal_function(edges, best_solution)}")
+        accepted = sum(1 for _, _, _, was_accepted in trajectory if was_accepted)
+        print(f"Ostatnie cięcie: {trajectory.cuts[-1]}")
+        print(f"Liczba odwiedzonych rozwiązań: {trajectory.iterations}")
+        print(f"Zapamiętane wpisy przebiegu: {len(trajectory)}, w tym zaakceptowane ruchy: {accepted}")
+        print_stats(stats, args)
@@ -0,0 +1,330 @@
+"""
+Rejestr algorytmów Maximum Cut ze wspólnym interfejsem i jedno wejście z linii poleceń.
+
+Każdy algorytm w rejestrze przyjmuje graf, Tracer, SolverStats, limit czasu i własne parametry,
+a zwraca SolverResult (rozwiązanie, cięcie, liczba iteracji, statystyki) - niezależnie od tego,
+w jakiej kolejności zwraca wyniki jego własna funkcja.
+
+Użycie:
+    python solvers.py sim_annealing --input ../graphs/graph100.txt --time_limit 5 --T0 10 --alpha 0.999
+    python solvers.py tabu_search --input ../graphs/graph100.txt --time_limit 2 --restarts 4 --workers 2
+"""
+import random
+import sys
+from graph_utils import as_graph, goal_function, load_graph_from_file
+from tracing import add_trace_arguments, tracer_from_args
+from instrumentation import SolverResult, as_stats, add_instrumentation_arguments, stats_from_args, print_stats
+from checkpoint import add_checkpoint_arguments, checkpoint_from_args
+from hill_climbing_deterministic import hill_climbing_deterministic
+from hill_climb_random import hill_climbing_random
+from simulated_annealing import sim_annealing, T, Trajectory
+from parallel_tempering import parallel_tempering
+from tabu_search import tabu_search
+from genetic import genetic_algorithm
+from island_genetic import island_genetic_algorithm
+from full_search import full_search
+from branch_and_bound import branch_and_bound
+
+
+class Solver:
+    """
+    Algorytm w rejestrze
+    """
+
+    def __init__(self, name, description, run, parameters=(), budget=(), checkpoints=False):
+        """
+        :param name: nazwa algorytmu
+        :param description: opis do pomocy linii poleceń
+        :param run: funkcja (graph, tracer, stats, time_limit, **parametry) -> SolverResult
+        :param parameters: krotki (nazwa, typ, wartość domyślna, opis[, dozwolone wartości])
+        :param budget: parametry ograniczające liczbę iteracji - przy limicie czasu, jeśli nie zostały podane,
+            nie ograniczają działania (algorytm kończy się po upływie czasu)
+        :param checkpoints: czy run przyjmuje parametry checkpoint (Checkpointer) i resume (stan do wznowienia)
+        """
+        self.name = name
+        self.description = description
+        self.run = run
+        self.parameters = parameters
+        self.budget = budget
+        self.checkpoints = checkpoints
+
+
+SOLVERS = {}
+
+_MOVES = ("moves", str, "auto", "Wybór ruchu: kolejka zysków albo przegląd wszystkich wierzchołków",
+          ["auto", "buckets", "heap", "scan", "matvec"])
+
+
+def register(name, description, parameters=(), budget=(), checkpoints=False):
+    """
+    Dekorator dodający funkcję uruchamiającą algorytm do rejestru SOLVERS
+    """
+    def decorator(run):
+        SOLVERS[name] = Solver(name, description, run, parameters, budget, checkpoints)
+        return run
+    return decorator
+
+
+@register(
+    "hill_climbing_deterministic",
+    "Algorytm wspinaczkowy z wyborem najlepszego sąsiada",
+    [("max_iterations", int, 100, "Maksymalna liczba iteracji"), _MOVES],
+    budget=("max_iterations",),
+)
+def _hill_climbing_deterministic(graph, tracer, stats, time_limit, max_iterations=100, moves="auto"):
+    solution, cut, iterations = hill_climbing_deterministic(
+        graph.num_vertices, graph, max_iterations, tracer, stats, time_limit, moves
+    )
+    return SolverResult(solution, cut, iterations, stats)
+
+
+@register(
+    "hill_climbing_random",
+    "Algorytm wspinaczkowy z losowym wyborem sąsiada",
+    [("max_iterations", int, 100, "Maksymalna liczba iteracji")],
+    budget=("max_iterations",),
+)
+def _hill_climbing_random(graph, tracer, stats, time_limit, max_iterations=100):
+    solution, cut, iterations = hill_climbing_random(graph.num_vertices, graph, max_iterations, tracer, stats, time_limit)
+    return SolverResult(solution, cut, iterations, stats)
+
+
+@register(
+    "sim_annealing",
+    "Symulowane wyżarzanie z geometrycznym harmonogramem chłodzenia",
+    [
+        ("max_iterations", int, 100, "Maksymalna liczba iteracji"),
+        ("T0", float, 10.0, "Początkowa temperatura"),
+        ("alpha", float, 0.999, "Współczynnik chłodzenia (0 < alpha < 1)"),
+        ("trajectory_every", int, 1, "Co ile iteracji zapisujemy przebieg wyżarzania"),
+        ("trajectory_capacity", int, 10000, "Maksymalna liczba zapamiętanych wpisów przebiegu"),
+    ],
+    budget=("max_iterations",),
+    checkpoints=True,
+)
+def _sim_annealing(
+    graph, tracer, stats, time_limit, max_iterations=100, T0=10.0, alpha=0.999, trajectory_every=1,
+    trajectory_capacity=10000, checkpoint=None, resume=None,
+):
+    solution, cut, trajectory, _ = sim_annealing(
+        graph.num_vertices, graph, max_iterations, T, T0, alpha, tracer,
+        Trajectory(trajectory_every, trajectory_capacity), stats, time_limit, checkpoint, resume,
+    )
+    return SolverResult(solution, cut, trajectory.iterations, stats, {"trajectory": trajectory})
+
+
+@register(
+    "parallel_tempering",
+    "Wymiana replik (parallel tempering)",
+    [
+        ("max_iterations", int, 10000, "Liczba kroków każdej repliki"),
+        ("replicas", int, 8, "Liczba replik"),
+        ("t_min", float, 0.5, "Najniższa temperatura"),
+        ("t_max", float, 50.0, "Najwyższa temperatura"),
+        ("swap_interval", int, 100, "Co ile kroków próbujemy zamian temperatur"),
+        ("backend", str, "python", "Wykonanie replik", ["python", "numpy", "process"]),
+    ],
+    budget=("max_iterations",),
+)
+def _parallel_tempering(graph, tracer, stats, time_limit, replicas=8, **params):
+    steps = stats.delta_evaluations
+    solution, cut, ladder = parallel_tempering(
+        graph.num_vertices, graph, replicas, tracer=tracer, stats=stats, time_limit=time_limit,
+        seed=random.getrandbits(32), **params
+    )
+    return SolverResult(solution, cut, (stats.delta_evaluations - steps) // len(ladder["temperatures"]), stats, ladder)
+
+
+@register(
+    "tabu_search",
+    "Przeszukiwanie tabu z pamięcią ruchów i aspiracją",
+    [
+        ("max_iterations", int, 100, "Maksymalna liczba iteracji"),
+        ("tabu_size", int, 10, "Kadencja tabu (liczba iteracji zakazu ruchu)"),
+        ("history_size", int, 10, "Liczba pamiętanych punktów roboczych"),
+        ("tenure_random", int, 0, "Górna granica losowego wydłużenia kadencji tabu"),
+        _MOVES,
+    ],
+    budget=("max_iterations",),
+    checkpoints=True,
+)
+def _tabu_search(graph, tracer, stats, time_limit, **params):
+    moves = stats.accepted
+    cut, solution = tabu_search(
+        graph.num_vertices, graph, tracer=tracer, stats=stats, time_limit=time_limit, **params
+    )
+    # Każda iteracja tabu to dokładnie jeden wykonany ruch
+    return SolverResult(solution, cut, stats.accepted - moves, stats)
+
+
+_GENETIC_PARAMETERS = [
+    ("crossover_type", str, "uniform", "Metoda krzyżowania", ["onepoint", "uniform"]),
+    ("mutation_type", str, "multiplepoint", "Metoda mutacji", ["onepoint", "multiplepoint"]),
+    ("stop_condition", str, "max_generations", "Warunek zakończenia działania", ["max_generations", "max_no_improvement"]),
+    ("max_generations", int, 100, "Maksymalna ilość generacji"),
+    ("max_no_improvement", int, 20, "Maksymalna ilość generacji bez poprawy"),
+    ("population_size", int, 50, "Rozmiar populacji"),
+    ("engine", str, "python", "Silnik generacji", ["python", "numpy"]),
+]
+
+
+@register(
+    "genetic",
+    "Algorytm genetyczny z selekcją turniejową i elitaryzmem",
+    _GENETIC_PARAMETERS + [("representation", str, "list", "Reprezentacja osobnika", ["list", "bits"])],
+    budget=("max_generations",),
+    checkpoints=True,
+)
+def _genetic(graph, tracer, stats, time_limit, crossover_type="uniform", mutation_type="multiplepoint",
+             stop_condition="max_generations", **params):
+    cut, solution, generation, _, _, _ = genetic_algorithm(
+        graph.num_vertices, graph, crossover_type, mutation_type, stop_condition, tracer=tracer, stats=stats,
+        time_limit=time_limit, **params
+    )
+    return SolverResult(solution, cut, generation + 1, stats)
+
+
+@register(
+    "island_genetic",
+    "Wyspowy algorytm genetyczny z migracją",
+    _GENETIC_PARAMETERS + [
+        ("islands", int, 4, "Liczba wysp"),
+        ("migration_interval", int, 10, "Co ile generacji migrują osobniki"),
+        ("migration_size", int, 2, "Liczba migrujących osobników"),
+        ("topology", str, "ring", "Topologia migracji", ["ring", "random"]),
+    ],
+    budget=("max_generations",),
+)
+def _island_genetic(graph, tracer, stats, time_limit, crossover_type="uniform", mutation_type="multiplepoint",
+                    population_size=50, islands=4, **params):
+    # Pierwsza wyspa używa podanych operatorów, pozostałe - domyślnego zestawu z island_settings
+    island_params = [
+        {"crossover_type": crossover_type, "mutation_type": mutation_type, "population_size": population_size}
+    ] + [{"population_size": population_size}] * (islands - 1)
+    stats.start()
+    cut, solution, island_stats = island_genetic_algorithm(
+        graph.num_vertices, graph, islands, island_params, time_limit=time_limit, seed=random.getrandbits(32),
+        **params
+    )
+    stats.stop()
+    generations = max(island["generations"] for island in island_stats)
+    return SolverResult(solution, cut, generations, stats, {"islands": island_stats})
+
+
+@register(
+    "full_search",
+    "Pełny przegląd (kod Graya albo wszystkie rozwiązania)",
+    [
+        ("mode", str, "gray", "Tryb przeglądu", ["gray", "bitslice", "brute"]),
+        ("search_workers", int, 1, "Liczba procesów przeglądu równoległego (tryb gray)"),
+    ],
+)
+def _full_search(graph, tracer, stats, time_limit, mode="gray", search_workers=1):
+    solution, cut = full_search(graph.num_vertices, graph, mode, search_workers, tracer, stats, time_limit)
+    return SolverResult(solution, cut, None, stats)
+
+
+@register("branch_and_bound", "Dokładny algorytm podziału i ograniczeń")
+def _branch_and_bound(graph, tracer, stats, time_limit):
+    nodes = {}
+    stats.start()
+    solution, cut = branch_and_bound(graph.num_vertices, graph, stats=nodes, time_limit=time_limit)
+    stats.stop()
+    stats.delta_evaluations += nodes["nodes"]
+    return SolverResult(solution, cut, nodes["nodes"], stats, nodes)
+
+
+def solve(name, num_vertices, edges, time_limit=None, seed=None, tracer=None, stats=None, **params):
+    """
+    Uruchomienie algorytmu z rejestru
+    :param name: nazwa algorytmu z SOLVERS
+    :param num_vertices: liczba wierzchołków
+    :param edges: lista krawędzi albo Graph
+    :param time_limit: limit czasu w sekundach - algorytm zwraca najlepsze rozwiązanie znalezione do tej chwili;
+        parametry ograniczające liczbę iteracji, których nie podano, przestają wtedy ograniczać działanie
+    :param seed: ziarno generatora liczb losowych
+    :param tracer: Tracer (domyślnie poziom summary na konsolę)
+    :param stats: SolverStats
+    :param params: parametry algorytmu
+    :return: SolverResult
+    """
+    if name not in SOLVERS:
+        raise ValueError(f"Nieznany algorytm: {name}")
+    solver = SOLVERS[name]
+    if time_limit is not None:
+        params = {**{key: sys.maxsize for key in solver.budget}, **params}
+    if seed is not None:
+        random.seed(seed)
+    return solver.run(as_graph(num_vertices, edges), tracer, as_stats(stats), time_limit, **params)
+
+
+def build_parser():
+    """
+    :return: argparse z podpoleceniem dla każdego algorytmu z rejestru
+    """
+    import argparse
+    from multistart import SOLVERS as MULTISTART_SOLVERS, add_multistart_arguments
+
+    parser = argparse.ArgumentParser(description="Algorytmy Maximum Cut")
+    subparsers = parser.add_subparsers(dest="solver", required=True, metavar="algorytm")
+    for solver in SOLVERS.values():
+        subparser = subparsers.add_parser(solver.name, help=solver.description, description=solver.description)
+        subparser.add_argument("--input", type=str, required=True, help="Ścieżka do pliku z grafem")
+        subparser.add_argument(
+            "--time_limit",
+            type=float,
+            default=None,
+            help="Limit czasu w sekundach - po jego upływie algorytm zwraca najlepsze dotąd rozwiązanie",
+        )
+        for name, kind, default, description, *choices in solver.parameters:
+            budget = " (bez ograniczenia przy --time_limit, jeśli nie podano)" if name in solver.budget else ""
+            subparser.add_argument(
+                f"--{name}", type=kind, default=None, choices=choices[0] if choices else None,
+                help=f"{description}, domyślnie {default}{budget}",
+            )
+        if solver.name in MULTISTART_SOLVERS:
+            add_multistart_arguments(subparser)
+        else:
+            subparser.add_argument("--seed", type=int, default=None, help="Ziarno")
+        add_trace_arguments(subparser)
+        add_instrumentation_arguments(subparser)
+        if solver.checkpoints:
+            add_checkpoint_arguments(subparser)
+    return parser
+
+
+if __name__ == "__main__":
+    from multistart import multi_start, print_multistart
+
+    args = build_parser().parse_args()
+    solver = SOLVERS[args.solver]
+    params = {name: getattr(args, name) for name, *_ in solver.parameters if getattr(args, name) is not None}
+
+    num_vertices, edges = load_graph_from_file(args.input)
+
+    print(f"\n------------------------{solver.description.upper()}------------------------------------")
+    shown = {name: params.get(name, default) for name, _, default, *_ in solver.parameters}
+    print(f"Parametry: {', '.join(f'{name}={value}' for name, value in shown.items())}, time_limit={args.time_limit}\n")
+
+    if getattr(args, "restarts", 1) > 1:
+        if args.time_limit is not None:
+            params = {**{key: sys.maxsize for key in solver.budget}, **params}
+        solution, cut, runs = multi_start(
+            solver.name, num_vertices, edges, args.restarts, args.workers, args.seed, args.time_limit, **params
+        )
+        print_multistart(solution, cut, runs)
+    else:
+        tracer = tracer_from_args(args)
+        stats = stats_from_args(args)
+        if solver.checkpoints:
+            params["checkpoint"], params["resume"] = checkpoint_from_args(args, solver.name)
+        result = solve(solver.name, num_vertices, edges, args.time_limit, args.seed, tracer, stats, **params)
+        tracer.close()
+
+        print("\nPodsumowanie:")
+        print(f"Najlepsze rozwiązanie: {result.solution}")
+        print(f"Wartość cięcia: {result.cut}")
+        print(f"Weryfikacja: {goal_function(edges, result.solution)}")
+        if result.iterations is not None:
+            print(f"Liczba iteracji: {result.iterations}")
+        print_stats(result.stats, args)
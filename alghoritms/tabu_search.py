@@ -1,97 +1,254 @@
-from graph_utils import random_probe, goal_function, load_graph_from_file, generate_neighbours,back_to_work_point
+import random
+import time
+from collections import deque
+from graph_utils import (
+    as_graph,
+    CutState,
+    MatVecCutState,
+    NeighbourhoodEvaluator,
+    random_probe,
+    load_graph_from_file,
+    back_to_work_point,
+    work_point,
+)
+from gain_buckets import QueueCutState
+from checkpoint import add_checkpoint_arguments, checkpoint_from_args
+from tracing import SUMMARY, ITERATION, DEBUG, as_tracer, add_trace_arguments, tracer_from_args
+from instrumentation import (
+    TIME_LIMIT_REASON,
+    as_stats,
+    deadline_after,
+    add_instrumentation_arguments,
+    stats_from_args,
+    print_stats,
+)
 
 
-def tabu_search(num_vertices, edges, max_iterations=10000, tabu_size=10, history_size=10):
+def tabu_search(
+    num_vertices,
+    edges,
+    max_iterations=10000,
+    tabu_size=10,
+    history_size=10,
+    tenure_random=0,
+    tracer=None,
+    stats=None,
+    time_limit=None,
+    checkpoint=None,
+    resume=None,
+    moves="auto",
+    history_interval=None,
+):
     """
-    Klasyczny algorytm tabu z losowym startem
+    Algorytm tabu z losowym startem i pamięcią tabu opartą o ruchy.
+    Ruch to odwrócenie wierzchołka v - po jego wykonaniu v jest zakazany przez kadencję (tenure) równą
+    tabu_size (+ losowo 0..tenure_random) iteracji, co trzymamy w tablicy tabu_until, więc sprawdzenie tabu to O(1).
+    W każdej iteracji wybieramy najlepszy niezakazany ruch według zysku z CutState (również pogarszający),
+    a ruch zakazany dopuszczamy tylko wtedy, gdy daje cięcie lepsze od najlepszego znalezionego (aspiracja).
+    Gdy żaden ruch nie jest dopuszczalny, czyścimy pamięć tabu i wracamy do punktu roboczego z historii.
+    Historia to deque ograniczona do history_size punktów roboczych (work_point) zapisywanych co history_interval
+    iteracji - kopia punktu to O(n), więc przy rzadkim zapisie koszt ruchu pozostaje O(deg) z kolejką zysków.
+    Punkt pamięta wektor zysków, więc powrót nie liczy funkcji celu sąsiadów ani zysków od zera, a stan
+    (z kolejką zysków) odtwarzamy w miejscu (restore). Z tego samego powodu najlepsze rozwiązanie kopiujemy
+    dopiero wtedy, gdy algorytm opuszcza najlepszy punkt ruchem bez poprawy (albo powrotem do punktu roboczego).
+    Z kolejką zysków (QueueCutState) zakazane wierzchołki są usuwane z kolejki na czas kadencji - najlepszy
+    niezakazany ruch odczytujemy z kolejki, a przeglądamy tylko zakazane wierzchołki (aspiracja).
     :param num_vertices: liczba wierzchołków
-    :param edges: lista krawędzi
+    :param edges: lista krawędzi albo Graph
     :param max_iterations: ilość iteracji, by algorytm nie utknął
-    :param tabu_size: rozmiar listy tabu
+    :param tabu_size: kadencja - przez ile iteracji odwrócony wierzchołek pozostaje zakazany
+    :param history_size: ile punktów roboczych pamiętamy
+    :param tenure_random: górna granica losowego wydłużenia kadencji
+    :param tracer: Tracer (domyślnie poziom summary na konsolę)
+    :param stats: SolverStats - liczniki pracy (odrzucone ruchy to ruchy zakazane) i czas fazy "neighbourhood"
+    :param time_limit: limit czasu w sekundach - po jego przekroczeniu zwracamy najlepsze dotąd rozwiązanie
+    :param checkpoint: Checkpointer - co checkpoint.interval iteracji i na końcu zapisujemy bieżące i najlepsze
+        rozwiązanie, tablicę kadencji tabu_until i historię punktów roboczych
+    :param resume: stan z load_checkpoint - kontynuujemy od zapisanej iteracji
+    :param moves: wybór ruchu - "scan" (przegląd wszystkich zysków), "matvec" (przegląd zysków liczonych
+        mnożeniem macierz-wektor) albo kolejka zysków: "buckets", "heap", "auto" (jak w hill_climbing_deterministic)
+    :param history_interval: co ile iteracji zapisujemy punkt roboczy (domyślnie max(1, n // 100) - dla małych
+        grafów co iterację)
     :return: najlepsze cięcie
     """
-    i = 0
-    tabu_list = []
-    history = []
+    edges = as_graph(num_vertices, edges)
+    tracer = as_tracer(tracer)
+    stats = as_stats(stats)
+    stats.start()
+    deadline = deadline_after(time_limit)
+    if history_interval is None:
+        history_interval = max(1, num_vertices // 100)
+    queue = moves not in ("scan", "matvec")
+    if queue:
+        new_state = lambda solution: QueueCutState(edges, solution, moves)
+    elif moves == "matvec":
+        evaluator = NeighbourhoodEvaluator(edges)
+        new_state = lambda solution: MatVecCutState(edges, solution, evaluator)
+    else:
+        new_state = lambda solution: CutState(edges, solution)
 
-    solution = random_probe(num_vertices)
-    cut = goal_function(edges, solution)
+    if resume is not None:
+        random.setstate(resume["random"])
+        i = resume["iteration"]
+        tabu_until = resume["tabu_until"]
+        history = resume["history"]
+        state = new_state(resume["solution"])
+        best_solution, best_cut = resume["best_solution"], resume["best_cut"]
+        at_best = False
+        scans, reads, rejected = resume["scans"], resume["reads"], resume["rejected"]
+    else:
+        i = 0
+        tabu_until = [0] * num_vertices
+        history = deque(maxlen=history_size)
+        state = new_state(random_probe(num_vertices))
+        history.append(work_point(state))
+        best_solution = None
+        best_cut = state.cut
+        at_best = True
+        scans = 0
+        reads = 0
+        rejected = 0
 
-    history.append({"solution": solution[:], "cut": cut})
+    # Wierzchołki zakazane (usunięte z kolejki zysków)
+    forbidden = [v for v in range(num_vertices) if tabu_until[v] > i] if queue else []
+    for v in forbidden:
+        state.moves.remove(v)
 
-    print(f"Punkt startowy: {solution}, cięcie: {cut}")
+    tracer.emit(SUMMARY, "start", cut=state.cut, solution=state.solution if tracer.debug else None)
 
-    best_solution = solution[:]
-    best_cut = cut
+    columns = [("Iteracja", "iteration", 10), ("Cięcie", "cut", 10), ("Cięcie sąsiada", "neighbour_cut", 15),
+               ("Ruch", "move", 10), ("Zakazane wierzchołki", "tabu", 20), ("Akcja", "action", 20)]
+    if tracer.debug:
+        columns.insert(1, ("Bieżące rozwiązanie", "solution", 30))
+    tracer.table("iteration", columns)
+    events, rows, debug = tracer.events, tracer.rows, tracer.debug
+    checkpoint_every = checkpoint.interval if checkpoint is not None else 0
 
-    print(
-        f"\n{'Iteracja':<10} {'Bieżące rozwiązanie':<30} {'Cięcie':<10} {'Najlepszy sąsiad':<30} {'Cięcie sąsiada':<15} {'Ruch':<10} {'Lista tabu':<20} {'Akcja':<20}"
-    )
-    print("-" * 120)
+    def save():
+        checkpoint.save(
+            "tabu_search", i, solution=state.solution, best_solution=state.solution if at_best else best_solution,
+            best_cut=best_cut,
+            tabu_until=tabu_until, history=history, scans=scans, reads=reads, rejected=rejected,
+        )
 
     while i < max_iterations:
-        best_neighbour = None
-        best_neighbour_cut = -1
         best_move = None
+        best_neighbour_cut = None
 
-        neighbours = generate_neighbours(num_vertices, solution)
+        with stats.phase("neighbourhood"):
+            if queue:
+                # Koniec kadencji - wierzchołek wraca do kolejki z bieżącym zyskiem
+                if forbidden:
+                    still_forbidden = []
+                    for v in forbidden:
+                        if tabu_until[v] > i:
+                            still_forbidden.append(v)
+                        else:
+                            state.moves.insert(v, state.gains[v])
+                    forbidden = still_forbidden
+                best_move = state.best_move()
+                if best_move is not None:
+                    best_neighbour_cut = state.cut + state.gains[best_move]
+                candidates = forbidden
+                reads += 1 + len(forbidden)
+            else:
+                candidates = range(num_vertices)
+                reads += num_vertices
 
-        for neighbour in neighbours:
-            neigh_cut = goal_function(edges, neighbour)
+            gains = state.gains
+            for move in candidates:
+                neigh_cut = state.cut + gains[move]
 
-            if neighbour not in tabu_list and neigh_cut > best_cut:
-                if neigh_cut > best_neighbour_cut:
-                    best_neighbour = neighbour
-                    best_neighbour_cut = neigh_cut
-                    best_move = neighbour
+                if tabu_until[move] > i and neigh_cut <= best_cut:
+                    rejected += 1
+                    if debug:
+                        tracer.emit(DEBUG, "rejected", iteration=i + 1, move=move, cut=neigh_cut)
+                    continue
 
-            else:
-                print(f"NEIGHBOR ODRZUCONY (tabu & niepoprawia): {neighbour}, cut={neigh_cut}")
+                if best_move is None or neigh_cut > best_neighbour_cut:
+                    best_move = move
+                    best_neighbour_cut = neigh_cut
+        scans += 1
 
-        if best_neighbour is None:
-            print(f"Brak dostępnych sąsiadów w iteracji {i}")
-            get_from_history = back_to_work_point(history, edges, tabu_list)
+        if best_move is None:
+            tabu_until = [0] * num_vertices
+            forbidden = []
+            get_from_history = back_to_work_point(history, stats)
+            if debug:
+                if get_from_history:
+                    tracer.emit(
+                        DEBUG, "work_point", cut=get_from_history["cut"],
+                        neighbour_cut=get_from_history["cut"] + get_from_history["gain"],
+                    )
+                else:
+                    tracer.emit(DEBUG, "no_work_point")
             if get_from_history:
-                solution = get_from_history["solution"]
-                cut = get_from_history["cut"]
-                print(
-                    f"{i + 1:<10} {str(solution):<30} {cut:<10} {'-':<30} {'-':<15} {'-':<10} {str(tabu_list):<20} Cofnięce do punktu roboczego: {solution} / {cut}"
-                )
+                if at_best:
+                    best_solution, at_best = state.solution[:], False
+                state.restore(get_from_history["solution"], get_from_history["cut"], get_from_history["gains"])
+                if events:
+                    tracer.emit(ITERATION, "recovery", iteration=i + 1, cut=state.cut)
                 continue
-            else:
-                print(
-                    f"{i + 1:<10} {str(solution):<30} {cut:<10} {'-':<30} {'-':<15} {'-':<10} {str(tabu_list):<20} Brak dostępnych ruchów"
-                )
+            tracer.emit(SUMMARY, "stop", iteration=i, cut=best_cut, reason="Brak dostępnych ruchów")
             break
 
-        history.append({"solution": solution[:], "cut": cut})
-        if len(history) > history_size:
-            history.pop(0)
+        if i % history_interval == 0:
+            history.append(work_point(state))
 
-        solution = best_neighbour
-        cut = best_neighbour_cut
+        aspiration = tabu_until[best_move] > i
 
-        tabu_list.append(best_neighbour)
-        if len(tabu_list) > tabu_size:
-            tabu_list.pop(0)
+        # Opuszczamy najlepszy punkt bez poprawy - dopiero teraz kopiujemy najlepsze rozwiązanie
+        if at_best and best_neighbour_cut <= best_cut:
+            best_solution, at_best = state.solution[:], False
+        state.flip(best_move)
+        tabu_until[best_move] = i + 1 + tabu_size + (random.randint(0, tenure_random) if tenure_random else 0)
+        if queue and not aspiration:
+            state.moves.remove(best_move)
+            forbidden.append(best_move)
 
-        action = ""
-        if cut > best_cut:
-            best_cut = cut
-            best_solution = solution[:]
-            action = "Nowy najlepszy wynik"
+        improved = state.cut > best_cut
+        if improved:
+            best_cut = state.cut
+            at_best = True
+            if events:
+                tracer.emit(ITERATION, "improvement", iteration=i + 1, cut=best_cut)
 
-        print(
-            f"{i + 1:<10} {str(solution):<30} {cut:<10} {str(best_neighbour):<30} {best_neighbour_cut:<15} {str(best_move):<10} {str(tabu_list):<20} {action:<20}"
-        )
+        if rows and (i + 1) % rows == 0:
+            action = "Aspiracja, " if aspiration else ""
+            if improved:
+                action += "Nowy najlepszy wynik"
+            tracer.emit(
+                ITERATION, "iteration", iteration=i + 1, cut=state.cut, neighbour_cut=best_neighbour_cut,
+                move=best_move, tabu=[v for v in range(num_vertices) if tabu_until[v] > i + 1], action=action,
+                solution=state.solution if debug else None,
+            )
 
         i += 1
+        if checkpoint_every and i % checkpoint_every == 0:
+            save()
+        if time.perf_counter() >= deadline:
+            tracer.emit(SUMMARY, "stop", iteration=i, cut=best_cut, reason=TIME_LIMIT_REASON)
+            break
+    else:
+        tracer.emit(SUMMARY, "stop", iteration=i, cut=best_cut, reason="Osiągnięto maksymalną liczbę iteracji")
 
+    if checkpoint is not None:
+        save()
+        checkpoint.close()
+    if at_best:
+        best_solution = state.solution[:]
+    stats.evaluations += 1
+    stats.neighbourhoods += scans
+    stats.delta_evaluations += reads
+    stats.accepted += i
+    stats.rejected += rejected
+    stats.stop()
     return best_cut, best_solution
 
 
 if __name__ == "__main__":
     import argparse
+    from multistart import multi_start, add_multistart_arguments, print_multistart
 
     parser = argparse.ArgumentParser(description="Tabu Search for Maximum Cut problem")
     parser.add_argument(
@@ -100,7 +257,22 @@ if __name__ == "__main__":
     parser.add_argument(
         "--max_iterations", type=int, default=100, help="Maksymalna liczba iteracji"
     )
-    parser.add_argument("--tabu_size", type=int, default=10, help="Rozmiar tabu")
+    parser.add_argument("--tabu_size", type=int, default=10, help="Kadencja tabu (liczba iteracji zakazu ruchu)")
+    parser.add_argument(
+        "--tenure_random", type=int, default=0, help="Górna granica losowego wydłużenia kadencji tabu"
+    )
+    parser.add_argument(
+        "--moves",
+        type=str,
+        choices=["auto", "buckets", "heap", "scan", "matvec"],
+        default="auto",
+        help="Wybór ruchu: kolejka zysków (kubełki/kopiec) albo przegląd wszystkich wierzchołków",
+    )
+
+    add_trace_arguments(parser)
+    add_instrumentation_arguments(parser)
+    add_checkpoint_arguments(parser)
+    add_multistart_arguments(parser)
 
     args = parser.parse_args()
 
@@ -108,14 +280,29 @@ if __name__ == "__main__":
 
     print("\n------------------------TABU SEARCH------------------------------------")
     print(
-        f"Parametry: max_iterations={args.max_iterations}, tabu_size={args.tabu_size}\n"
+        f"Parametry: max_iterations={args.max_iterations}, tabu_size={args.tabu_size}, tenure_random={args.tenure_random}\n"
     )
 
-    max_cut, best_solution = tabu_search(
-        num_vertices, edges, args.max_iterations, args.tabu_size
-    )
-
-    print("\nPodsumowanie:")
-    print(f"Wartość cięcia: {max_cut}")
-    print(f"Najlepsze rozwiązanie: {best_solution}")
+    if args.restarts > 1:
+        solution, cut, runs = multi_start(
+            "tabu_search", num_vertices, edges, args.restarts, args.workers, args.seed,
+            max_iterations=args.max_iterations, tabu_size=args.tabu_size,
+            tenure_random=args.tenure_random, moves=args.moves,
+        )
+        print_multistart(solution, cut, runs)
+    else:
+        if args.seed is not None:
+            random.seed(args.seed)
+        tracer = tracer_from_args(args)
+        stats = stats_from_args(args)
+        checkpoint, resume = checkpoint_from_args(args, "tabu_search")
+        max_cut, best_solution = tabu_search(
+            num_vertices, edges, args.max_iterations, args.tabu_size, tenure_random=args.tenure_random, tracer=tracer,
+            stats=stats, checkpoint=checkpoint, resume=resume, moves=args.moves,
+        )
+        tracer.close()
 
+        print("\nPodsumowanie:")
+        print(f"Wartość cięcia: {max_cut}")
+        print(f"Najlepsze rozwiązanie: {best_solution}")
+        print_stats(stats, args)
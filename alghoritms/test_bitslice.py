@@ -0,0 +1,81 @@
+import pytest
+import random
+import alghoritms.bitslice as bitslice
+from alghoritms.bitslice import BitSlicedEvaluator
+from alghoritms.genetic import genetic_algorithm
+from alghoritms.graph_utils import Graph, goal_function, pack_solution, random_probe
+
+
+def random_graph(num_vertices, weight, seed):
+    rng = random.Random(seed)
+    edges = [
+        (u, v, weight(rng))
+        for u in range(num_vertices)
+        for v in range(u + 1, num_vertices)
+        if rng.random() < 0.4
+    ]
+    return Graph.from_edges(num_vertices, edges)
+
+
+WEIGHTS = [
+    lambda rng: 1,
+    lambda rng: rng.choice([-1, 1]),
+    lambda rng: rng.randint(-40, 90),
+    lambda rng: rng.random(),
+]
+
+
+class TestBitSlicedEvaluator:
+    @pytest.mark.parametrize("weight", WEIGHTS)
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_matches_goal_function(self, weight, use_numpy, monkeypatch):
+        """
+        Test steps:
+        1. Wygeneruj graf z wagami jednostkowymi, +/-1, całkowitymi i rzeczywistymi
+        2. Oceń 150 losowych rozwiązań (listy i bitsety) w układzie bit-sliced, z numpy i bez
+        3. Sprawdź czy cięcia zgadzają się z funkcją celu
+        :return:
+        """
+        if not use_numpy:
+            monkeypatch.setattr(bitslice, "np", None)
+        graph = random_graph(20, weight, 1)
+        random.seed(2)
+        solutions = [random_probe(20) for _ in range(150)]
+        expected = [goal_function(graph, solution) for solution in solutions]
+        evaluator = BitSlicedEvaluator(graph)
+        assert evaluator.evaluate(solutions) == pytest.approx(expected)
+        assert evaluator.evaluate([pack_solution(solution) for solution in solutions]) == pytest.approx(expected)
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_enumeration(self, use_numpy, monkeypatch):
+        """
+        Test steps:
+        1. Zbuduj słowa kolejnych porcji podziałów (z wierzchołkiem 0 w zbiorze 0)
+        2. Sprawdź czy cięcie każdego pasa to cięcie podziału o tym numerze
+        :return:
+        """
+        if not use_numpy:
+            monkeypatch.setattr(bitslice, "np", None)
+        graph = random_graph(9, WEIGHTS[2], 3)
+        evaluator = BitSlicedEvaluator(graph)
+        for first, count in [(0, 4), (0, 64), (128, 128)]:
+            cuts = evaluator.evaluate_words(evaluator.enumeration_words(first, count), count)
+            for lane, cut in enumerate(cuts):
+                solution = [0] + [((first + lane) >> k) & 1 for k in range(8)]
+                assert cut == goal_function(graph, solution)
+
+
+def test_genetic_bitslice():
+    """
+    Test steps:
+    1. Uruchom algorytm genetyczny z oceną numpy i bit-sliced z tym samym ziarnem
+    2. Sprawdź czy przebieg (najlepsze cięcie i rozwiązanie) jest taki sam
+    :return:
+    """
+    graph = random_graph(30, WEIGHTS[2], 4)
+    results = []
+    for vectorized in (None, "bitslice"):
+        random.seed(5)
+        results.append(genetic_algorithm(30, graph, "uniform", "multiplepoint", "max_generations", 20,
+                                         vectorized=vectorized)[:2])
+    assert results[0] == results[1]
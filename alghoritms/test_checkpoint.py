@@ -0,0 +1,83 @@
+import random
+import pytest
+from alghoritms.graph_utils import Graph
+from alghoritms.graph_generator import erdos_renyi
+from alghoritms.checkpoint import Checkpointer, load_checkpoint
+from alghoritms.genetic import genetic_algorithm
+from alghoritms.simulated_annealing import sim_annealing, T
+from alghoritms.tabu_search import tabu_search
+from alghoritms.tracing import NULL_TRACER
+
+NUM_VERTICES = 40
+
+GRAPH = Graph.from_edges(NUM_VERTICES, erdos_renyi(NUM_VERTICES, 0.15, seed=11))
+
+
+def run_tabu(iterations, **kwargs):
+    cut, solution = tabu_search(NUM_VERTICES, GRAPH, iterations, tabu_size=5, tenure_random=3, tracer=NULL_TRACER,
+                                **kwargs)
+    return solution, cut
+
+
+def run_annealing(iterations, **kwargs):
+    solution, cut, _, _ = sim_annealing(NUM_VERTICES, GRAPH, iterations, T, 10, 0.995, NULL_TRACER, **kwargs)
+    return solution, cut
+
+
+def run_genetic(iterations, engine="python", **kwargs):
+    cut, solution, _, population, _, _ = genetic_algorithm(
+        NUM_VERTICES, GRAPH, "uniform", "multiplepoint", "max_generations", max_generations=iterations // 10,
+        population_size=20, engine=engine, tracer=NULL_TRACER, **kwargs
+    )
+    return solution, cut, population
+
+
+def run_genetic_numpy(iterations, **kwargs):
+    pytest.importorskip("numpy")
+    return run_genetic(iterations, engine="numpy", **kwargs)
+
+
+class TestCheckpoint:
+    @pytest.mark.parametrize(
+        "solver, run",
+        [
+            ("tabu_search", run_tabu),
+            ("sim_annealing", run_annealing),
+            ("genetic", run_genetic),
+            ("genetic", run_genetic_numpy),
+        ]
+    )
+    @pytest.mark.parametrize("background", [True, False])
+    def test_resume(self, tmp_path, solver, run, background):
+        """
+        Test steps:
+        1. Uruchom algorytm bez przerwy na pełnej liczbie iteracji
+        2. Uruchom go z tym samym ziarnem na części iteracji z zapisem punktów kontrolnych
+        3. Wznów obliczenia z zapisanego pliku do pełnej liczby iteracji
+        4. Sprawdź czy wznowiony przebieg daje dokładnie ten sam wynik co nieprzerwany
+        :return:
+        """
+        path = tmp_path / "checkpoint.bin"
+        random.seed(5)
+        expected = run(400)
+
+        random.seed(5)
+        run(130, checkpoint=Checkpointer(path, interval=5, background=background))
+        state = load_checkpoint(path, solver)
+        assert state["iteration"] == (130 if solver != "genetic" else 13)
+
+        random.seed(99)
+        assert run(400, resume=state) == expected
+
+    def test_solver_mismatch(self, tmp_path):
+        """
+        Test steps:
+        1. Zapisz punkt kontrolny algorytmu tabu
+        2. Sprawdź czy wczytanie go dla innego algorytmu kończy się błędem
+        :return:
+        """
+        path = tmp_path / "checkpoint.bin"
+        random.seed(1)
+        run_tabu(20, checkpoint=Checkpointer(path, interval=10))
+        with pytest.raises(ValueError):
+            load_checkpoint(path, "sim_annealing")
@@ -0,0 +1,119 @@
+import pytest
+import random
+from alghoritms.branch_and_bound import branch_and_bound
+from alghoritms.full_search import full_search, full_search_parallel
+from alghoritms.graph_utils import goal_function
+
+
+def random_edges(num_vertices, density, seed):
+    rng = random.Random(seed)
+    return [
+        (u, v, rng.randint(-3, 9))
+        for u in range(num_vertices)
+        for v in range(u + 1, num_vertices)
+        if rng.random() < density
+    ]
+
+
+class TestFullSearch:
+    @pytest.mark.parametrize(
+        "num_vertices, density, seed",
+        [
+            (1, 0.0, 0),
+            (6, 0.5, 1),
+            (9, 0.4, 2),
+            (10, 0.8, 3),
+        ]
+    )
+    def test_gray_matches_brute(self, num_vertices, density, seed, capsys):
+        """
+        Test steps:
+        1. Wygeneruj losowy graf (również z ujemnymi wagami)
+        2. Uruchom pełny przegląd w trybie gray i brute
+        3. Sprawdź czy maksymalne cięcie jest takie samo, a rozwiązanie gray ma wierzchołek 0 w zbiorze 0
+        :return:
+        """
+        edges = random_edges(num_vertices, density, seed)
+        gray_solution, gray_cut = full_search(num_vertices, edges, mode="gray")
+        _, brute_cut = full_search(num_vertices, edges, mode="brute")
+        assert gray_cut == brute_cut
+        assert goal_function(edges, gray_solution) == gray_cut
+        assert gray_solution[0] == 0
+
+    @pytest.mark.parametrize(
+        "num_vertices, density, seed",
+        [
+            (0, 0.0, 0),
+            (1, 0.0, 0),
+            (6, 0.5, 1),
+            (12, 0.6, 9),
+        ]
+    )
+    def test_bitslice_matches_gray(self, num_vertices, density, seed):
+        """
+        Test steps:
+        1. Wygeneruj losowy graf (również z ujemnymi wagami)
+        2. Uruchom pełny przegląd w trybie bitslice (graf pusty, mniej i więcej niż 64 podziały)
+        3. Sprawdź czy maksymalne cięcie jest takie samo jak w trybie gray, a rozwiązanie ma n wierzchołków
+        :return:
+        """
+        edges = random_edges(num_vertices, density, seed)
+        solution, cut = full_search(num_vertices, edges, mode="bitslice")
+        assert cut == full_search(num_vertices, edges)[1]
+        assert len(solution) == num_vertices
+        assert goal_function(edges, solution) == cut
+        assert solution[:1] in ([], [0])
+
+    @pytest.mark.parametrize("prefix_bits", [0, 2, 20])
+    def test_parallel_matches_gray(self, prefix_bits):
+        """
+        Test steps:
+        1. Wygeneruj losowy graf
+        2. Uruchom przegląd równoległy z różną liczbą ustalonych wierzchołków
+        3. Sprawdź czy wynik jest taki sam jak w przeglądzie jednoprocesowym
+        :return:
+        """
+        edges = random_edges(11, 0.5, 8)
+        solution, cut = full_search_parallel(11, edges, workers=2, prefix_bits=prefix_bits)
+        assert cut == full_search(11, edges)[1]
+        assert goal_function(edges, solution) == cut
+
+
+class TestBranchAndBound:
+    @pytest.mark.parametrize(
+        "num_vertices, density, seed",
+        [
+            (1, 0.0, 0),
+            (7, 0.5, 4),
+            (11, 0.3, 5),
+            (12, 0.9, 6),
+        ]
+    )
+    def test_matches_full_search(self, num_vertices, density, seed):
+        """
+        Test steps:
+        1. Wygeneruj losowy graf (również z ujemnymi wagami)
+        2. Uruchom podział i ograniczenia oraz pełny przegląd
+        3. Sprawdź czy maksymalne cięcie jest takie samo i czy liczniki węzłów są wypełnione
+        :return:
+        """
+        edges = random_edges(num_vertices, density, seed)
+        stats = {}
+        solution, cut = branch_and_bound(num_vertices, edges, stats=stats)
+        assert cut == full_search(num_vertices, edges)[1]
+        assert goal_function(edges, solution) == cut
+        assert stats["nodes"] >= stats["pruned"] >= 0
+
+    def test_warm_start(self):
+        """
+        Test steps:
+        1. Uruchom podział i ograniczenia z optymalnym rozwiązaniem startowym
+        2. Sprawdź czy zwrócone jest cięcie optymalne, a drzewo zostało odcięte już w korzeniu
+        :return:
+        """
+        edges = random_edges(10, 0.5, 7)
+        optimal_solution, optimal_cut = full_search(10, edges)
+        stats = {}
+        solution, cut = branch_and_bound(10, edges, initial_solution=optimal_solution, stats=stats)
+        assert cut == optimal_cut
+        assert stats["nodes"] < 2 ** 9
@@ -0,0 +1,103 @@
+import random
+import pytest
+from alghoritms.graph_utils import Graph, CutState, goal_function, random_probe
+from alghoritms.graph_generator import erdos_renyi
+from alghoritms.gain_buckets import GainBuckets, GainHeap, QueueCutState
+from alghoritms.hill_climbing_deterministic import hill_climbing_deterministic
+from alghoritms.tabu_search import tabu_search
+from alghoritms.tracing import NULL_TRACER
+
+NUM_VERTICES = 40
+
+GRAPH = Graph.from_edges(NUM_VERTICES, erdos_renyi(NUM_VERTICES, 0.15, seed=12))
+
+FLOAT_GRAPH = Graph.from_edges(NUM_VERTICES, [(u, v, w / 3) for u, v, w in erdos_renyi(NUM_VERTICES, 0.15, seed=12)])
+
+
+class TestGainBuckets:
+    @pytest.mark.parametrize(
+        "graph, kind, expected",
+        [
+            (GRAPH, "auto", GainBuckets),
+            (GRAPH, "heap", GainHeap),
+            (FLOAT_GRAPH, "auto", GainHeap),
+        ]
+    )
+    def test_best_move(self, graph, kind, expected):
+        """
+        Test steps:
+        1. Zbuduj QueueCutState i wykonaj serię losowych odwróceń, część wierzchołków usuwając z kolejki
+        2. Sprawdź czy rodzaj kolejki zależy od wag, a wybrany ruch ma zawsze największy zysk wśród
+           wierzchołków w kolejce, zgodny z CutState liczonym od zera
+        :return:
+        """
+        random.seed(4)
+        state = QueueCutState(graph, random_probe(NUM_VERTICES), kind)
+        assert isinstance(state.moves, expected)
+        removed = set()
+        for _ in range(300):
+            v = random.randrange(NUM_VERTICES)
+            state.flip(v)
+            if random.random() < 0.2:
+                if v in removed:
+                    removed.discard(v)
+                    state.moves.insert(v, state.gains[v])
+                else:
+                    removed.add(v)
+                    state.moves.remove(v)
+            move = state.best_move()
+            allowed = [u for u in range(NUM_VERTICES) if u not in removed]
+            assert move not in removed
+            assert state.gains[move] == max(state.gains[u] for u in allowed)
+        assert state.gains == pytest.approx(CutState(graph, state.solution).gains)
+
+    @pytest.mark.parametrize("kind", ["buckets", "heap"])
+    def test_restore(self, kind):
+        """
+        Test steps:
+        1. Zapamiętaj punkt, odwracaj wierzchołki i usuń część z nich z kolejki
+        2. Wróć do punktu przez restore (z odbudową istniejącej kolejki) i wykonaj kolejne odwrócenia
+        3. Sprawdź czy wszystkie wierzchołki wróciły do kolejki, a stan zgadza się z CutState liczonym od zera
+        :return:
+        """
+        random.seed(6)
+        state = QueueCutState(GRAPH, random_probe(NUM_VERTICES), kind)
+        point = (state.solution[:], state.cut, state.gains[:])
+        for v in random.sample(range(NUM_VERTICES), 10):
+            state.flip(v)
+            state.moves.remove(v)
+        state.restore(*point)
+        for v in random.sample(range(NUM_VERTICES), 5):
+            state.flip(v)
+        expected = CutState(GRAPH, state.solution)
+        assert (state.cut, state.gains) == (expected.cut, expected.gains)
+        assert state.gains[state.best_move()] == max(expected.gains)
+
+    @pytest.mark.parametrize("moves", ["buckets", "heap", "scan"])
+    def test_local_optimum(self, moves):
+        """
+        Test steps:
+        1. Uruchom algorytm wspinaczkowy do optimum lokalnego z każdym sposobem wyboru ruchu
+        2. Sprawdź czy żaden pojedynczy ruch nie poprawia wyniku, a cięcie zgadza się z funkcją celu
+        :return:
+        """
+        random.seed(6)
+        solution, cut, _ = hill_climbing_deterministic(NUM_VERTICES, GRAPH, 10 ** 6, NULL_TRACER, moves=moves)
+        assert max(CutState(GRAPH, solution).gains) <= 0
+        assert goal_function(GRAPH, solution) == cut
+
+    @pytest.mark.parametrize("moves", ["buckets", "heap"])
+    def test_tabu_matches_scan(self, moves):
+        """
+        Test steps:
+        1. Uruchom tabu z kolejką zysków i z przeglądem wszystkich wierzchołków
+        2. Sprawdź czy obie wersje dochodzą do tego samego najlepszego cięcia
+        :return:
+        """
+        results = []
+        for mode in (moves, "scan"):
+            random.seed(7)
+            cut, solution = tabu_search(NUM_VERTICES, GRAPH, 500, tabu_size=7, tracer=NULL_TRACER, moves=mode)
+            assert goal_function(GRAPH, solution) == cut
+            results.append(cut)
+        assert results[0] == results[1]
@@ -1,8 +1,10 @@
 import pytest
 import random
 from alghoritms.genetic import crossover_onepoint_random, crossover_uniform, mutate_onepoint, mutate_multiplepoint, \
-    selection_tournament
-from alghoritms.graph_utils import goal_function
+    selection_tournament, crossover_onepoint_bits, crossover_uniform_bits, mutate_onepoint_bits, \
+    mutate_multiplepoint_bits, FitnessCache, genetic_algorithm, selection_tournament_batch, crossover_onepoint_batch, \
+    crossover_uniform_batch, mutate_onepoint_batch, mutate_multiplepoint_batch
+from alghoritms.graph_utils import goal_function, pack_solution, unpack_solution, np
 
 EDGES = [
     (0, 1, 2),
@@ -150,3 +152,215 @@ class TestGenetic:
         best = max(selected, key=lambda x: goal_function(edges, x))
         assert winner in selected
         assert winner == best
+
+
+class TestGeneticBits:
+    @pytest.mark.parametrize(
+        "parent1, parent2",
+        [
+            ([0, 0, 0, 0, 0], [1, 1, 1, 1, 1]),
+            ([1, 0, 1, 0, 1, 1, 0], [0, 1, 0, 1, 0, 0, 1]),
+        ]
+    )
+    def test_crossover_onepoint_bits(self, parent1, parent2):
+        """
+        Test steps:
+        1. Krzyżowanie jednopunktowe na bitsetach i na listach z tym samym ziarnem
+        2. Sprawdź czy dzieci są identyczne
+        :return:
+        """
+        n = len(parent1)
+        random.seed(3)
+        child1, child2 = crossover_onepoint_bits(pack_solution(parent1), pack_solution(parent2), n)
+        random.seed(3)
+        expected1, expected2 = crossover_onepoint_random(parent1, parent2)
+        assert unpack_solution(child1, n) == expected1
+        assert unpack_solution(child2, n) == expected2
+
+    @pytest.mark.parametrize("crossover_rate", [0.5, 0.3, 0.0, 1.0])
+    def test_crossover_uniform_bits(self, crossover_rate):
+        """
+        Test steps:
+        1. Krzyżowanie uniform na bitsetach
+        2. Sprawdź czy każdy gen dzieci pochodzi od rodziców i dzieci się uzupełniają
+        3. Dla skrajnych prawdopodobieństw sprawdź czy dzieci to kopie rodziców
+        :return:
+        """
+        random.seed(4)
+        n = 64
+        parent1, parent2 = random.getrandbits(n), random.getrandbits(n)
+        child1, child2 = crossover_uniform_bits(parent1, parent2, n, crossover_rate)
+        assert child1 ^ child2 == parent1 ^ parent2
+        assert (child1 & ~(parent1 | parent2)) == 0
+        if crossover_rate == 1.0:
+            assert (child1, child2) == (parent1, parent2)
+        if crossover_rate == 0.0:
+            assert (child1, child2) == (parent2, parent1)
+
+    def test_mutations_bits(self):
+        """
+        Test steps:
+        1. Mutacja jednopunktowa i wielopunktowa na bitsetach
+        2. Sprawdź czy mutacja jednopunktowa zmienia dokładnie jeden bit, a wielopunktowa nie wychodzi poza n bitów
+        :return:
+        """
+        random.seed(5)
+        n = 100
+        solution = random.getrandbits(n)
+        assert bin(mutate_onepoint_bits(solution, n) ^ solution).count("1") == 1
+        assert mutate_multiplepoint_bits(solution, n, 1.0) == solution ^ ((1 << n) - 1)
+        assert mutate_multiplepoint_bits(solution, n, 0.2) >> n == 0
+
+
+class TestGeneticBatch:
+    def test_selection_tournament_batch(self):
+        """
+        Test steps:
+        1. Wsadowa selekcja turniejowa z k równym rozmiarowi populacji i z k = 1
+        2. Sprawdź czy przy dużym k zwycięzcą jest zwykle najlepszy osobnik, a indeksy mieszczą się w populacji
+        :return:
+        """
+        rng = np.random.default_rng(1)
+        fitness = np.array([3, 9, 1, 4])
+        winners = selection_tournament_batch(fitness, 200, rng, k=20)
+        assert np.mean(winners == 1) > 0.95
+        winners = selection_tournament_batch(fitness, 200, rng, k=1)
+        assert set(winners.tolist()) == {0, 1, 2, 3}
+
+    @pytest.mark.parametrize("crossover", ["onepoint", "uniform"])
+    def test_crossover_batch(self, crossover):
+        """
+        Test steps:
+        1. Wsadowe krzyżowanie macierzy rodziców
+        2. Sprawdź czy każdy gen dzieci pochodzi od rodziców, a dzieci się uzupełniają
+        3. Dla krzyżowania jednopunktowego sprawdź czy każde dziecko to prefiks jednego rodzica i sufiks drugiego
+        :return:
+        """
+        rng = np.random.default_rng(2)
+        parents1 = np.zeros((20, 9), dtype=np.uint8)
+        parents2 = np.ones((20, 9), dtype=np.uint8)
+        if crossover == "onepoint":
+            children1, children2 = crossover_onepoint_batch(parents1, parents2, rng)
+            for row in children1.tolist():
+                cross_point = row.index(1)
+                assert 1 <= cross_point <= 8 and row == [0] * cross_point + [1] * (9 - cross_point)
+        else:
+            children1, children2 = crossover_uniform_batch(parents1, parents2, rng)
+        assert np.all(children1 ^ children2 == 1)
+
+    def test_mutation_batch(self):
+        """
+        Test steps:
+        1. Mutacja jednopunktowa i wielopunktowa całej macierzy dzieci z prawdopodobieństwem 1
+        2. Sprawdź czy jednopunktowa zmienia dokładnie jeden gen w wierszu, a wielopunktowa z p = 1 wszystkie
+        :return:
+        """
+        rng = np.random.default_rng(3)
+        children = np.zeros((15, 12), dtype=np.uint8)
+        assert np.all(mutate_onepoint_batch(children.copy(), rng, 1.0).sum(axis=1) == 1)
+        assert np.all(mutate_multiplepoint_batch(children.copy(), rng, 1.0, 1.0) == 1)
+        assert np.all(mutate_multiplepoint_batch(children.copy(), rng, 0.0, 1.0) == 0)
+
+
+class TestFitnessCache:
+    def test_hits_and_evaluations(self):
+        """
+        Test steps:
+        1. Oceń kilka razy te same osobniki przez FitnessCache
+        2. Sprawdź czy funkcja celu była liczona tylko raz na genotyp i czy statystyki się zgadzają
+        :return:
+        """
+        cache = FitnessCache(maxsize=10)
+        calls = []
+        evaluate = lambda x: calls.append(x) or goal_function(EDGES, x)
+        for solution in ([0, 1, 0, 1, 0], [1, 1, 0, 0, 0], [0, 1, 0, 1, 0], [0, 1, 0, 1, 0]):
+            value = cache.lookup(pack_solution(solution), solution, evaluate)
+            assert value == goal_function(EDGES, solution)
+        assert len(calls) == cache.evaluations == 2
+        assert cache.hits == 2
+        assert cache.hit_rate == 0.5
+
+    def test_lookup_batch(self):
+        """
+        Test steps:
+        1. Oceń partię osobników z powtórzeniami i genotypem już obecnym w cache
+        2. Sprawdź czy funkcja celu partii dostała każdy brakujący genotyp tylko raz
+        :return:
+        """
+        cache = FitnessCache()
+        cache.lookup(pack_solution([1, 1, 0, 0, 0]), [1, 1, 0, 0, 0], lambda x: goal_function(EDGES, x))
+        batches = []
+
+        def evaluate_batch(xs):
+            batches.append(xs)
+            return [goal_function(EDGES, x) for x in xs]
+
+        individuals = [[0, 1, 0, 1, 0], [1, 1, 0, 0, 0], [0, 1, 0, 1, 0], [1, 0, 0, 0, 1]]
+        values = cache.lookup_batch([pack_solution(x) for x in individuals], individuals, evaluate_batch)
+        assert values == [goal_function(EDGES, x) for x in individuals]
+        assert batches == [[[0, 1, 0, 1, 0], [1, 0, 0, 0, 1]]]
+        assert cache.evaluations == 3
+        assert cache.hits == 2
+
+    def test_lru_eviction(self):
+        """
+        Test steps:
+        1. Wypełnij cache o rozmiarze 2 trzema genotypami, odświeżając najstarszy
+        2. Sprawdź czy usunięty został najdawniej używany genotyp
+        :return:
+        """
+        cache = FitnessCache(maxsize=2)
+        evaluate = lambda x: x
+        cache.lookup(1, 1, evaluate)
+        cache.lookup(2, 2, evaluate)
+        cache.lookup(1, 1, evaluate)
+        cache.lookup(3, 3, evaluate)
+        assert cache.evaluations == 3
+        cache.lookup(1, 1, evaluate)
+        assert cache.evaluations == 3
+        cache.lookup(2, 2, evaluate)
+        assert cache.evaluations == 4
+
+
+class TestGeneticAlgorithm:
+    @pytest.mark.parametrize("representation", ["list", "bits"])
+    def test_vectorized_matches_python(self, representation, capsys):
+        """
+        Test steps:
+        1. Uruchom algorytm genetyczny z oceną wektorową i w czystym Pythonie, z tym samym ziarnem
+        2. Sprawdź czy wyniki są identyczne, a najlepsze cięcie zgadza się z funkcją celu
+        :return:
+        """
+        random.seed(6)
+        edges = [(u, v, random.randint(1, 9)) for u in range(30) for v in range(u + 1, 30) if random.random() < 0.2]
+        results = []
+        for vectorized in (True, False):
+            random.seed(7)
+            results.append(genetic_algorithm(
+                30, edges, "uniform", "multiplepoint", "max_generations",
+                max_generations=10, population_size=20, representation=representation, vectorized=vectorized,
+            ))
+        assert results[0] == results[1]
+        best_value, best_solution = results[0][:2]
+        assert best_value == goal_function(edges, best_solution)
+
+    def test_numpy_engine_reproducible(self, capsys):
+        """
+        Test steps:
+        1. Uruchom dwukrotnie algorytm genetyczny z silnikiem numpy i tym samym ziarnem
+        2. Sprawdź czy wyniki są identyczne, a najlepsze cięcie zgadza się z funkcją celu
+        :return:
+        """
+        random.seed(8)
+        edges = [(u, v, random.randint(1, 9)) for u in range(30) for v in range(u + 1, 30) if random.random() < 0.2]
+        results = []
+        for _ in range(2):
+            random.seed(9)
+            results.append(genetic_algorithm(
+                30, edges, "onepoint", "onepoint", "max_no_improvement",
+                max_generations=30, population_size=21, engine="numpy",
+            ))
+        assert results[0] == results[1]
+        best_value, best_solution, _, population = results[0][:4]
+        assert best_value == goal_function(edges, best_solution)
+        assert len(population) == 21
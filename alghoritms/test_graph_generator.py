@@ -0,0 +1,104 @@
+import pytest
+import random
+from alghoritms.graph_generator import erdos_renyi, torus_grid, geometric, power_law, generate, write_graph
+from alghoritms.graph_utils import Graph, load_graph
+
+
+class TestGraphGenerator:
+    @pytest.mark.parametrize(
+        "family, num_vertices",
+        [
+            ("erdos_renyi", 500),
+            ("torus", 400),
+            ("geometric", 500),
+            ("power_law", 500),
+        ]
+    )
+    def test_simple_and_deterministic(self, family, num_vertices):
+        """
+        Test steps:
+        1. Wygeneruj graf dwa razy z tym samym ziarnem i raz z innym
+        2. Sprawdź czy krawędzie są takie same dla tego samego ziarna i różne dla innego
+        3. Sprawdź czy nie ma pętli, duplikatów ani wierzchołków spoza zakresu
+        :return:
+        """
+        n, edges = generate(family, num_vertices, seed=1)
+        edges = list(edges)
+        assert edges == list(generate(family, num_vertices, seed=1)[1])
+        assert edges != list(generate(family, num_vertices, seed=2)[1])
+
+        pairs = {(min(u, v), max(u, v)) for u, v, _ in edges}
+        assert len(pairs) == len(edges)
+        assert all(0 <= u < n and 0 <= v < n and u != v for u, v, _ in edges)
+
+    def test_erdos_renyi_density(self):
+        """
+        Test steps:
+        1. Wygeneruj G(n, p) przeskokami geometrycznymi
+        2. Sprawdź czy liczba krawędzi jest bliska oczekiwanej p * n(n-1)/2
+        :return:
+        """
+        num_vertices, probability = 2000, 0.01
+        expected = probability * num_vertices * (num_vertices - 1) / 2
+        num_edges = sum(1 for _ in erdos_renyi(num_vertices, probability, seed=3))
+        assert abs(num_edges - expected) < 5 * expected ** 0.5
+
+    def test_torus_grid(self):
+        """
+        Test steps:
+        1. Wygeneruj siatkę toroidalną z wagami +1 / -1
+        2. Sprawdź czy każdy wierzchołek ma stopień 4, a wagi to +1 / -1
+        :return:
+        """
+        graph = Graph.from_edges(30, torus_grid(5, 6, seed=4))
+        assert list(graph.degrees) == [4] * 30
+        assert {w for _, _, w in graph} == {-1, 1}
+
+    def test_geometric_matches_brute_force(self):
+        """
+        Test steps:
+        1. Wygeneruj graf geometryczny (siatka komórek)
+        2. Odtwórz te same punkty i wyznacz krawędzie sprawdzając wszystkie pary
+        3. Sprawdź czy zbiory krawędzi są równe
+        :return:
+        """
+        num_vertices, radius = 300, 0.08
+        rng = random.Random(5)
+        xs = [rng.random() for _ in range(num_vertices)]
+        ys = [rng.random() for _ in range(num_vertices)]
+        expected = {
+            (u, v)
+            for u in range(num_vertices)
+            for v in range(u + 1, num_vertices)
+            if (xs[u] - xs[v]) ** 2 + (ys[u] - ys[v]) ** 2 < radius ** 2
+        }
+        edges = {(min(u, v), max(u, v)) for u, v, _ in geometric(num_vertices, radius, seed=5)}
+        assert edges == expected
+
+    def test_power_law_degrees(self):
+        """
+        Test steps:
+        1. Wygeneruj graf potęgowy
+        2. Sprawdź czy średni stopień jest bliski zadanemu, a wierzchołek 0 ma stopień dużo większy od mediany
+        :return:
+        """
+        graph = Graph.from_edges(5000, power_law(5000, 8, exponent=2.5, seed=6))
+        degrees = sorted(graph.degrees)
+        assert 6 < 2 * len(graph) / 5000 < 10
+        assert graph.degrees[0] > 10 * degrees[len(degrees) // 2]
+
+    @pytest.mark.parametrize("fmt", ["edgelist", "rudy"])
+    def test_write_and_load(self, tmp_path, fmt):
+        """
+        Test steps:
+        1. Zapisz wygenerowany graf strumieniowo do pliku
+        2. Wczytaj go przez load_graph
+        3. Sprawdź czy krawędzie są takie same
+        :return:
+        """
+        path = str(tmp_path / ("graph.rud" if fmt == "rudy" else "graph.txt"))
+        num_edges = write_graph(path, 200, erdos_renyi(200, 0.05, seed=7), fmt)
+        graph = load_graph(path)
+        assert graph.num_vertices == 200
+        assert len(graph) == num_edges
+        assert list(graph) == list(erdos_renyi(200, 0.05, seed=7))
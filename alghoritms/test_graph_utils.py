@@ -0,0 +1,265 @@
+import pickle
+import pytest
+import random
+import alghoritms.graph_utils as graph_utils
+from alghoritms.graph_utils import (
+    Graph, CutState, goal_function, random_probe, pack_solution, unpack_solution, load_graph, save_graph_binary,
+    load_graph_binary, NeighbourhoodEvaluator, MatVecCutState, solutions_to_matrix, np,
+)
+
+EDGES = [
+    (0, 1, 2),
+    (0, 2, 5),
+    (1, 3, 7),
+    (1, 4, 1),
+    (2, 5, 3),
+    (3, 5, 4),
+]
+
+NUM_VERTICES = 6
+
+
+class TestGraph:
+    @pytest.mark.parametrize(
+        "edges, expected_edges",
+        [
+            ([(0, 1, 2), (1, 0, 9), (0, 1, 4)], [(0, 1, 2)]),
+            ([(0, 0, 3), (1, 2, 1)], [(1, 2, 1)]),
+            ([(2, 1, 1), (0, 2, 2.5)], [(2, 1, 1), (0, 2, 2.5)]),
+        ]
+    )
+    def test_merge_edges(self, edges, expected_edges):
+        """
+        Test steps:
+        1. Zbuduj graf z listy krawędzi z duplikatami / pętlami
+        2. Sprawdź czy zostało tylko pierwsze wystąpienie każdej pary wierzchołków
+        :return:
+        """
+        graph = Graph.from_edges(3, edges)
+        assert list(graph) == expected_edges
+        assert len(graph) == len(expected_edges)
+
+    def test_csr_adjacency(self):
+        """
+        Test steps:
+        1. Zbuduj graf
+        2. Sprawdź czy stopnie i sąsiedzi w CSR zgadzają się z listą krawędzi
+        :return:
+        """
+        graph = Graph.from_edges(NUM_VERTICES, EDGES)
+        assert list(graph.degrees) == [2, 3, 2, 2, 1, 2]
+        assert graph.offsets[-1] == 2 * len(EDGES)
+        assert sorted(graph.neighbours(1)) == [(0, 2), (3, 7), (4, 1)]
+
+    def test_out_of_range_edge(self):
+        """
+        Test steps:
+        1. Zbuduj graf z krawędzią do nieistniejącego wierzchołka
+        2. Sprawdź czy zgłoszony jest błąd
+        :return:
+        """
+        with pytest.raises(ValueError):
+            Graph.from_edges(2, [(0, 2, 1)])
+
+    def test_cut_matches_edge_list(self):
+        """
+        Test steps:
+        1. Wylosuj rozwiązania
+        2. Sprawdź czy cięcie liczone na Graph jest takie samo jak na liście krawędzi
+        :return:
+        """
+        random.seed(1)
+        graph = Graph.from_edges(NUM_VERTICES, EDGES + [(1, 0, 100)])
+        for _ in range(20):
+            solution = random_probe(NUM_VERTICES)
+            assert goal_function(graph, solution) == goal_function(EDGES, solution)
+
+
+class TestLoadGraph:
+    @pytest.mark.parametrize(
+        "file_name, content",
+        [
+            ("graph.txt", "6\n0 1 2\n0 2 5\n1 3 7\n1 4 1\n2 5 3\n3 5 4\n"),
+            ("graph.rud", "6 6\n1 2 2\n1 3 5\n2 4 7\n2 5 1\n3 6 3\n4 6 4\n"),
+            ("graph.dimacs", "c komentarz\np edge 6 6\ne 1 2 2\ne 1 3 5\ne 2 4 7\ne 2 5 1\ne 3 6 3\ne 4 6 4\n"),
+            ("graph.graph", "% komentarz\n6 6 1\n2 2 3 5\n1 2 4 7 5 1\n1 5 6 3\n2 7 6 4\n2 1\n3 3 4 4\n"),
+        ]
+    )
+    def test_formats(self, tmp_path, file_name, content):
+        """
+        Test steps:
+        1. Zapisz ten sam graf w jednym z obsługiwanych formatów
+        2. Wczytaj go przez load_graph
+        3. Sprawdź czy krawędzie zgadzają się z EDGES
+        :return:
+        """
+        path = tmp_path / file_name
+        path.write_text(content)
+        graph = load_graph(str(path))
+        assert graph.num_vertices == NUM_VERTICES
+        assert sorted((min(u, v), max(u, v), w) for u, v, w in graph) == EDGES
+
+    def test_float_weights(self, tmp_path):
+        """
+        Test steps:
+        1. Wczytaj graf z wagami zmiennoprzecinkowymi
+        2. Sprawdź czy wagi nie zostały obcięte
+        :return:
+        """
+        path = tmp_path / "graph.txt"
+        path.write_text("3\n0 1 2\n1 2 0.5\n")
+        assert list(load_graph(str(path))) == [(0, 1, 2), (1, 2, 0.5)]
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    @pytest.mark.parametrize(
+        "content, expected",
+        [
+            ("3\n0 1 2\n\n1 2 4\n", [(0, 1, 2), (1, 2, 4)]),
+            ("3\n0 1\n1 2 4\n", [(0, 1, 1), (1, 2, 4)]),
+            ("3\n0 1 2.0\n1 2 1e1\n", [(0, 1, 2.0), (1, 2, 10.0)]),
+        ]
+    )
+    def test_bulk_parsing(self, tmp_path, content, expected, use_numpy, monkeypatch):
+        """
+        Test steps:
+        1. Wczytaj graf z pustą linią, z wagą tylko przy części krawędzi i z wagami rzeczywistymi, z numpy i bez
+        2. Sprawdź czy krawędzie i typ wag są takie same jak przy czytaniu linia po linii
+        :return:
+        """
+        if not use_numpy:
+            monkeypatch.setattr(graph_utils, "np", None)
+        path = tmp_path / "graph.txt"
+        path.write_text(content)
+        graph = load_graph(str(path), cache=False)
+        assert list(graph) == expected
+        assert memoryview(graph.weights).format == ("d" if "." in content else "q")
+
+    def test_binary_cache(self, tmp_path):
+        """
+        Test steps:
+        1. Wczytaj graf z włączonym cache - powstaje plik .csr
+        2. Wczytaj go drugi raz (z cache) i bezpośrednio z pliku binarnego
+        3. Sprawdź czy krawędzie, CSR i cięcia są takie same, a graf da się zapiklować
+        :return:
+        """
+        path = tmp_path / "graph.txt"
+        path.write_text("6\n" + "".join(f"{u} {v} {w}\n" for u, v, w in EDGES))
+        graph = load_graph(str(path), cache=True)
+        assert (tmp_path / "graph.txt.csr").exists()
+
+        cached = load_graph(str(path), cache=True)
+        for other in (cached, load_graph_binary(str(tmp_path / "graph.txt.csr"))):
+            assert list(other) == list(graph)
+            assert list(other.offsets) == list(graph.offsets)
+            assert list(other.neighbours(1)) == list(graph.neighbours(1))
+            assert other.cut([0, 1, 0, 1, 0, 1]) == graph.cut([0, 1, 0, 1, 0, 1])
+        assert list(pickle.loads(pickle.dumps(cached))) == list(graph)
+
+    def test_stale_binary_cache(self, tmp_path):
+        """
+        Test steps:
+        1. Zapisz cache binarny dla pliku
+        2. Zmień plik źródłowy
+        3. Sprawdź czy nieaktualny cache jest pomijany
+        :return:
+        """
+        path = tmp_path / "graph.txt"
+        path.write_text("3\n0 1 2\n")
+        save_graph_binary(load_graph(str(path)), str(path) + ".csr", source=str(path))
+        path.write_text("3\n0 1 2\n1 2 3\n")
+        assert load_graph_binary(str(path) + ".csr", source=str(path)) is None
+        assert len(load_graph(str(path), cache=True)) == 2
+
+
+class TestBits:
+    @pytest.mark.parametrize("num_vertices", [0, 1, 7, 64, 129])
+    def test_pack_unpack(self, num_vertices):
+        """
+        Test steps:
+        1. Wylosuj rozwiązanie
+        2. Spakuj je do bitsetu i rozpakuj
+        3. Sprawdź czy bit i to gen i, a po rozpakowaniu dostajemy to samo rozwiązanie
+        :return:
+        """
+        random.seed(num_vertices)
+        solution = random_probe(num_vertices)
+        bits = pack_solution(solution)
+        assert bits == sum(gene << i for i, gene in enumerate(solution))
+        assert unpack_solution(bits, num_vertices) == solution
+
+
+class TestCutState:
+    def test_flip_updates_cut_and_gains(self):
+        """
+        Test steps:
+        1. Zbuduj CutState dla losowego rozwiązania
+        2. Odwracaj losowe wierzchołki
+        3. Sprawdź czy zysk z przed ruchu = zmiana cięcia, a cięcie i zyski zgadzają się z liczonymi od zera
+        :return:
+        """
+        random.seed(2)
+        graph = Graph.from_edges(NUM_VERTICES, EDGES)
+        state = CutState(graph, random_probe(NUM_VERTICES))
+        for _ in range(50):
+            v = random.randrange(NUM_VERTICES)
+            expected = state.cut + state.gain(v)
+            state.flip(v)
+            assert state.cut == expected == goal_function(EDGES, state.solution)
+            assert state.gains == CutState(graph, state.solution).gains
+
+    def test_best_move(self):
+        """
+        Test steps:
+        1. Zbuduj CutState dla rozwiązania z samymi zerami
+        2. Sprawdź czy najlepszy ruch to wierzchołek o największej sumie wag
+        :return:
+        """
+        graph = Graph.from_edges(NUM_VERTICES, EDGES)
+        state = CutState(graph, [0] * NUM_VERTICES)
+        assert state.best_move() == 3
+        assert state.gain(3) == 11
+
+
+@pytest.mark.skipif(np is None, reason="Ocena macierz-wektor wymaga pakietu numpy")
+class TestNeighbourhoodEvaluator:
+    @pytest.mark.parametrize(
+        "num_vertices, edges",
+        [
+            (NUM_VERTICES, EDGES),
+            (NUM_VERTICES + 2, EDGES + [(0, 4, 2.5)]),
+            (3, []),
+        ]
+    )
+    def test_matches_cut_state(self, num_vertices, edges):
+        """
+        Test steps:
+        1. Oceń macierz losowych rozwiązań jednym mnożeniem macierz-wektor (też z wagą rzeczywistą,
+           wierzchołkami bez krawędzi i grafem bez krawędzi)
+        2. Sprawdź czy cięcia i zyski każdego rozwiązania zgadzają się z CutState
+        :return:
+        """
+        random.seed(3)
+        graph = Graph.from_edges(num_vertices, edges)
+        solutions = [random_probe(num_vertices) for _ in range(5)]
+        cuts, gains = NeighbourhoodEvaluator(graph).evaluate(solutions_to_matrix(solutions, num_vertices))
+        for solution, cut, solution_gains in zip(solutions, cuts, gains):
+            state = CutState(graph, solution)
+            assert cut == pytest.approx(state.cut)
+            assert solution_gains.tolist() == pytest.approx(state.gains)
+
+    def test_matvec_cut_state(self):
+        """
+        Test steps:
+        1. Odwracaj wierzchołki w MatVecCutState i CutState
+        2. Sprawdź czy cięcia, zyski i najlepszy ruch są takie same
+        :return:
+        """
+        random.seed(4)
+        graph = Graph.from_edges(NUM_VERTICES, EDGES)
+        solution = random_probe(NUM_VERTICES)
+        state, expected = MatVecCutState(graph, solution), CutState(graph, solution)
+        for _ in range(20):
+            v = random.randrange(NUM_VERTICES)
+            state.flip(v)
+            expected.flip(v)
+            assert (state.cut, state.gains, state.best_move()) == (expected.cut, expected.gains, expected.best_move())
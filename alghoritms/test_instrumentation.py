@@ -0,0 +1,82 @@
+import pickle
+import random
+import pytest
+from alghoritms.graph_utils import Graph
+from alghoritms.graph_generator import erdos_renyi
+from alghoritms.instrumentation import SolverStats, ProfileHook, SamplingHook
+from alghoritms.genetic import genetic_algorithm
+from alghoritms.hill_climb_random import hill_climbing_random
+from alghoritms.hill_climbing_deterministic import hill_climbing_deterministic
+from alghoritms.tabu_search import tabu_search
+from alghoritms.tracing import NULL_TRACER
+
+NUM_VERTICES = 40
+
+GRAPH = Graph.from_edges(NUM_VERTICES, erdos_renyi(NUM_VERTICES, 0.15, seed=9))
+
+
+class TestInstrumentation:
+    def test_local_search_counters(self):
+        """
+        Test steps:
+        1. Uruchom algorytmy wspinaczkowe i tabu ze statystykami
+        2. Sprawdź czy liczniki zgadzają się z liczbą iteracji i przeglądów sąsiedztwa
+        :return:
+        """
+        random.seed(1)
+        stats = SolverStats()
+        _, _, iterations = hill_climbing_random(NUM_VERTICES, GRAPH, 300, NULL_TRACER, stats)
+        assert stats.delta_evaluations == stats.accepted + stats.rejected == iterations
+        assert stats.evaluations == 1
+
+        stats = SolverStats()
+        _, _, iterations = hill_climbing_deterministic(NUM_VERTICES, GRAPH, 300, NULL_TRACER, stats, moves="scan")
+        assert stats.accepted == iterations
+        assert stats.delta_evaluations == stats.neighbourhoods * NUM_VERTICES
+        assert "neighbourhood" in stats.phases
+
+        stats = SolverStats()
+        _, _, iterations = hill_climbing_deterministic(NUM_VERTICES, GRAPH, 300, NULL_TRACER, stats)
+        assert stats.accepted == iterations
+        assert stats.delta_evaluations == stats.neighbourhoods == iterations + 1
+
+        stats = SolverStats()
+        tabu_search(NUM_VERTICES, GRAPH, 50, tracer=NULL_TRACER, stats=stats)
+        assert stats.neighbourhoods >= 50 and stats.accepted == 50
+
+    @pytest.mark.parametrize("engine", ["python", "numpy"])
+    def test_genetic_counters(self, engine):
+        """
+        Test steps:
+        1. Uruchom algorytm genetyczny ze statystykami
+        2. Sprawdź czy każdy oceniony osobnik to ewaluacja albo trafienie w cache, a fazy generacji są zmierzone
+        :return:
+        """
+        random.seed(2)
+        stats = SolverStats()
+        _, _, generation, _, _, _ = genetic_algorithm(
+            NUM_VERTICES, GRAPH, "uniform", "multiplepoint", "max_generations", max_generations=20,
+            population_size=20, engine=engine, tracer=NULL_TRACER, stats=stats,
+        )
+        assert stats.evaluations + stats.cache_hits == (generation + 2) * 20
+        assert stats.accepted + stats.rejected == (generation + 1) * 20
+        assert {"selection", "crossover", "mutation", "evaluation"} <= set(stats.phases)
+        assert stats.wall_time >= sum(stats.phases.values())
+
+    def test_hooks(self):
+        """
+        Test steps:
+        1. Uruchom algorytm z profilerem i próbkowaniem liczników
+        2. Sprawdź czy profil zawiera funkcje wywołane przez algorytm, jest przynajmniej jedna próbka,
+           a statystyki po przesłaniu między procesami (pickle) nie zawierają haków
+        :return:
+        """
+        random.seed(3)
+        profile, sampling = ProfileHook(), SamplingHook(interval=60)
+        stats = SolverStats([profile, sampling])
+        hill_climbing_random(NUM_VERTICES, GRAPH, 200, NULL_TRACER, stats)
+
+        assert "random_probe" in profile.report(limit=None)
+        assert sampling.samples[-1][1]["delta_evaluations"] == 200
+        copy = pickle.loads(pickle.dumps(stats))
+        assert copy.hooks == [] and copy.counters() == stats.counters()
@@ -0,0 +1,72 @@
+import pytest
+from alghoritms.graph_utils import Graph, goal_function
+from alghoritms.graph_generator import erdos_renyi
+from alghoritms.island_genetic import island_genetic_algorithm, migration_targets
+
+NUM_VERTICES = 40
+
+GRAPH = Graph.from_edges(NUM_VERTICES, erdos_renyi(NUM_VERTICES, 0.15, seed=2))
+
+
+class TestIslandGenetic:
+    @pytest.mark.parametrize("islands", [2, 3, 5])
+    def test_random_topology(self, islands):
+        """
+        Test steps:
+        1. Wyznacz cele migracji topologii random dla kilku migracji
+        2. Sprawdź czy to permutacja bez punktów stałych (każda wyspa wysyła i odbiera jedną grupę)
+        :return:
+        """
+        for epoch in range(20):
+            targets = migration_targets(islands, epoch, "random", seed=3)
+            assert sorted(targets) == list(range(islands))
+            assert all(target != i for i, target in enumerate(targets))
+
+    @pytest.mark.parametrize("topology", ["ring", "random"])
+    def test_serial_reproducible(self, topology):
+        """
+        Test steps:
+        1. Uruchom wyspy w jednym procesie dwa razy z tym samym ziarnem
+        2. Sprawdź czy wyniki są takie same, a zwrócone cięcie zgadza się z rozwiązaniem
+        :return:
+        """
+        first = island_genetic_algorithm(
+            NUM_VERTICES, GRAPH, islands=3, max_generations=30, migration_interval=5, topology=topology,
+            parallel=False, seed=4,
+        )
+        second = island_genetic_algorithm(
+            NUM_VERTICES, GRAPH, islands=3, max_generations=30, migration_interval=5, topology=topology,
+            parallel=False, seed=4,
+        )
+        assert first == second
+        assert goal_function(GRAPH, first[1]) == first[0]
+        assert [island["crossover_type"] for island in first[2]] == ["uniform", "onepoint", "uniform"]
+
+    def test_serial_matches_parallel(self):
+        """
+        Test steps:
+        1. Uruchom wyspy z tym samym ziarnem w jednym procesie i w osobnych procesach
+        2. Sprawdź czy każda wyspa (z własnym strumieniem seed + i) dała ten sam wynik
+        :return:
+        """
+        serial = island_genetic_algorithm(
+            NUM_VERTICES, GRAPH, islands=2, max_generations=20, migration_interval=5, parallel=False, seed=6,
+        )
+        parallel = island_genetic_algorithm(
+            NUM_VERTICES, GRAPH, islands=2, max_generations=20, migration_interval=5, parallel=True, seed=6,
+        )
+        assert serial == parallel
+
+    def test_parallel_shared_stop(self):
+        """
+        Test steps:
+        1. Uruchom wyspy w osobnych procesach z celem łatwym do osiągnięcia
+        2. Sprawdź czy cel został osiągnięty, wszystkie wyspy zakończyły się wcześniej, a cięcie się zgadza
+        :return:
+        """
+        best_value, best_solution, islands = island_genetic_algorithm(
+            NUM_VERTICES, GRAPH, islands=2, max_generations=10000, migration_interval=3, target_cut=1, seed=5,
+        )
+        assert best_value >= 1
+        assert goal_function(GRAPH, best_solution) == best_value
+        assert all(island["generations"] < 10000 for island in islands)
@@ -0,0 +1,73 @@
+import pytest
+from alghoritms.graph_utils import Graph, goal_function, share_graph, attach_shared_graph, np
+from alghoritms.graph_generator import erdos_renyi
+from alghoritms.multistart import multi_start
+
+NUM_VERTICES = 60
+
+GRAPH = Graph.from_edges(NUM_VERTICES, erdos_renyi(NUM_VERTICES, 0.1, seed=1))
+
+
+class TestMultiStart:
+    def test_shared_graph(self):
+        """
+        Test steps:
+        1. Skopiuj graf do pamięci współdzielonej i dołącz do niej
+        2. Sprawdź czy krawędzie, sąsiedztwo i cięcie są takie same jak w oryginale
+        :return:
+        """
+        shm, descriptor = share_graph(GRAPH)
+        try:
+            attached_shm, graph = attach_shared_graph(descriptor)
+            assert list(graph) == list(GRAPH)
+            assert list(graph.neighbours(3)) == list(GRAPH.neighbours(3))
+            assert graph.cut([v % 2 for v in range(NUM_VERTICES)]) == GRAPH.cut([v % 2 for v in range(NUM_VERTICES)])
+            del graph
+            attached_shm.close()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    @pytest.mark.parametrize(
+        "solver, params",
+        [
+            ("hill_climbing_deterministic", {"max_iterations": 100}),
+            ("hill_climbing_random", {"max_iterations": 200}),
+            ("tabu_search", {"max_iterations": 50, "tabu_size": 5}),
+            ("sim_annealing", {"max_iterations": 300, "T0": 10, "alpha": 0.99}),
+        ]
+    )
+    def test_parallel_matches_serial(self, solver, params):
+        """
+        Test steps:
+        1. Uruchom restarty z tym samym ziarnem po kolei i w puli procesów
+        2. Sprawdź czy cięcia restartów są takie same, a najlepsze rozwiązanie ma zwrócone cięcie
+        :return:
+        """
+        serial = multi_start(solver, NUM_VERTICES, GRAPH, restarts=4, workers=1, seed=7, **params)
+        parallel = multi_start(solver, NUM_VERTICES, GRAPH, restarts=4, workers=2, seed=7, **params)
+
+        assert [run["cut"] for run in serial[2]] == [run["cut"] for run in parallel[2]]
+        assert [run["seed"] for run in serial[2]] == [7, 8, 9, 10]
+        assert serial[:2] == parallel[:2]
+        assert goal_function(GRAPH, parallel[0]) == parallel[1] == max(run["cut"] for run in parallel[2])
+
+    @pytest.mark.skipif(np is None, reason="Ocena macierz-wektor wymaga pakietu numpy")
+    @pytest.mark.parametrize("max_iterations", [0, 3, 1000])
+    def test_batch_matches_serial(self, max_iterations):
+        """
+        Test steps:
+        1. Uruchom restarty algorytmu wspinaczkowego po kolei (przegląd zysków) i naraz, jako jedną macierz (matvec),
+           również z budżetem zero i kilku iteracji
+        2. Sprawdź czy każdy restart doszedł do tego samego cięcia w tej samej liczbie iteracji
+        :return:
+        """
+        serial = multi_start("hill_climbing_deterministic", NUM_VERTICES, GRAPH, restarts=6, seed=3,
+                             max_iterations=max_iterations, moves="scan")
+        batch = multi_start("hill_climbing_deterministic", NUM_VERTICES, GRAPH, restarts=6, seed=3,
+                            max_iterations=max_iterations, moves="matvec")
+
+        assert [(run["cut"], run["iterations"]) for run in serial[2]] == [
+            (run["cut"], run["iterations"]) for run in batch[2]
+        ]
+        assert serial[:2] == batch[:2]
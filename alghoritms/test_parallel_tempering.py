@@ -0,0 +1,73 @@
+import pytest
+from alghoritms.graph_utils import Graph, goal_function, np
+from alghoritms.graph_generator import erdos_renyi
+from alghoritms.parallel_tempering import parallel_tempering, temperature_ladder
+from alghoritms.tracing import Tracer, MemorySink, ITERATION
+
+NUM_VERTICES = 50
+
+GRAPH = Graph.from_edges(NUM_VERTICES, erdos_renyi(NUM_VERTICES, 0.15, seed=6))
+
+
+class TestParallelTempering:
+    def test_ladder(self):
+        """
+        Test steps:
+        1. Wyznacz drabinę temperatur
+        2. Sprawdź czy zaczyna się w t_min, kończy w t_max, a stosunek sąsiednich temperatur jest stały
+        :return:
+        """
+        ladder = temperature_ladder(5, 1.0, 16.0)
+        assert ladder[0] == pytest.approx(1.0)
+        assert ladder[-1] == pytest.approx(16.0)
+        assert all(b / a == pytest.approx(2.0) for a, b in zip(ladder, ladder[1:]))
+
+    def test_process_matches_python(self):
+        """
+        Test steps:
+        1. Uruchom wymianę replik z tym samym ziarnem w bieżącym procesie i w dwóch procesach roboczych
+        2. Sprawdź czy wyniki i statystyki są takie same, a zwrócone cięcie zgadza się z rozwiązaniem
+        :return:
+        """
+        serial = parallel_tempering(NUM_VERTICES, GRAPH, replicas=4, max_iterations=600, swap_interval=50, seed=2)
+        parallel = parallel_tempering(
+            NUM_VERTICES, GRAPH, replicas=4, max_iterations=600, swap_interval=50, backend="process", workers=2, seed=2,
+        )
+        assert serial == parallel
+        assert goal_function(GRAPH, serial[0]) == serial[1]
+
+    def test_process_error(self):
+        """
+        Test steps:
+        1. Uruchom wymianę replik w procesach roboczych z ujściem, które zgłasza wyjątek przy wierszu tabeli
+        2. Sprawdź czy wyjątek dociera do wywołującego (procesy robocze są zatrzymywane, a nie blokują zamknięcia)
+        :return:
+        """
+        class FailingSink(MemorySink):
+            def write(self, name, fields):
+                if name == "iteration":
+                    raise RuntimeError("Błąd ujścia")
+                super().write(name, fields)
+
+        with pytest.raises(RuntimeError):
+            parallel_tempering(
+                NUM_VERTICES, GRAPH, replicas=4, max_iterations=600, swap_interval=50, backend="process", workers=2,
+                seed=2, tracer=Tracer(ITERATION, sinks=[FailingSink()]),
+            )
+
+    @pytest.mark.skipif(np is None, reason="Backend numpy wymaga pakietu numpy")
+    def test_numpy_backend(self):
+        """
+        Test steps:
+        1. Uruchom wymianę replik z replikami jako macierzą numpy
+        2. Sprawdź czy zwrócone cięcie zgadza się z rozwiązaniem, a odsetki akceptacji i zamian są w [0, 1]
+        :return:
+        """
+        solution, cut, stats = parallel_tempering(
+            NUM_VERTICES, GRAPH, replicas=6, max_iterations=600, swap_interval=50, backend="numpy", seed=2,
+        )
+        assert goal_function(GRAPH, solution) == cut
+        assert len(stats["acceptance"]) == 6 and len(stats["swap_rate"]) == 5
+        assert all(0 <= rate <= 1 for rate in stats["acceptance"] + stats["swap_rate"])
+        # W wyższej temperaturze akceptujemy więcej ruchów pogarszających
+        assert stats["acceptance"][-1] > stats["acceptance"][0]
@@ -0,0 +1,67 @@
+import random
+import sys
+import pytest
+from alghoritms.graph_utils import Graph, goal_function
+from alghoritms.graph_generator import erdos_renyi
+from alghoritms.simulated_annealing import sim_annealing, T, Trajectory
+from alghoritms.tracing import NULL_TRACER
+
+NUM_VERTICES = 40
+
+GRAPH = Graph.from_edges(NUM_VERTICES, erdos_renyi(NUM_VERTICES, 0.15, seed=8))
+
+
+class TestSimulatedAnnealing:
+    @pytest.mark.parametrize(
+        "every, capacity, expected",
+        [
+            (1, None, list(range(200))),
+            (30, None, list(range(0, 200, 30)) + [199]),
+            (1, 10, list(range(190, 200))),
+            (50, 3, [100, 150, 199]),
+        ]
+    )
+    def test_trajectory(self, every, capacity, expected):
+        """
+        Test steps:
+        1. Uruchom wyżarzanie z przebiegiem próbkowanym co `every` iteracji i ograniczonym do capacity wpisów
+        2. Sprawdź czy zapamiętane są oczekiwane iteracje (zawsze z ostatnią), a liczba iteracji jest pełna
+        3. Sprawdź czy cięcia z przebiegu nie przekraczają najlepszego, a najlepsze zgadza się z rozwiązaniem
+        :return:
+        """
+        random.seed(every)
+        best_solution, best_cut, trajectory, _ = sim_annealing(
+            NUM_VERTICES, GRAPH, 200, T, 10, 0.98, NULL_TRACER, Trajectory(every, capacity)
+        )
+        assert [iteration for iteration, _, _, _ in trajectory] == expected
+        assert trajectory.iterations == 200
+        assert max(trajectory.cuts) <= best_cut
+        assert goal_function(GRAPH, best_solution) == best_cut
+
+    def test_carried_cut(self):
+        """
+        Test steps:
+        1. Uruchom wyżarzanie z zapisem każdej iteracji
+        2. Sprawdź czy cięcie zmienia się tylko w iteracjach z zaakceptowanym ruchem
+        :return:
+        """
+        random.seed(3)
+        _, _, trajectory, start_point = sim_annealing(NUM_VERTICES, GRAPH, 300, T, 5, 0.99, NULL_TRACER)
+        records = list(trajectory)
+        assert records[0][1] == goal_function(GRAPH, start_point)
+        for (_, previous_cut, _, _), (_, cut, _, accepted) in zip(records, records[1:]):
+            assert accepted or cut == previous_cut
+
+    def test_temperature_underflow(self):
+        """
+        Test steps:
+        1. Uruchom wyżarzanie z małym alpha, bez limitu iteracji i z limitem czasu - temperatura spada do zera
+        2. Sprawdź czy algorytm kończy się po limicie czasu z poprawnym rozwiązaniem
+        :return:
+        """
+        random.seed(4)
+        best_solution, best_cut, trajectory, _ = sim_annealing(
+            NUM_VERTICES, GRAPH, sys.maxsize, T, 10, 0.5, NULL_TRACER, Trajectory(1000, 10), time_limit=0.2
+        )
+        assert T(trajectory.iterations, 10, 0.5) == 0.0
+        assert goal_function(GRAPH, best_solution) == best_cut
@@ -0,0 +1,37 @@
+import time
+import pytest
+from alghoritms.graph_utils import Graph, goal_function
+from alghoritms.graph_generator import erdos_renyi
+from alghoritms.solvers import SOLVERS, solve
+from alghoritms.tracing import NULL_TRACER
+
+NUM_VERTICES = 16
+
+GRAPH = Graph.from_edges(NUM_VERTICES, erdos_renyi(NUM_VERTICES, 0.3, seed=4))
+
+
+class TestSolvers:
+    @pytest.mark.parametrize("name", sorted(SOLVERS))
+    def test_solve(self, name):
+        """
+        Test steps:
+        1. Uruchom każdy algorytm z rejestru przez wspólne API z limitem czasu
+        2. Sprawdź czy wynik to SolverResult, którego cięcie zgadza się z funkcją celu, a czas działania jest zmierzony
+        :return:
+        """
+        result = solve(name, NUM_VERTICES, GRAPH, time_limit=0.2, seed=1, tracer=NULL_TRACER)
+        assert type(result).__name__ == "SolverResult"
+        assert goal_function(GRAPH, result.solution) == result.cut
+        assert result.stats.wall_time > 0
+
+    @pytest.mark.parametrize("name", ["hill_climbing_random", "sim_annealing", "tabu_search", "genetic"])
+    def test_time_limit(self, name):
+        """
+        Test steps:
+        1. Uruchom algorytm bez budżetu iteracji, ograniczony tylko limitem czasu
+        2. Sprawdź czy zakończył się niedługo po upływie limitu
+        :return:
+        """
+        start = time.perf_counter()
+        solve(name, NUM_VERTICES, GRAPH, time_limit=0.3, seed=2, tracer=NULL_TRACER)
+        assert 0.3 <= time.perf_counter() - start < 2
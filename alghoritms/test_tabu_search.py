@@ -0,0 +1,75 @@
+import pytest
+import random
+from collections import deque
+from alghoritms.tabu_search import tabu_search
+from alghoritms.graph_utils import Graph, CutState, goal_function, work_point, back_to_work_point
+from alghoritms.hill_climbing_deterministic import hill_climbing_deterministic
+from alghoritms.tracing import Tracer, MemorySink, DEBUG, NULL_TRACER
+
+EDGES = [
+    (0, 1, 2), (0, 2, 5), (1, 3, 7), (1, 4, 1), (2, 5, 3),
+    (2, 6, 8), (3, 7, 2), (3, 8, 6), (4, 9, 4), (5, 7, 5),
+    (5, 8, 2), (6, 9, 7), (7, 9, 3), (8, 9, 9), (1, 6, 4),
+]
+
+NUM_VERTICES = 10
+
+
+class TestTabuSearch:
+    @pytest.mark.parametrize(
+        "tabu_size, tenure_random",
+        [
+            (3, 0),
+            (5, 3),
+            (10, 0),
+        ]
+    )
+    def test_finds_optimum(self, tabu_size, tenure_random, capsys):
+        """
+        Test steps:
+        1. Uruchom tabu na grafie z graphs/graph10.txt (optimum = 60) z różną kadencją
+        2. Sprawdź czy znalezione zostało optimum i czy cięcie zgadza się z funkcją celu
+        :return:
+        """
+        random.seed(tabu_size)
+        best_cut, best_solution = tabu_search(
+            NUM_VERTICES, EDGES, max_iterations=300, tabu_size=tabu_size, tenure_random=tenure_random
+        )
+        assert best_cut == 60
+        assert goal_function(EDGES, best_solution) == best_cut
+
+    @pytest.mark.parametrize("moves", ["scan", "auto"])
+    def test_recovery(self, moves):
+        """
+        Test steps:
+        1. Uruchom tabu z kadencją dłuższą niż liczba wierzchołków, by wymusić powroty do punktów roboczych
+        2. Sprawdź czy były powroty do punktów roboczych (każdy ze zdarzeniem debug), a wynik zgadza się z funkcją celu
+        :return:
+        """
+        random.seed(1)
+        sink = MemorySink()
+        best_cut, best_solution = tabu_search(
+            NUM_VERTICES, EDGES, max_iterations=200, tabu_size=NUM_VERTICES, history_size=5,
+            tracer=Tracer(DEBUG, sinks=[sink]), moves=moves,
+        )
+        recoveries = [fields for name, fields in sink.events if name == "recovery"]
+        assert recoveries
+        assert len([name for name, _ in sink.events if name == "work_point"]) == len(recoveries)
+        assert goal_function(EDGES, best_solution) == best_cut
+
+    def test_back_to_work_point(self):
+        """
+        Test steps:
+        1. Zbuduj historię punktów roboczych: optimum lokalne na końcu i punkt z poprawiającym ruchem przed nim
+        2. Sprawdź czy powrót pomija optimum lokalne, zwraca najlepszy ruch punktu, a historia się opróżnia
+        :return:
+        """
+        graph = Graph.from_edges(NUM_VERTICES, EDGES)
+        optimum, _, _ = hill_climbing_deterministic(NUM_VERTICES, graph, 1000, NULL_TRACER)
+        start = CutState(graph, [0] * NUM_VERTICES)
+        history = deque([work_point(start), work_point(CutState(graph, optimum))], maxlen=5)
+
+        point = back_to_work_point(history)
+        assert point["solution"] == [0] * NUM_VERTICES
+        assert (point["move"], point["gain"]) == (start.best_move(), start.gains[start.best_move()])
+        assert back_to_work_point(history) is None
@@ -0,0 +1,71 @@
+import csv
+import json
+import pytest
+import random
+from alghoritms.tracing import Tracer, MemorySink, JsonlSink, CsvSink, ITERATION
+from alghoritms.tabu_search import tabu_search
+from alghoritms.simulated_annealing import sim_annealing, T
+
+EDGES = [(0, 1, 2), (0, 2, 5), (1, 3, 7), (1, 4, 1), (2, 5, 3), (3, 5, 4)]
+
+NUM_VERTICES = 6
+
+
+class TestTracer:
+    def test_off_emits_nothing(self, capsys):
+        """
+        Test steps:
+        1. Uruchom algorytm tabu z wyłączonym śledzeniem
+        2. Sprawdź czy nic nie zostało wypisane ani zebrane
+        :return:
+        """
+        sink = MemorySink()
+        tabu_search(NUM_VERTICES, EDGES, max_iterations=50, tracer=Tracer("off", sinks=[sink]))
+        assert sink.events == []
+        assert capsys.readouterr().out == ""
+
+    @pytest.mark.parametrize("every", [1, 7])
+    def test_iteration_sampling(self, every):
+        """
+        Test steps:
+        1. Uruchom symulowane wyżarzanie z poziomem iteration i próbkowaniem co `every` iteracji
+        2. Sprawdź czy wiersze są tylko dla iteracji podzielnych przez every, bez pełnego rozwiązania
+        3. Sprawdź czy nowe najlepsze wyniki rosną, a ostatni jest zwróconym najlepszym cięciem
+        :return:
+        """
+        random.seed(every)
+        sink = MemorySink()
+        _, best_cut, _, _ = sim_annealing(
+            NUM_VERTICES, EDGES, 100, T, 10, 0.95, tracer=Tracer(ITERATION, every, sinks=[sink])
+        )
+        rows = [fields for name, fields in sink.events if name == "iteration"]
+        assert [fields["iteration"] for fields in rows] == list(range(every, 100, every))
+        assert all("solution" not in fields for fields in rows)
+
+        improvements = [fields["cut"] for name, fields in sink.events if name == "improvement"]
+        assert improvements == sorted(set(improvements))
+        assert not improvements or improvements[-1] == best_cut
+
+    def test_file_sinks(self, tmp_path):
+        """
+        Test steps:
+        1. Uruchom algorytm tabu z poziomem debug i ujściami JSONL oraz CSV
+        2. Sprawdź czy pliki zawierają zdarzenia start/stop i wiersze iteracji z rozwiązaniem
+        :return:
+        """
+        random.seed(3)
+        tracer = Tracer(
+            "debug", sinks=[JsonlSink(tmp_path / "trace.jsonl"), CsvSink(tmp_path / "trace.csv", events=["iteration"])]
+        )
+        tabu_search(NUM_VERTICES, EDGES, max_iterations=20, tracer=tracer)
+        tracer.close()
+
+        events = [json.loads(line) for line in (tmp_path / "trace.jsonl").read_text().splitlines()]
+        assert events[0]["event"] == "start"
+        assert events[-1]["event"] == "stop"
+        assert any(event["event"] == "iteration" and len(event["solution"]) == NUM_VERTICES for event in events)
+
+        with open(tmp_path / "trace.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert rows and all(row["event"] == "iteration" for row in rows)
+        assert "solution" in rows[0]
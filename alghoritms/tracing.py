@@ -0,0 +1,234 @@
+import csv
+import json
+import sys
+import time
+
+# Poziomy szczegółowości śledzenia
+OFF = 0
+SUMMARY = 1
+ITERATION = 2
+DEBUG = 3
+
+LEVELS = {"off": OFF, "summary": SUMMARY, "iteration": ITERATION, "debug": DEBUG}
+
+# Komunikaty konsoli dla zdarzeń, które nie są wierszami tabeli
+MESSAGES = {
+    "start": "Punkt startowy - cięcie: {cut}",
+    "improvement": "Iteracja {iteration}: nowe najlepsze cięcie {cut}",
+    "recovery": "Iteracja {iteration}: brak dostępnych ruchów, powrót do punktu roboczego o cięciu {cut}",
+    "work_point": "Znaleziono punkt roboczy, który nie jest zakazany, a oferuje lepszy wynik: {neighbour_cut} > {cut}",
+    "no_work_point": "Nie ma dostępnych punktów roboczych, które mogłyby poprawić wynik",
+    "rejected": "RUCH ODRZUCONY (tabu & niepoprawia): ruch={move}, cut={cut}",
+    "elite": "Elita generacji {iteration}: przenosimy {size} osobników do nowej populacji {elite}",
+    "stop": "{reason} (iteracja {iteration}, cięcie {cut})",
+}
+
+
+class ConsoleSink:
+    """
+    Wypisywanie zdarzeń na konsolę: zdarzenia z zadeklarowaną tabelą (Tracer.table) jako wiersze tabeli
+    o stałej szerokości kolumn, pozostałe według szablonów z MESSAGES.
+    :param skip: nazwy zdarzeń, których nie wypisujemy
+    """
+
+    def __init__(self, stream=None, skip=()):
+        self.stream = stream
+        self.skip = set(skip)
+        self.tables = {}
+
+    def table(self, name, columns):
+        self.tables[name] = columns
+        header = " ".join(f"{title:<{width}}" for title, _, width, *_ in columns)
+        print(f"\n{header}", file=self.stream or sys.stdout)
+        print("-" * len(header), file=self.stream or sys.stdout)
+
+    def write(self, name, fields):
+        if name in self.skip:
+            return
+        columns = self.tables.get(name)
+        if columns is not None:
+            cells = []
+            for title, key, width, *spec in columns:
+                value = fields.get(key, "-")
+                if spec and value != "-":
+                    value = format(value, spec[0])
+                cells.append(f"{str(value):<{width}}")
+            line = " ".join(cells)
+        elif name in MESSAGES:
+            line = MESSAGES[name].format(**fields)
+        else:
+            line = f"{name}: " + ", ".join(f"{key}={value}" for key, value in fields.items() if key != "elapsed")
+        print(line, file=self.stream or sys.stdout)
+
+    def close(self):
+        pass
+
+
+class JsonlSink:
+    """
+    Zapis zdarzeń do pliku JSON Lines - jeden obiekt {"event": nazwa, "elapsed": sekundy, ...} na linię
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "w")
+
+    def table(self, name, columns):
+        pass
+
+    def write(self, name, fields):
+        self.file.write(json.dumps({"event": name, **fields}, default=str))
+        self.file.write("\n")
+
+    def close(self):
+        self.file.close()
+
+
+class CsvSink:
+    """
+    Zapis zdarzeń do pliku CSV. Kolumny ustala pierwsze zapisane zdarzenie (albo kolumny zadeklarowanej tabeli),
+    pola spoza nagłówka są pomijane.
+    :param events: nazwy zdarzeń do zapisu (domyślnie wszystkie)
+    """
+
+    def __init__(self, path, events=None):
+        self.file = open(path, "w", newline="")
+        self.events = None if events is None else set(events)
+        self.writer = None
+
+    def _open_writer(self, fieldnames):
+        self.writer = csv.DictWriter(self.file, fieldnames=fieldnames, restval="", extrasaction="ignore")
+        self.writer.writeheader()
+
+    def table(self, name, columns):
+        if self.writer is None and (self.events is None or name in self.events):
+            self._open_writer(["event", "elapsed"] + [key for _, key, *_ in columns])
+
+    def write(self, name, fields):
+        if self.events is not None and name not in self.events:
+            return
+        if self.writer is None:
+            self._open_writer(["event", *fields])
+        self.writer.writerow({"event": name, **fields})
+
+    def close(self):
+        self.file.close()
+
+
+class MemorySink:
+    """
+    Zbieranie zdarzeń w pamięci jako lista (nazwa, pola) - np. do testów albo pomiaru czasu dojścia do celu
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def table(self, name, columns):
+        pass
+
+    def write(self, name, fields):
+        self.events.append((name, fields))
+
+    def close(self):
+        pass
+
+
+class Tracer:
+    """
+    Wspólne śledzenie przebiegu algorytmów. Poziomy:
+    - off: nic,
+    - summary: start i koniec działania,
+    - iteration: każde nowe najlepsze rozwiązanie oraz wiersz tabeli co `every` iteracji,
+    - debug: wiersze tabeli z pełnym rozwiązaniem i zdarzenia pomocnicze (odrzucone ruchy, elita).
+    Algorytmy sprawdzają flagi (events, rows, debug) przed zbudowaniem pól zdarzenia,
+    więc przy wyłączonym śledzeniu żadne napisy nie są formatowane.
+    :param level: poziom - nazwa z LEVELS albo stała OFF / SUMMARY / ITERATION / DEBUG
+    :param every: co ile iteracji emitujemy wiersz tabeli
+    :param sinks: lista ujść (domyślnie ConsoleSink)
+    """
+
+    def __init__(self, level=SUMMARY, every=1, sinks=None):
+        self.level = LEVELS[level] if isinstance(level, str) else level
+        self.every = max(1, every)
+        self.sinks = [ConsoleSink()] if sinks is None else list(sinks)
+        if not self.sinks:
+            self.level = OFF
+        # Zdarzenia niepróbkowane poziomu iteration (nowe najlepsze, powroty)
+        self.events = self.level >= ITERATION
+        # Co ile iteracji wiersz tabeli (0 - wcale)
+        self.rows = self.every if self.events else 0
+        self.debug = self.level >= DEBUG
+        self.start_time = time.perf_counter()
+
+    def enabled(self, level):
+        return OFF < level <= self.level
+
+    def table(self, name, columns):
+        """
+        Deklaracja tabeli dla zdarzenia name - ConsoleSink wypisuje nagłówek, a kolejne zdarzenia jako wiersze
+        :param columns: lista (tytuł, klucz pola, szerokość[, format]) - kolumny wypisywane w tej kolejności
+        """
+        if self.rows:
+            for sink in self.sinks:
+                sink.table(name, columns)
+
+    def emit(self, level, name, **fields):
+        """
+        Przekazanie zdarzenia do ujść, jeśli poziom jest włączony. Pola o wartości None są pomijane,
+        do pól dopisujemy czas od utworzenia Tracera ("elapsed").
+        """
+        if not OFF < level <= self.level:
+            return
+        fields = {key: value for key, value in fields.items() if value is not None}
+        fields["elapsed"] = time.perf_counter() - self.start_time
+        for sink in self.sinks:
+            sink.write(name, fields)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+# Wyłączony tracer - do uruchomień bez jakiegokolwiek wypisywania
+NULL_TRACER = Tracer(OFF, sinks=[])
+
+
+def as_tracer(tracer):
+    """
+    :param tracer: Tracer albo None
+    :return: podany Tracer, a dla None - Tracer poziomu summary wypisujący na konsolę
+    """
+    return Tracer() if tracer is None else tracer
+
+
+def add_trace_arguments(parser):
+    """
+    Dodanie do argparse opcji śledzenia wspólnych dla wszystkich algorytmów
+    """
+    parser.add_argument(
+        "--trace",
+        type=str,
+        choices=list(LEVELS),
+        default="summary",
+        help="Poziom śledzenia: off, summary, iteration (co trace_every iteracji), debug (pełne tabele)",
+    )
+    parser.add_argument(
+        "--trace_every", type=int, default=1, help="Co ile iteracji wypisujemy wiersz tabeli"
+    )
+    parser.add_argument("--trace_jsonl", type=str, default=None, help="Plik JSON Lines ze zdarzeniami")
+    parser.add_argument("--trace_csv", type=str, default=None, help="Plik CSV ze zdarzeniami")
+
+
+def tracer_from_args(args):
+    """
+    :param args: argumenty z add_trace_arguments
+    :return: Tracer z ujściem konsolowym i opcjonalnymi ujściami plikowymi
+    """
+    # Gdy wypisujemy każdą iterację, nowe najlepsze wyniki widać już w tabeli
+    sinks = [ConsoleSink(skip=["improvement"] if args.trace_every == 1 else ())]
+    if args.trace_jsonl:
+        sinks.append(JsonlSink(args.trace_jsonl))
+    if args.trace_csv:
+        # Przy wierszach tabeli CSV to sama tabela iteracji, inaczej - zdarzenia podsumowania
+        rows = LEVELS[args.trace] >= ITERATION
+        sinks.append(CsvSink(args.trace_csv, events=["iteration"] if rows else None))
+    return Tracer(args.trace, args.trace_every, sinks)
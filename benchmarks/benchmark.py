@@ -0,0 +1,318 @@
+"""
+Benchmark algorytmów Maximum Cut na grafach z graphs/ i na większych instancjach z graph_generator.
+
+Dla każdej pary (algorytm, instancja) i każdego ziarna mierzymy czas działania, liczbę ocenionych rozwiązań
+na sekundę, najlepsze cięcie, czas dojścia do znanego optimum (time-to-target) i - w osobnym przebiegu
+pod tracemalloc - szczytowe zużycie pamięci. Wyniki zapisujemy do pliku JSON, a tryb compare porównuje
+dwa takie pliki i zgłasza regresje.
+
+Użycie:
+    python benchmarks/benchmark.py run --output wyniki.json
+    python benchmarks/benchmark.py compare stare.json nowe.json --threshold 0.1
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "alghoritms"))
+
+from graph_utils import Graph, load_graph, np
+from graph_generator import generate
+from tracing import Tracer, MemorySink, ITERATION
+from instrumentation import SolverStats
+from hill_climbing_deterministic import hill_climbing_deterministic
+from hill_climb_random import hill_climbing_random
+from simulated_annealing import sim_annealing, T
+from parallel_tempering import parallel_tempering
+from tabu_search import tabu_search
+from genetic import genetic_algorithm
+from full_search import full_search
+from branch_and_bound import branch_and_bound
+
+GRAPHS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "graphs")
+
+# Znane optima instancji (udowodnione algorytmem podziału i ograniczeń)
+OPTIMA = {
+    "graph10": 60,
+    "graph100": 1116,
+}
+
+FAMILIES = ("erdos_renyi", "torus", "geometric", "power_law")
+
+# Wiersze tabeli nigdy nie są emitowane - zbieramy tylko zdarzenia start / improvement / stop
+_NO_ROWS = 1 << 62
+
+
+def load_instances(names):
+    """
+    :param names: nazwy instancji - pliki z graphs/ (bez rozszerzenia) albo "<rodzina>-<n>" z graph_generator
+        (np. "erdos_renyi-1000", "torus-1024", "power_law-1000", "geometric-1000")
+    :return: lista (nazwa, graf)
+    """
+    instances = []
+    for name in names:
+        family, _, size = name.rpartition("-")
+        if family in FAMILIES:
+            num_vertices, edges = generate(family, int(size), seed=int(size))
+            graph = Graph.from_edges(num_vertices, edges)
+        else:
+            graph = load_graph(os.path.join(GRAPHS_DIR, name + ".txt"))
+        instances.append((name, graph))
+    return instances
+
+
+# Algorytmy: funkcja (graf, tracer, SolverStats) -> najlepsze cięcie i maksymalny rozmiar instancji.
+# Liczba ocenionych rozwiązań pochodzi z liczników SolverStats: pełne i przyrostowe ewaluacje oraz trafienia
+# w cache (osobnik oceniony bez liczenia funkcji celu), a dla B&B - węzły drzewa.
+def _run_hill_climbing_deterministic(graph, tracer, stats):
+    _, cut, _ = hill_climbing_deterministic(graph.num_vertices, graph, 10 * graph.num_vertices, tracer, stats)
+    return cut
+
+
+def _run_hill_climbing_random(graph, tracer, stats):
+    _, cut, _ = hill_climbing_random(graph.num_vertices, graph, 20 * graph.num_vertices, tracer, stats)
+    return cut
+
+
+def _run_sim_annealing(graph, tracer, stats):
+    max_iterations = 50 * graph.num_vertices
+    _, cut, _, _ = sim_annealing(graph.num_vertices, graph, max_iterations, T, 10, 0.999, tracer, stats=stats)
+    return cut
+
+
+def _run_parallel_tempering(graph, tracer, stats):
+    _, cut, _ = parallel_tempering(
+        graph.num_vertices, graph, 8, max_iterations=10 * graph.num_vertices, tracer=tracer, stats=stats
+    )
+    return cut
+
+
+def _run_tabu_search(graph, tracer, stats):
+    cut, _ = tabu_search(graph.num_vertices, graph, 5 * graph.num_vertices, tracer=tracer, stats=stats)
+    return cut
+
+
+def _run_genetic(engine):
+    def run(graph, tracer, stats):
+        cut, _, _, _, _, _ = genetic_algorithm(
+            graph.num_vertices, graph, "uniform", "multiplepoint", "max_no_improvement",
+            max_generations=200, population_size=50, engine=engine, tracer=tracer, stats=stats,
+        )
+        return cut
+    return run
+
+
+def _run_full_search(graph, tracer, stats):
+    _, cut = full_search(graph.num_vertices, graph, tracer=tracer, stats=stats)
+    return cut
+
+
+def _run_branch_and_bound(graph, tracer, stats):
+    nodes = {}
+    _, cut = branch_and_bound(graph.num_vertices, graph, stats=nodes)
+    stats.delta_evaluations += nodes["nodes"]
+    return cut
+
+
+SOLVERS = {
+    "hill_climbing_deterministic": (_run_hill_climbing_deterministic, None),
+    "hill_climbing_random": (_run_hill_climbing_random, None),
+    "sim_annealing": (_run_sim_annealing, None),
+    "parallel_tempering": (_run_parallel_tempering, None),
+    "tabu_search": (_run_tabu_search, None),
+    "genetic": (_run_genetic("python"), None),
+    "genetic_numpy": (_run_genetic("numpy"), None),
+    "full_search": (_run_full_search, 24),
+    "branch_and_bound": (_run_branch_and_bound, 100),
+}
+
+
+def run_once(solver, graph, seed, target=None):
+    """
+    Jedno uruchomienie algorytmu z ustalonym ziarnem
+    :return: słownik z czasem, liczbą ocen, najlepszym cięciem i czasem dojścia do celu
+    """
+    run, _ = SOLVERS[solver]
+    random.seed(seed)
+    sink = MemorySink()
+    tracer = Tracer(ITERATION, _NO_ROWS, sinks=[sink])
+
+    stats = SolverStats()
+    start = time.perf_counter()
+    cut = run(graph, tracer, stats)
+    wall_time = time.perf_counter() - start
+    evaluations = stats.evaluations + stats.delta_evaluations + stats.cache_hits
+
+    time_to_target = None
+    if target is not None:
+        for name, fields in sink.events:
+            if name in ("start", "improvement") and fields["cut"] >= target:
+                time_to_target = fields["elapsed"]
+                break
+        if time_to_target is None and cut >= target:
+            # Algorytmy dokładne nie emitują nowych najlepszych - celem jest cały przebieg
+            time_to_target = wall_time
+
+    return {
+        "wall_time": wall_time,
+        "evaluations": evaluations,
+        "evals_per_sec": evaluations / wall_time if wall_time > 0 else None,
+        "best_cut": cut,
+        "time_to_target": time_to_target,
+        "counters": stats.counters(),
+        "phases": stats.phases,
+    }
+
+
+def peak_memory(solver, graph, seed):
+    """
+    Szczytowa pamięć (w bajtach) zaalokowana w czasie działania algorytmu - osobny przebieg,
+    bo tracemalloc wyraźnie spowalnia program i zafałszowałby pomiar czasu
+    """
+    run, _ = SOLVERS[solver]
+    random.seed(seed)
+    sink = MemorySink()
+    tracemalloc.start()
+    try:
+        run(graph, Tracer(ITERATION, _NO_ROWS, sinks=[sink]), SolverStats())
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(solvers, instances, seeds, memory=True):
+    """
+    :param solvers: nazwy algorytmów z SOLVERS
+    :param instances: lista (nazwa, graf)
+    :param seeds: ziarna generatora liczb losowych
+    :param memory: czy mierzyć szczytową pamięć
+    :return: lista wyników - po jednym słowniku na (algorytm, instancja, ziarno)
+    """
+    results = []
+    for instance, graph in instances:
+        target = OPTIMA.get(instance)
+        for solver in solvers:
+            max_vertices = SOLVERS[solver][1]
+            if max_vertices is not None and graph.num_vertices > max_vertices:
+                continue
+            peak = peak_memory(solver, graph, seeds[0]) if memory else None
+            for seed in seeds:
+                result = run_once(solver, graph, seed, target)
+                result.update(
+                    solver=solver, instance=instance, seed=seed, num_vertices=graph.num_vertices,
+                    num_edges=len(graph), optimum=target, peak_memory=peak,
+                )
+                results.append(result)
+                print(
+                    f"{solver:<28} {instance:<12} seed={seed:<4} cięcie={result['best_cut']:<8} "
+                    f"czas={result['wall_time']:.3f}s ocen/s={result['evals_per_sec'] or 0:.0f}",
+                    file=sys.stderr,
+                )
+    return results
+
+
+def summarize(results):
+    """
+    Agregacja wyników po (algorytm, instancja): mediany czasu i ocen/s, średnie cięcie,
+    mediana czasu dojścia do celu i odsetek uruchomień, które cel osiągnęły
+    """
+    groups = {}
+    for result in results:
+        groups.setdefault((result["solver"], result["instance"]), []).append(result)
+
+    summary = {}
+    for (solver, instance), runs in groups.items():
+        reached = [run["time_to_target"] for run in runs if run["time_to_target"] is not None]
+        summary[f"{solver}/{instance}"] = {
+            "wall_time": statistics.median(run["wall_time"] for run in runs),
+            "evals_per_sec": statistics.median(run["evals_per_sec"] or 0 for run in runs),
+            "best_cut": statistics.mean(run["best_cut"] for run in runs),
+            "time_to_target": statistics.median(reached) if reached else None,
+            "target_rate": len(reached) / len(runs) if runs[0]["optimum"] is not None else None,
+            "peak_memory": runs[0]["peak_memory"],
+        }
+    return summary
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Porównanie dwóch plików wyników. Regresja to: czas dłuższy o więcej niż threshold, mniej ocen/s
+    o więcej niż threshold, pamięć większa o więcej niż threshold, mniejsze średnie cięcie
+    albo rzadsze dojście do celu.
+    :return: lista (klucz, metryka, stara wartość, nowa wartość)
+    """
+    old, new = summarize(baseline["results"]), summarize(current["results"])
+    regressions = []
+    for key in sorted(old.keys() & new.keys()):
+        a, b = old[key], new[key]
+        checks = [
+            ("wall_time", b["wall_time"] > a["wall_time"] * (1 + threshold)),
+            ("evals_per_sec", b["evals_per_sec"] < a["evals_per_sec"] * (1 - threshold)),
+            ("best_cut", b["best_cut"] < a["best_cut"]),
+        ]
+        if a["peak_memory"] is not None and b["peak_memory"] is not None:
+            checks.append(("peak_memory", b["peak_memory"] > a["peak_memory"] * (1 + threshold)))
+        if a["target_rate"] is not None and b["target_rate"] is not None:
+            checks.append(("target_rate", b["target_rate"] < a["target_rate"]))
+        for metric, regressed in checks:
+            if regressed:
+                regressions.append((key, metric, a[metric], b[metric]))
+    return regressions
+
+
+def _metadata():
+    return {
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__ if np is not None else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark algorytmów Maximum Cut")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Uruchomienie benchmarku")
+    run_parser.add_argument("--output", type=str, required=True, help="Plik JSON z wynikami")
+    run_parser.add_argument(
+        "--solvers", type=str, nargs="+", choices=list(SOLVERS), default=list(SOLVERS), help="Algorytmy"
+    )
+    run_parser.add_argument(
+        "--instances", type=str, nargs="+", default=["graph10", "graph100", "erdos_renyi-1000", "torus-1024"],
+        help="Instancje: nazwy plików z graphs/ albo <rodzina>-<n> (erdos_renyi, torus, geometric, power_law)",
+    )
+    run_parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2], help="Ziarna generatora")
+    run_parser.add_argument("--no_memory", action="store_true", help="Bez pomiaru pamięci (tracemalloc)")
+
+    compare_parser = commands.add_parser("compare", help="Porównanie dwóch plików wyników")
+    compare_parser.add_argument("baseline", type=str, help="Wyniki odniesienia")
+    compare_parser.add_argument("current", type=str, help="Nowe wyniki")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Dopuszczalna względna zmiana czasu, ocen/s i pamięci"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run_benchmarks(args.solvers, load_instances(args.instances), args.seeds, not args.no_memory)
+        with open(args.output, "w") as f:
+            json.dump({"metadata": _metadata(), "results": results, "summary": summarize(results)}, f, indent=2)
+        print(f"Zapisano {len(results)} wyników do {args.output}")
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        for key, metric, old_value, new_value in regressions:
+            print(f"REGRESJA {key}: {metric} {old_value} -> {new_value}")
+        if not regressions:
+            print("Brak regresji")
+        sys.exit(1 if regressions else 0)